@@ -1,10 +1,25 @@
-import random
+import base64
+import copy
+import heapq
+import json
+import logging
+import struct
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
 import numpy as np
-from collections import deque
 from enum import Enum
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Callable
 import os
 from datetime import datetime
+from html import escape
+
+# Journal du simulateur, silencieux par défaut : l'application qui l'utilise choisit ses gestionnaires
+logger = logging.getLogger("ForestFireSimulator")
+logger.addHandler(logging.NullHandler())
 
 from enum import Enum
 class TerrainType(Enum):
@@ -15,20 +30,1274 @@ class TerrainType(Enum):
     FEU = 3
     BRULE = 4
 
+MOTEURS_PROPAGATION = ('bfs', 'vectorise', 'parallele')
+METHODES_DEBOISEMENT = ('articulation', 'force_brute')
+MODES_APERCU = ('majorite', 'brule')
+
+
+def _table_symboles(symboles: Dict[int, str]) -> np.ndarray:
+    """Table de correspondance valeur de case -> caractère d'affichage ('?' pour les valeurs inconnues)"""
+    table = np.full(256, '?', dtype='U1')
+    table[list(symboles.keys())] = list(symboles.values())
+    return table
+
+
+# Affichage console : symboles (émojis) ou lettres
+SYMBOLES_CONSOLE = _table_symboles({
+    TerrainType.TERRAIN_NU.value: '.',
+    TerrainType.ARBRE.value: '🌲',
+    TerrainType.EAU.value: '💧',
+    TerrainType.FEU.value: '🔥',
+    TerrainType.BRULE.value: '🔥'
+})
+LETTRES_CONSOLE = _table_symboles({
+    TerrainType.TERRAIN_NU.value: '.',
+    TerrainType.ARBRE.value: 'T',
+    TerrainType.EAU.value: 'W',
+    TerrainType.FEU.value: 'F',
+    TerrainType.BRULE.value: 'X'
+})
+
+# Couleur, symbole et libellé de légende de chaque valeur affichée dans les exports HTML
+PALETTE_TERRAIN = {
+    TerrainType.TERRAIN_NU.value: ('#D2B48C', '.', 'Terrain nu'),  # Beige pour terrain nu
+    TerrainType.ARBRE.value: ('#228B22', '🌲', 'Arbres'),  # Vert pour les arbres
+    TerrainType.EAU.value: ('#4169E1', '💧', 'Eau'),  # Bleu pour l'eau
+    TerrainType.BRULE.value: ('#DC143C', '🔥', 'Zone brûlée')  # Rouge pour les zones brûlées
+}
+
+# Classes de la carte de risque, selon la part des arbres de la carte brûlés depuis la case
+SEUILS_RISQUE = (1.0, 10.0, 50.0)
+PALETTE_RISQUE = {
+    0: ('#D2B48C', '.', 'Pas d\'arbre'),
+    1: ('#FFF3B0', '1', 'Risque < 1 %'),
+    2: ('#FDB863', '2', 'Risque 1-10 %'),
+    3: ('#E66101', '3', 'Risque 10-50 %'),
+    4: ('#8B0000', '4', 'Risque ≥ 50 %')
+}
+
+
+class IndexVoisinage:
+    """
+    Index des 8 voisins d'une grille hauteur × largeur, construit une fois par dimension de carte.
+
+    La grille est entourée d'une bordure d'une case : le voisin d'une case d'indice plat p dans la
+    grille bordée est p + décalage, pour chacun des 8 décalages int32, sans aucun test de bord.
+    """
+
+    DIRECTIONS = tuple((di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj)
+
+    def __init__(self, hauteur: int, largeur: int):
+        self.hauteur = hauteur
+        self.largeur = largeur
+        self.largeur_padee = largeur + 2
+        self.decalages = np.array([di * self.largeur_padee + dj for di, dj in self.DIRECTIONS], dtype=np.int32)
+        # Voisins "avant" (droite et ligne suivante) : chaque paire de voisins n'est vue qu'une fois
+        self.decalages_avant = self.decalages[4:]
+        self.liste_decalages = [int(decalage) for decalage in self.decalages]
+
+    @property
+    def forme(self) -> Tuple[int, int]:
+        return self.hauteur, self.largeur
+
+    def vers_plat(self, ligne: int, colonne: int) -> int:
+        """Indice plat, dans la grille bordée, de la case (ligne, colonne)"""
+        return (ligne + 1) * self.largeur_padee + colonne + 1
+
+    def depuis_plat(self, indices):
+        """Convertit des indices plats de la grille bordée en (lignes, colonnes) de la carte"""
+        return indices // self.largeur_padee - 1, indices % self.largeur_padee - 1
+
+    def masque_pade(self, masque: np.ndarray) -> np.ndarray:
+        """Retourne le masque booléen à plat dans la grille bordée (bordure à False)"""
+        pade = np.zeros((self.hauteur + 2, self.largeur_padee), dtype=bool)
+        pade[1:-1, 1:-1] = masque
+        return pade.ravel()
+
+    def retirer_bordure(self, valeurs_padees: np.ndarray) -> np.ndarray:
+        """Vue (hauteur, largeur) d'un tableau plat indexé sur la grille bordée"""
+        return valeurs_padees.reshape(self.hauteur + 2, self.largeur_padee)[1:-1, 1:-1]
+
+    def voisins(self, ligne: int, colonne: int) -> list:
+        """Liste des coordonnées des voisins d'une case, dans l'ordre des DIRECTIONS"""
+        return [(ligne + di, colonne + dj) for di, dj in self.DIRECTIONS
+                if 0 <= ligne + di < self.hauteur and 0 <= colonne + dj < self.largeur]
+
+
+def _etiqueter_composantes(masque_pade: np.ndarray, decalages_avant: np.ndarray) -> np.ndarray:
+    """
+    Étiquette les composantes 8-connexes d'un masque booléen plat d'une grille bordée,
+    par union-find vectorisé. Retourne, pour chaque case du masque, le numéro du représentant
+    de sa composante (-1 hors masque) : le rang, parmi les cases du masque, de la première case
+    de la composante.
+    """
+    cases = np.flatnonzero(masque_pade)
+    # Séries horizontales : une case en commence une si sa voisine de gauche (toujours présente
+    # grâce à la bordure) est hors du masque. Les cases d'une série sont reliées d'office, seules
+    # les séries passent par l'union-find, numérotées dans l'ordre des cases.
+    debuts = ~masque_pade[cases - 1]
+    serie_des_cases = np.cumsum(debuts) - 1
+    serie = np.full(masque_pade.shape, -1, dtype=np.int64)
+    serie[cases] = serie_des_cases
+
+    sources, cibles = [], []
+    for decalage in decalages_avant:
+        if decalage == 1:  # Voisine de droite : même série
+            continue
+        voisins = cases + decalage
+        lien = masque_pade[voisins]
+        sources.append(serie_des_cases[lien])
+        cibles.append(serie[voisins[lien]])
+    parent = _unir_aretes(int(np.count_nonzero(debuts)), np.concatenate(sources), np.concatenate(cibles))
+
+    # La plus petite série d'une composante commence à sa première case
+    etiquettes = np.full(masque_pade.shape, -1, dtype=np.int64)
+    etiquettes[cases] = np.flatnonzero(debuts)[parent[serie_des_cases]]
+    return etiquettes
+
+
+def _unir_aretes(nb_elements: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Union-find vectorisé des éléments 0..nb_elements-1 reliés par les arêtes (a[k], b[k]) :
+    retourne le tableau des représentants (le plus petit élément de chaque composante)
+    """
+    parent = np.arange(nb_elements)
+    while a.size:
+        racines_a, racines_b = parent[a], parent[b]
+        differentes = racines_a != racines_b
+        if not differentes.any():
+            break
+        a, b = a[differentes], b[differentes]
+        racines_a, racines_b = racines_a[differentes], racines_b[differentes]
+        # Accrocher la plus grande racine à la plus petite, puis compresser tous les chemins
+        np.minimum.at(parent, np.maximum(racines_a, racines_b), np.minimum(racines_a, racines_b))
+        while True:
+            grand_parent = parent[parent]
+            if np.array_equal(grand_parent, parent):
+                break
+            parent = grand_parent
+    return parent
+
+
+def _etiqueter_tuile(tuile: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Étiquettes compactes 0..n-1 des composantes d'arbres d'une tuile (-1 hors arbres) et leur
+    nombre n ; le résultat ne dépend que du contenu de la tuile
+    """
+    index = IndexVoisinage(*tuile.shape)
+    etiquettes = index.retirer_bordure(
+        _etiqueter_composantes(index.masque_pade(tuile == TerrainType.ARBRE.value), index.decalages_avant))
+    arbres = etiquettes >= 0
+    racines, compactes = np.unique(etiquettes[arbres], return_inverse=True)
+    resultat = np.full(tuile.shape, -1, dtype=np.int64)
+    resultat[arbres] = compactes
+    return resultat, racines.size
+
+
+def _aretes_couture(cote_a: np.ndarray, cote_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Arêtes entre les étiquettes de deux rangées de cases qui se font face de part et d'autre d'une
+    couture entre tuiles : la case k d'un côté touche les cases k-1, k et k+1 de l'autre
+    """
+    n = cote_a.size
+    sources, cibles = [], []
+    for decalage in (-1, 0, 1):
+        a = cote_a[max(0, -decalage):n - max(0, decalage)]
+        b = cote_b[max(0, decalage):n - max(0, -decalage)]
+        lien = (a >= 0) & (b >= 0)
+        sources.append(a[lien])
+        cibles.append(b[lien])
+    return np.concatenate(sources), np.concatenate(cibles)
+
+
+def _etiqueter_bande(nom_carte: str, nom_etiquettes: str, forme: Tuple[int, int], debut: int,
+                     fin: int) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Tâche d'un processus : étiquette les lignes [debut, fin) de la carte en mémoire partagée et
+    écrit les étiquettes locales dans le tableau partagé. Retourne le nombre de composantes et
+    les étiquettes des deux lignes de bord (le halo échangé avec les bandes voisines).
+    """
+    memoire_carte = shared_memory.SharedMemory(name=nom_carte)
+    memoire_etiquettes = shared_memory.SharedMemory(name=nom_etiquettes)
+    try:
+        carte = np.ndarray(forme, dtype=np.uint8, buffer=memoire_carte.buf)
+        etiquettes = np.ndarray(forme, dtype=np.int64, buffer=memoire_etiquettes.buf)
+        locales, n = _etiqueter_tuile(carte[debut:fin])
+        etiquettes[debut:fin] = locales
+        resultat = n, locales[0].copy(), locales[-1].copy()
+        del carte, etiquettes
+        return resultat
+    finally:
+        memoire_carte.close()
+        memoire_etiquettes.close()
+
+
+def _renumeroter_bande(nom_etiquettes: str, forme: Tuple[int, int], debut: int, fin: int,
+                       correspondance: np.ndarray):
+    """Tâche d'un processus : remplace les étiquettes locales des lignes [debut, fin) par les globales"""
+    memoire_etiquettes = shared_memory.SharedMemory(name=nom_etiquettes)
+    try:
+        bande = np.ndarray(forme, dtype=np.int64, buffer=memoire_etiquettes.buf)[debut:fin]
+        arbres = bande >= 0
+        bande[arbres] = correspondance[bande[arbres]]
+        del bande
+    finally:
+        memoire_etiquettes.close()
+
+
+def _etiqueter_en_parallele(carte: np.ndarray, nb_processus: int) -> np.ndarray:
+    """
+    Étiquette les composantes 8-connexes d'arbres de la carte avec nb_processus processus
+
+    La carte est copiée en mémoire partagée et découpée en bandes horizontales, une par processus.
+    Chaque bande est étiquetée séparément ; les lignes de bord renvoyées par les processus sont
+    recousues par union-find, puis chaque processus renumérote sa bande. Retourne les étiquettes
+    globales 0..n-1 (-1 hors arbres).
+    """
+    hauteur, largeur = carte.shape
+    bornes = np.linspace(0, hauteur, min(nb_processus, hauteur) + 1).astype(int)
+    memoire_carte = shared_memory.SharedMemory(create=True, size=max(1, carte.size))
+    memoire_etiquettes = shared_memory.SharedMemory(create=True, size=max(1, carte.size * 8))
+    try:
+        np.ndarray(carte.shape, dtype=np.uint8, buffer=memoire_carte.buf)[...] = carte
+        with ProcessPoolExecutor(max_workers=len(bornes) - 1) as executeur:
+            nb_bandes = len(bornes) - 1
+            bandes = list(executeur.map(_etiqueter_bande, [memoire_carte.name] * nb_bandes,
+                                        [memoire_etiquettes.name] * nb_bandes, [carte.shape] * nb_bandes,
+                                        bornes[:-1], bornes[1:]))
+
+            # Recoudre les bandes : étiquettes globales = étiquette locale + premier numéro de la bande
+            premiers = np.concatenate([[0], np.cumsum([n for n, _, _ in bandes])])
+            sources, cibles = [], []
+            for k in range(nb_bandes - 1):
+                bas = np.where(bandes[k][2] >= 0, bandes[k][2] + premiers[k], -1)
+                haut = np.where(bandes[k + 1][1] >= 0, bandes[k + 1][1] + premiers[k + 1], -1)
+                a, b = _aretes_couture(bas, haut)
+                sources.append(a)
+                cibles.append(b)
+            a = np.concatenate(sources) if sources else np.empty(0, dtype=np.int64)
+            b = np.concatenate(cibles) if cibles else np.empty(0, dtype=np.int64)
+            _, correspondance = np.unique(_unir_aretes(int(premiers[-1]), a, b), return_inverse=True)
+
+            list(executeur.map(_renumeroter_bande, [memoire_etiquettes.name] * nb_bandes, [carte.shape] * nb_bandes,
+                               bornes[:-1], bornes[1:],
+                               [correspondance[premiers[k]:premiers[k + 1]] for k in range(nb_bandes)]))
+
+        return np.ndarray(carte.shape, dtype=np.int64, buffer=memoire_etiquettes.buf).copy()
+    finally:
+        memoire_carte.close()
+        memoire_carte.unlink()
+        memoire_etiquettes.close()
+        memoire_etiquettes.unlink()
+
+
+def _arbres_brules_apres_retrait(index: IndexVoisinage, composante: np.ndarray,
+                                 ligne_depart: int, colonne_depart: int) -> np.ndarray:
+    """
+    Calcule, pour chaque case d'une composante en feu, le nombre d'arbres brûlés si elle est déboisée.
+
+    Un parcours en profondeur itératif (Tarjan) depuis le départ donne l'ordre de découverte, la
+    valeur low et la taille du sous-arbre de chaque case : déboiser v protège v et chaque sous-arbre
+    enfant c tel que low[c] >= disc[v] (v est alors un point d'articulation qui le sépare du feu).
+    Les cases hors composante et la case de départ valent la taille de la composante.
+    """
+    dans_composante = bytearray(index.masque_pade(composante))
+    decalages = index.liste_decalages
+
+    nb_cases = len(dans_composante)
+    decouverte = [0] * nb_cases
+    low = [0] * nb_cases
+    taille = [0] * nb_cases
+    protegees = [0] * nb_cases
+    visitees = []
+
+    racine = index.vers_plat(ligne_depart, colonne_depart)
+    decouverte[racine] = low[racine] = 1
+    taille[racine] = 1
+    visitees.append(racine)
+    temps = 1
+    pile = [racine]
+    positions = [0]
+
+    while pile:
+        v = pile[-1]
+        k = positions[-1]
+        if k < 8:
+            positions[-1] = k + 1
+            w = v + decalages[k]
+            if not dans_composante[w]:
+                continue
+            if decouverte[w] == 0:
+                temps += 1
+                decouverte[w] = low[w] = temps
+                taille[w] = 1
+                visitees.append(w)
+                pile.append(w)
+                positions.append(0)
+            elif decouverte[w] < low[v]:
+                low[v] = decouverte[w]
+        else:
+            pile.pop()
+            positions.pop()
+            if pile:
+                p = pile[-1]
+                taille[p] += taille[v]
+                if low[v] < low[p]:
+                    low[p] = low[v]
+                if low[v] >= decouverte[p]:
+                    protegees[p] += taille[v]
+
+    taille_composante = len(visitees)
+    resultat = np.full(nb_cases, taille_composante, dtype=np.int64)
+    cases = np.array(visitees[1:], dtype=np.int64)
+    resultat[cases] = taille_composante - 1 - np.array([protegees[v] for v in visitees[1:]], dtype=np.int64)
+    return index.retirer_bordure(resultat).copy()
+
+
+def _parcourir_composante(dans_composante: bytearray, racine: int, decalages: List[int]) -> Tuple[List[int], int]:
+    """
+    Retourne les indices (plats, grille bordée) des cases atteintes depuis la racine dans le masque,
+    et la longueur maximale de la file du parcours
+    """
+    restantes = bytearray(dans_composante)
+    restantes[racine] = 0
+    atteintes = [racine]
+    pic_file = 1
+    for k, v in enumerate(atteintes):
+        for decalage in decalages:
+            w = v + decalage
+            if restantes[w]:
+                restantes[w] = 0
+                atteintes.append(w)
+        if len(atteintes) - k - 1 > pic_file:
+            pic_file = len(atteintes) - k - 1
+    return atteintes, pic_file
+
+
+class IndexComposantes:
+    """
+    Index persistant des composantes 8-connexes d'arbres d'une carte : une étiquette par case
+    (grille bordée) et un union-find sur les étiquettes, avec la taille de chaque composante.
+
+    Construit en une passe d'étiquetage, il répond ensuite en O(1) (amorti) au nombre d'arbres
+    brûlés depuis une case, et se met à jour case par case : planter un arbre réunit les
+    composantes voisines, retirer un arbre ne réétiquette que si ses voisins ne restent pas
+    reliés autour de lui, et seulement les parties séparées. Les étiquettes sont abstraites :
+    seule l'égalité de composante() entre deux cases a un sens.
+    """
+
+    def __init__(self, carte: np.ndarray, index: IndexVoisinage):
+        self.index = index
+        arbres = index.masque_pade(carte == TerrainType.ARBRE.value)
+        self.etiquettes = _etiqueter_composantes(arbres, index.decalages_avant)
+        self.arbres = bytearray(arbres)
+        self.nb_arbres = int(np.count_nonzero(arbres))
+        # Étiquettes initiales : rangs d'arbres, toutes racines de leur composante
+        self.parent = np.arange(max(self.nb_arbres, 1), dtype=np.int64)
+        self.taille = np.bincount(self.etiquettes[self.etiquettes >= 0], minlength=self.parent.size)
+        self.nb_composantes = int(np.count_nonzero(self.taille))
+        self.nb_etiquettes = self.nb_arbres
+
+    def _racine(self, etiquette: int) -> int:
+        parent = self.parent
+        while parent[etiquette] != etiquette:
+            parent[etiquette] = parent[parent[etiquette]]  # Compression par moitié
+            etiquette = parent[etiquette]
+        return int(etiquette)
+
+    def _nouvelle_etiquette(self, taille: int) -> int:
+        if self.nb_etiquettes == self.parent.size:
+            self.parent = np.concatenate([self.parent, np.arange(self.parent.size, 2 * self.parent.size)])
+            self.taille = np.concatenate([self.taille, np.zeros(self.taille.size, dtype=self.taille.dtype)])
+        etiquette = self.nb_etiquettes
+        self.nb_etiquettes += 1
+        self.taille[etiquette] = taille
+        return etiquette
+
+    def composante(self, ligne: int, colonne: int) -> int:
+        """Identifiant de la composante de la case, -1 hors arbres"""
+        v = self.index.vers_plat(ligne, colonne)
+        return self._racine(int(self.etiquettes[v])) if self.arbres[v] else -1
+
+    def taille_composante(self, ligne: int, colonne: int) -> int:
+        """Nombre d'arbres de la composante de la case (les arbres brûlés si le feu y démarre), 0 hors arbres"""
+        v = self.index.vers_plat(ligne, colonne)
+        return int(self.taille[self._racine(int(self.etiquettes[v]))]) if self.arbres[v] else 0
+
+    def ajouter(self, ligne: int, colonne: int):
+        """Un arbre apparaît sur la case : il rejoint, en les réunissant, les composantes de ses voisins"""
+        v = self.index.vers_plat(ligne, colonne)
+        if self.arbres[v]:
+            return
+        racines = {self._racine(int(self.etiquettes[v + d])) for d in self.index.liste_decalages if self.arbres[v + d]}
+        if racines:
+            # Les autres composantes sont accrochées à la plus grande
+            racine = max(racines, key=lambda r: self.taille[r])
+            for autre in racines - {racine}:
+                self.parent[autre] = racine
+                self.taille[racine] += self.taille[autre]
+            self.taille[racine] += 1
+            self.nb_composantes -= len(racines) - 1
+        else:
+            racine = self._nouvelle_etiquette(1)
+            self.nb_composantes += 1
+        self.arbres[v] = 1
+        self.etiquettes[v] = racine
+        self.nb_arbres += 1
+
+    def retirer(self, ligne: int, colonne: int):
+        """
+        L'arbre de la case disparaît. Si ses voisins restent reliés entre eux par l'anneau des 8
+        cases autour de lui, tout chemin qui passait par lui le contourne : rien à réétiqueter.
+        Sinon la composante a pu se scinder, ce que tranche _separer.
+        """
+        v = self.index.vers_plat(ligne, colonne)
+        if not self.arbres[v]:
+            return
+        racine = self._racine(int(self.etiquettes[v]))
+        self.arbres[v] = 0
+        self.etiquettes[v] = -1
+        self.taille[racine] -= 1
+        self.nb_arbres -= 1
+
+        voisins = [v + d for d in self.index.liste_decalages if self.arbres[v + d]]
+        if not voisins:
+            self.nb_composantes -= 1
+            return
+
+        # Groupes de voisins reliés dans l'anneau (au plus 8 cases)
+        groupe = list(range(len(voisins)))
+        for a in range(len(voisins)):
+            for b in range(a + 1, len(voisins)):
+                if voisins[b] - voisins[a] in self.index.liste_decalages:
+                    ga, gb = groupe[a], groupe[b]
+                    groupe = [ga if g == gb else g for g in groupe]
+        representants = [voisins[k] for k in range(len(voisins)) if groupe[k] == k]
+        if len(representants) > 1:
+            self._separer(racine, representants)
+
+    def _separer(self, racine: int, representants: List[int]):
+        """
+        Un parcours en largeur par groupe de voisins, avancés à tour de rôle d'une case : deux
+        parcours qui se rencontrent fusionnent, un parcours (fusionné) dont la file se vide a
+        couvert une composante détachée, qui reçoit une étiquette neuve. On s'arrête dès qu'il ne
+        reste qu'un parcours actif, qui garde l'étiquette d'origine : le travail est borné par le
+        nombre de groupes fois la plus petite des parties, pas par la taille de la composante.
+        """
+        decalages = self.index.liste_decalages
+        arbres = self.arbres
+        nb_parcours = len(representants)
+        marque = {r: k for k, r in enumerate(representants)}
+        files = [deque([r]) for r in representants]
+        visitees = [[r] for r in representants]
+        fusion = list(range(nb_parcours))
+        epuises = set()
+
+        def chef(k):
+            while fusion[k] != k:
+                k = fusion[k]
+            return k
+
+        actifs = nb_parcours
+        while actifs > 1:
+            for k in range(nb_parcours):
+                if not files[k]:
+                    continue
+                v = files[k].popleft()
+                for decalage in decalages:
+                    w = v + decalage
+                    if not arbres[w]:
+                        continue
+                    autre = marque.get(w)
+                    if autre is None:
+                        marque[w] = k
+                        files[k].append(w)
+                        visitees[k].append(w)
+                    elif chef(autre) != chef(k):
+                        fusion[chef(autre)] = chef(k)
+                        actifs -= 1
+                if not files[k]:
+                    membres = [m for m in range(nb_parcours) if chef(m) == chef(k)]
+                    if chef(k) not in epuises and not any(files[m] for m in membres):
+                        epuises.add(chef(k))
+                        actifs -= 1
+                if actifs <= 1:
+                    break
+
+        for chef_epuise in epuises:
+            cases = [w for m in range(nb_parcours) if chef(m) == chef_epuise for w in visitees[m]]
+            etiquette = self._nouvelle_etiquette(len(cases))
+            self.etiquettes[np.array(cases, dtype=np.int64)] = etiquette
+            self.taille[racine] -= len(cases)
+        # Parties : les composantes détachées, plus celle qui garde l'étiquette d'origine s'il en reste une
+        self.nb_composantes += len(epuises) + actifs - 1
+
+    def modifier(self, ligne: int, colonne: int, ancienne: int, nouvelle: int):
+        """Répercute le changement de valeur d'une case de la carte"""
+        if ancienne == TerrainType.ARBRE.value and nouvelle != TerrainType.ARBRE.value:
+            self.retirer(ligne, colonne)
+        elif ancienne != TerrainType.ARBRE.value and nouvelle == TerrainType.ARBRE.value:
+            self.ajouter(ligne, colonne)
+
+
+class CarteBrulee:
+    """
+    Carte après incendie stockée de façon compacte
+
+    Elle garde une carte de base uint8 (partageable entre plusieurs résultats), quelques
+    modifications ponctuelles (case déboisée...) et les cases brûlées, en indices creux quand
+    elles sont rares ou en masque de bits sinon. La carte complète n'est reconstruite qu'à la
+    demande (en_tableau, np.asarray), en lecture seule, puis conservée.
+    """
+
+    def __init__(self, base: np.ndarray, brulees: np.ndarray, modifications: Dict[Tuple[int, int], int] = None):
+        self.base = base
+        self.modifications = dict(modifications or {})
+        self.nb_brulees = int(np.count_nonzero(brulees))
+        # Un indice int32 coûte 32 bits, une case du masque de bits 1 bit
+        if self.nb_brulees * 32 < brulees.size:
+            type_indice = np.int32 if brulees.size < 2 ** 31 else np.int64
+            self.indices = np.flatnonzero(brulees).astype(type_indice)
+            self.bits = None
+        else:
+            self.indices = None
+            self.bits = np.packbits(brulees.ravel())
+        self._tableau = None
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.base.shape
+
+    @property
+    def nbytes(self) -> int:
+        """Taille du stockage propre au résultat (la carte de base partagée n'est pas comptée)"""
+        return self.indices.nbytes if self.indices is not None else self.bits.nbytes
+
+    def masque(self) -> np.ndarray:
+        """Masque booléen des cases brûlées"""
+        if self.indices is not None:
+            masque = np.zeros(self.base.size, dtype=bool)
+            masque[self.indices] = True
+        else:
+            masque = np.unpackbits(self.bits, count=self.base.size).astype(bool)
+        return masque.reshape(self.base.shape)
+
+    def en_tableau(self) -> np.ndarray:
+        """Reconstruit (une seule fois) la carte complète après incendie, en lecture seule"""
+        if self._tableau is None:
+            tableau = self.base.copy()
+            for (ligne, colonne), valeur in self.modifications.items():
+                tableau[ligne, colonne] = valeur
+            tableau[self.masque()] = TerrainType.BRULE.value
+            tableau.flags.writeable = False
+            self._tableau = tableau
+        return self._tableau
+
+    def partager(self) -> 'CarteBrulee':
+        """Autre résultat sur le même stockage compact, sans la carte complète déjà reconstruite"""
+        carte = copy.copy(self)
+        carte._tableau = None
+        return carte
+
+    def lignes(self, debut: int, fin: int) -> np.ndarray:
+        """Reconstruit seulement les lignes [debut, fin) de la carte après incendie"""
+        if self._tableau is not None:
+            return self._tableau[debut:fin]
+
+        largeur = self.base.shape[1]
+        bloc = self.base[debut:fin].copy()
+        fin = debut + bloc.shape[0]
+        for (ligne, colonne), valeur in self.modifications.items():
+            if debut <= ligne < fin:
+                bloc[ligne - debut, colonne] = valeur
+
+        premier, dernier = debut * largeur, fin * largeur
+        if self.indices is not None:
+            a, b = np.searchsorted(self.indices, [premier, dernier])
+            bloc.reshape(-1)[self.indices[a:b] - premier] = TerrainType.BRULE.value
+        else:
+            bits = np.unpackbits(self.bits[premier // 8:(dernier + 7) // 8])
+            masque = bits[premier % 8:premier % 8 + dernier - premier].astype(bool)
+            bloc.reshape(-1)[masque] = TerrainType.BRULE.value
+        return bloc
+
+    def copy(self) -> np.ndarray:
+        return self.en_tableau().copy()
+
+    def __array__(self, dtype=None, copy=None):
+        # La carte reconstruite est conservée : hors copy=False, np.array en donne une copie indépendante
+        tableau = self.en_tableau()
+        if dtype is not None:
+            return tableau.astype(dtype, copy=copy is not False)
+        return tableau if copy is False else tableau.copy()
+
+    def __getitem__(self, cle):
+        if isinstance(cle, slice) and cle.step in (None, 1):
+            debut, fin, _ = cle.indices(self.base.shape[0])
+            return self.lignes(debut, fin)
+        return self.en_tableau()[cle]
+
+
+# Format de fichier .carte : MAGIQUE, blocs de données, en-tête JSON, puis une fin de fichier
+# (position et longueur de l'en-tête, MAGIQUE). Chaque tableau y est stocké soit brut (aligné,
+# projetable en mémoire avec np.memmap), soit en tuiles compressées par zlib suivies de leur index
+MAGIQUE_FICHIER_CARTE = b'FFSCARTE'
+VERSION_FICHIER_CARTE = 1
+FIN_FICHIER_CARTE = struct.Struct('<QQ8s')
+ALIGNEMENT_FICHIER_CARTE = 64
+
+
+def _valeur_json(valeur):
+    """Conversion des scalaires et tableaux NumPy pour json.dumps"""
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    if isinstance(valeur, np.ndarray):
+        return valeur.tolist()
+    raise TypeError(f"Valeur non sérialisable en JSON: {type(valeur).__name__}")
+
+
+def ecrire_fichier_carte(chemin: str, tableaux: Dict[str, Any], metadonnees: Dict[str, Any] = None,
+                         compression: bool = True, taille_tuile: int = 256):
+    """
+    Écrit des tableaux 2D (carte, carte après incendie...) et leurs métadonnées dans un fichier .carte
+
+    Les tableaux sont lus par bandes de taille_tuile lignes : une CarteBrulee n'est jamais
+    reconstruite en entier. Les erreurs d'écriture sont propagées (OSError).
+    """
+    if taille_tuile <= 0:
+        raise ValueError("La taille de tuile doit être strictement positive")
+
+    descriptions = {}
+    with open(chemin, 'wb') as f:
+        f.write(MAGIQUE_FICHIER_CARTE)
+        for nom, tableau in tableaux.items():
+            hauteur, largeur = tableau.shape
+            type_valeurs = np.dtype(tableau.base.dtype if isinstance(tableau, CarteBrulee) else tableau.dtype)
+            description = {'forme': [hauteur, largeur], 'dtype': type_valeurs.str, 'compression': None}
+
+            if compression:
+                bornes = [f.tell()]
+                for ligne in range(0, hauteur, taille_tuile):
+                    bande = np.asarray(tableau[ligne:ligne + taille_tuile])
+                    for colonne in range(0, largeur, taille_tuile):
+                        f.write(zlib.compress(np.ascontiguousarray(bande[:, colonne:colonne + taille_tuile]).tobytes()))
+                        bornes.append(f.tell())
+                description.update(compression='zlib', tuile=taille_tuile, index=f.tell())
+                f.write(np.asarray(bornes, dtype='<u8').tobytes())
+            else:
+                f.write(b'\0' * (-f.tell() % ALIGNEMENT_FICHIER_CARTE))
+                description['position'] = f.tell()
+                for ligne in range(0, hauteur, taille_tuile):
+                    f.write(np.ascontiguousarray(tableau[ligne:ligne + taille_tuile], dtype=type_valeurs).tobytes())
+            descriptions[nom] = description
+
+        entete = json.dumps({'version': VERSION_FICHIER_CARTE, 'tableaux': descriptions,
+                             'metadonnees': metadonnees or {}}, default=_valeur_json).encode('utf-8')
+        position_entete = f.tell()
+        f.write(entete)
+        f.write(FIN_FICHIER_CARTE.pack(position_entete, len(entete), MAGIQUE_FICHIER_CARTE))
+
+
+class FichierCarte:
+    """
+    Lecture d'un fichier .carte : seul l'en-tête est lu à l'ouverture
+
+    Un tableau brut se lit par projection mémoire (np.memmap), un tableau compressé tuile par
+    tuile ; lire_fenetre ne touche que la partie du fichier qui couvre la fenêtre demandée.
+    """
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        with open(chemin, 'rb') as f:
+            if f.read(len(MAGIQUE_FICHIER_CARTE)) != MAGIQUE_FICHIER_CARTE:
+                raise ValueError(f"{chemin} n'est pas un fichier de carte")
+            f.seek(0, os.SEEK_END)
+            if f.tell() < len(MAGIQUE_FICHIER_CARTE) + FIN_FICHIER_CARTE.size:
+                raise ValueError(f"Fichier de carte tronqué: {chemin}")
+            f.seek(-FIN_FICHIER_CARTE.size, os.SEEK_END)
+            position_entete, longueur_entete, magique = FIN_FICHIER_CARTE.unpack(f.read(FIN_FICHIER_CARTE.size))
+            if magique != MAGIQUE_FICHIER_CARTE:
+                raise ValueError(f"Fichier de carte tronqué: {chemin}")
+            f.seek(position_entete)
+            entete = json.loads(f.read(longueur_entete).decode('utf-8'))
+
+        if entete['version'] > VERSION_FICHIER_CARTE:
+            raise ValueError(f"Version de fichier de carte non prise en charge: {entete['version']}")
+        self.tableaux = entete['tableaux']
+        self.metadonnees = entete['metadonnees']
+
+    def forme(self, nom: str) -> Tuple[int, int]:
+        return tuple(self._description(nom)['forme'])
+
+    def _description(self, nom: str) -> dict:
+        if nom not in self.tableaux:
+            raise KeyError(f"Tableau absent du fichier {self.chemin}: {nom}")
+        return self.tableaux[nom]
+
+    def _projection(self, description: dict, mmap_mode: str = 'r') -> np.memmap:
+        return np.memmap(self.chemin, dtype=np.dtype(description['dtype']), mode=mmap_mode,
+                         offset=description['position'], shape=tuple(description['forme']))
+
+    def lire(self, nom: str, mmap_mode: str = None) -> np.ndarray:
+        """
+        Lit un tableau en entier ; avec mmap_mode ('r', 'r+' ou 'c', comme np.load), un tableau
+        brut est projeté en mémoire au lieu d'être lu
+        """
+        description = self._description(nom)
+        if description['compression'] is None:
+            projection = self._projection(description, mmap_mode or 'r')
+            return projection if mmap_mode else np.array(projection)
+        if mmap_mode:
+            raise ValueError(f"Le tableau {nom} est compressé : il ne peut pas être projeté en mémoire")
+        hauteur, largeur = description['forme']
+        return self.lire_fenetre(nom, 0, hauteur, 0, largeur)
+
+    def lire_fenetre(self, nom: str, ligne_debut: int, ligne_fin: int, colonne_debut: int,
+                     colonne_fin: int) -> np.ndarray:
+        """Lit la fenêtre [ligne_debut, ligne_fin) × [colonne_debut, colonne_fin) d'un tableau"""
+        description = self._description(nom)
+        hauteur, largeur = description['forme']
+        ligne_debut, ligne_fin = max(0, ligne_debut), min(hauteur, ligne_fin)
+        colonne_debut, colonne_fin = max(0, colonne_debut), min(largeur, colonne_fin)
+        if description['compression'] is None:
+            return np.array(self._projection(description)[ligne_debut:ligne_fin, colonne_debut:colonne_fin])
+
+        type_valeurs = np.dtype(description['dtype'])
+        tuile = description['tuile']
+        nb_colonnes_tuiles = -(-largeur // tuile)
+        fenetre = np.empty((max(0, ligne_fin - ligne_debut), max(0, colonne_fin - colonne_debut)), dtype=type_valeurs)
+        if fenetre.size == 0:
+            return fenetre
+
+        with open(self.chemin, 'rb') as f:
+            f.seek(description['index'])
+            nb_tuiles = -(-hauteur // tuile) * nb_colonnes_tuiles
+            bornes = np.frombuffer(f.read(8 * (nb_tuiles + 1)), dtype='<u8')
+            for ti in range(ligne_debut // tuile, (ligne_fin - 1) // tuile + 1):
+                for tj in range(colonne_debut // tuile, (colonne_fin - 1) // tuile + 1):
+                    k = ti * nb_colonnes_tuiles + tj
+                    f.seek(int(bornes[k]))
+                    donnees = zlib.decompress(f.read(int(bornes[k + 1] - bornes[k])))
+                    l0, c0 = ti * tuile, tj * tuile
+                    bloc = np.frombuffer(donnees, dtype=type_valeurs).reshape(
+                        min(tuile, hauteur - l0), min(tuile, largeur - c0))
+                    # Intersection de la tuile et de la fenêtre
+                    i0, i1 = max(l0, ligne_debut), min(l0 + tuile, ligne_fin)
+                    j0, j1 = max(c0, colonne_debut), min(c0 + tuile, colonne_fin)
+                    fenetre[i0 - ligne_debut:i1 - ligne_debut, j0 - colonne_debut:j1 - colonne_debut] = \
+                        bloc[i0 - l0:i1 - l0, j0 - c0:j1 - c0]
+        return fenetre
+
+
+STYLE_HTML = """
+        body {
+            font-family: Arial, sans-serif;
+            margin: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background-color: white;
+            padding: 20px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #333;
+            text-align: center;
+            margin-bottom: 20px;
+        }
+        .description {
+            background-color: #e8f4f8;
+            padding: 15px;
+            border-radius: 5px;
+            margin-bottom: 20px;
+            border-left: 5px solid #007acc;
+        }
+        .carte {
+            display: block;
+            margin: 20px auto;
+            border: 1px solid #888;
+            image-rendering: pixelated;
+            cursor: crosshair;
+        }
+        .legende {
+            display: flex;
+            justify-content: center;
+            gap: 20px;
+            margin-top: 20px;
+            flex-wrap: wrap;
+        }
+        .legende-item {
+            display: flex;
+            align-items: center;
+            gap: 5px;
+            padding: 5px 10px;
+            background-color: #f0f0f0;
+            border-radius: 15px;
+        }
+        .legende-couleur {
+            width: 15px;
+            height: 15px;
+            border: 1px solid #333;
+            border-radius: 3px;
+        }
+        .timestamp {
+            text-align: center;
+            color: #666;
+            font-size: 12px;
+            margin-top: 20px;
+        }
+"""
+
+# Dessine chaque <canvas class="carte"> depuis son image PNG et calcule les infobulles côté navigateur
+SCRIPT_CARTES_HTML = """
+        document.querySelectorAll('canvas.carte').forEach(function (canvas) {
+            var image = new Image();
+            var symboles = JSON.parse(canvas.dataset.symboles);
+            image.onload = function () {
+                var source = document.createElement('canvas');
+                source.width = image.width;
+                source.height = image.height;
+                var contexteSource = source.getContext('2d');
+                contexteSource.drawImage(image, 0, 0);
+                var pixels = contexteSource.getImageData(0, 0, image.width, image.height).data;
+
+                var contexte = canvas.getContext('2d');
+                contexte.imageSmoothingEnabled = false;
+                contexte.drawImage(image, 0, 0, canvas.width, canvas.height);
+
+                canvas.addEventListener('mousemove', function (evenement) {
+                    var cadre = canvas.getBoundingClientRect();
+                    var j = Math.floor((evenement.clientX - cadre.left) * image.width / cadre.width);
+                    var i = Math.floor((evenement.clientY - cadre.top) * image.height / cadre.height);
+                    var k = 4 * (i * image.width + j);
+                    var cle = pixels[k] + ',' + pixels[k + 1] + ',' + pixels[k + 2];
+                    canvas.title = 'Ligne ' + i + ', Colonne ' + j + ': ' + (symboles[cle] || '?');
+                });
+            };
+            image.src = canvas.dataset.image;
+        });
+"""
+
+# Compléments du rapport unique : boutons de calques et tableau des durées
+STYLE_RAPPORT_HTML = """
+        .calques {
+            display: flex;
+            justify-content: center;
+            gap: 10px;
+            margin: 20px 0;
+        }
+        button.calque {
+            padding: 8px 15px;
+            border: 1px solid #007acc;
+            border-radius: 15px;
+            background-color: white;
+            cursor: pointer;
+        }
+        button.calque.actif {
+            background-color: #007acc;
+            color: white;
+        }
+        h2 {
+            color: #333;
+            text-align: center;
+        }
+        table.temps {
+            margin: 0 auto 20px auto;
+            border-collapse: collapse;
+        }
+        table.temps th, table.temps td {
+            padding: 5px 15px;
+            border-bottom: 1px solid #ddd;
+            text-align: left;
+        }
+"""
+
+SCRIPT_CALQUES_HTML = """
+        document.querySelectorAll('button.calque').forEach(function (bouton) {
+            bouton.addEventListener('click', function () {
+                document.querySelectorAll('section.couche').forEach(function (couche) {
+                    couche.hidden = couche.id !== bouton.dataset.calque;
+                });
+                document.querySelectorAll('button.calque').forEach(function (autre) {
+                    autre.classList.toggle('actif', autre === bouton);
+                });
+            });
+        });
+"""
+
+LIBELLES_PHASES = {
+    'statistiques': "Statistiques de la carte",
+    'simulation_sans_deboisement': "Simulation sans déboisement",
+    'recherche_deboisement': "Recherche de la case à déboiser",
+    'simulation_avec_deboisement': "Simulation avec déboisement",
+    'total': "Total"
+}
+
+# Visionneur de la chronologie : la carte initiale est redessinée puis chaque étape colorie son front
+# en feu et le front précédent en brûlé
+PALETTE_CHRONOLOGIE = {
+    **PALETTE_TERRAIN,
+    TerrainType.FEU.value: ('#FF8C00', '🔥', 'En feu')  # Orange pour le front de l'incendie
+}
+
+STYLE_CHRONOLOGIE_HTML = """
+        .controles {
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            gap: 15px;
+            margin: 20px 0;
+        }
+        .controles input[type=range] {
+            width: 50%;
+        }
+        .controles button {
+            padding: 8px 15px;
+            border: 1px solid #007acc;
+            border-radius: 15px;
+            background-color: white;
+            cursor: pointer;
+        }
+"""
+
+SCRIPT_CHRONOLOGIE_HTML = """
+        document.querySelectorAll('canvas.chronologie').forEach(function (canvas) {
+            var binaire = atob(canvas.dataset.fronts);
+            var octets = new Uint8Array(binaire.length);
+            for (var k = 0; k < binaire.length; k++) {
+                octets[k] = binaire.charCodeAt(k);
+            }
+            var fronts = new Uint32Array(octets.buffer);
+            var decalages = JSON.parse(canvas.dataset.decalages);
+            var nbEtapes = decalages.length - 1;
+            var feu = canvas.dataset.feu.split(',').map(Number);
+            var brule = canvas.dataset.brule.split(',').map(Number);
+            var curseur = document.getElementById('curseur-etape');
+            var bouton = document.getElementById('lecture');
+            var libelle = document.getElementById('libelle-etape');
+
+            var image = new Image();
+            image.onload = function () {
+                var source = document.createElement('canvas');
+                source.width = image.width;
+                source.height = image.height;
+                var contexteSource = source.getContext('2d');
+                contexteSource.drawImage(image, 0, 0);
+                var initiale = contexteSource.getImageData(0, 0, image.width, image.height);
+                var etat = contexteSource.getImageData(0, 0, image.width, image.height);
+                var contexte = canvas.getContext('2d');
+                var etapeCourante = -1;
+                var minuterie = null;
+
+                function colorier(debut, fin, couleur) {
+                    for (var k = debut; k < fin; k++) {
+                        var p = 4 * fronts[k];
+                        etat.data[p] = couleur[0];
+                        etat.data[p + 1] = couleur[1];
+                        etat.data[p + 2] = couleur[2];
+                    }
+                }
+
+                function afficher(etape) {
+                    // Revenir en arrière repart de la carte initiale, avancer n'applique que les deltas
+                    if (etape < etapeCourante) {
+                        etat.data.set(initiale.data);
+                        etapeCourante = -1;
+                    }
+                    for (var e = etapeCourante + 1; e <= etape; e++) {
+                        if (e > 0) {
+                            colorier(decalages[e - 1], decalages[e], brule);
+                        }
+                        colorier(decalages[e], decalages[e + 1], feu);
+                    }
+                    etapeCourante = etape;
+                    contexteSource.putImageData(etat, 0, 0);
+                    contexte.imageSmoothingEnabled = false;
+                    contexte.drawImage(source, 0, 0, canvas.width, canvas.height);
+                    curseur.value = etape;
+                    libelle.textContent = 'Étape ' + etape + ' / ' + (nbEtapes - 1);
+                }
+
+                function pause() {
+                    clearInterval(minuterie);
+                    minuterie = null;
+                    bouton.textContent = '▶ Lecture';
+                }
+
+                bouton.addEventListener('click', function () {
+                    if (minuterie !== null) {
+                        pause();
+                        return;
+                    }
+                    if (etapeCourante >= nbEtapes - 1) {
+                        afficher(0);
+                    }
+                    bouton.textContent = '⏸ Pause';
+                    minuterie = setInterval(function () {
+                        if (etapeCourante >= nbEtapes - 1) {
+                            pause();
+                        } else {
+                            afficher(etapeCourante + 1);
+                        }
+                    }, Number(canvas.dataset.intervalle));
+                });
+                curseur.addEventListener('input', function () {
+                    pause();
+                    afficher(Number(curseur.value));
+                });
+                afficher(0);
+            };
+            image.src = canvas.dataset.image;
+        });
+"""
+
+
+def _morceaux_png_palette(carte: np.ndarray, correspondance: np.ndarray, couleurs: List[str],
+                          lignes_par_bloc: int = 256):
+    """
+    Encode une carte en image PNG à palette (une case = un pixel d'un octet), morceau par morceau
+
+    correspondance associe à chaque valeur de la carte son indice dans la liste de couleurs '#RRGGBB'.
+    Chaque groupe de lignes donne son propre bloc IDAT, ce qui permet d'écrire l'image au fil de l'eau.
+    """
+    def bloc_png(type_bloc: bytes, donnees: bytes) -> bytes:
+        return (struct.pack('>I', len(donnees)) + type_bloc + donnees +
+                struct.pack('>I', zlib.crc32(type_bloc + donnees) & 0xFFFFFFFF))
+
+    hauteur, largeur = np.shape(carte)
+    yield b'\x89PNG\r\n\x1a\n'
+    yield bloc_png(b'IHDR', struct.pack('>IIBBBBB', largeur, hauteur, 8, 3, 0, 0, 0))
+    yield bloc_png(b'PLTE', b''.join(bytes.fromhex(couleur[1:]) for couleur in couleurs))
+
+    compresseur = zlib.compressobj(6)
+    for debut in range(0, hauteur, lignes_par_bloc):
+        lignes = np.asarray(carte[debut:debut + lignes_par_bloc])
+        brut = np.zeros((lignes.shape[0], largeur + 1), dtype=np.uint8)  # Octet de filtre 0 en tête de ligne
+        brut[:, 1:] = correspondance[lignes]
+        donnees = compresseur.compress(brut.tobytes())
+        if donnees:
+            yield bloc_png(b'IDAT', donnees)
+    yield bloc_png(b'IDAT', compresseur.flush())
+    yield bloc_png(b'IEND', b'')
+
+
+def _base64_par_morceaux(morceaux):
+    """Encode en base64 un flux de morceaux d'octets, sans jamais le rassembler en mémoire"""
+    reste = b''
+    for morceau in morceaux:
+        morceau = reste + morceau
+        coupure = len(morceau) - len(morceau) % 3
+        if coupure:
+            yield base64.b64encode(morceau[:coupure]).decode('ascii')
+        reste = morceau[coupure:]
+    if reste:
+        yield base64.b64encode(reste).decode('ascii')
+
+
+def _melanger_splitmix64(x: np.ndarray) -> np.ndarray:
+    """Fonction de mélange splitmix64 appliquée élément par élément à un tableau uint64"""
+    z = x + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _tirages_uniformes(graines: np.ndarray, etape: int, cases: np.ndarray) -> np.ndarray:
+    """
+    Tirages uniformes dans [0, 1) dérivés uniquement de (graine de la réplique, étape, case) :
+    chaque réplique est reproductible indépendamment des autres, sans générateur par réplique
+    """
+    cle = _melanger_splitmix64(graines + np.uint64((etape * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF))
+    cle = _melanger_splitmix64(cle ^ cases.astype(np.uint64))
+    return (cle >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+def _empreinte_cases(indices: np.ndarray, valeurs: np.ndarray) -> int:
+    """
+    Somme modulo 2**64 des mélanges splitmix64 de (indice plat, valeur) des cases : changer une
+    case retire son ancien terme et ajoute le nouveau, l'empreinte d'une carte se tient à jour en O(1)
+    """
+    cles = indices.astype(np.uint64) * np.uint64(256) + valeurs.astype(np.uint64)
+    return int(np.sum(_melanger_splitmix64(cles), dtype=np.uint64))
+
+
+def _empreinte_carte(carte: np.ndarray, taille_bloc: int = 1 << 20) -> int:
+    """Empreinte complète d'une carte, calculée par blocs de cases pour borner la mémoire temporaire"""
+    valeurs = carte.ravel()
+    empreinte = 0
+    for debut in range(0, valeurs.size, taille_bloc):
+        bloc = valeurs[debut:debut + taille_bloc]
+        empreinte += _empreinte_cases(np.arange(debut, debut + bloc.size), bloc)
+    return empreinte & 0xFFFFFFFFFFFFFFFF
+
+
+class CacheResultats:
+    """
+    Cache LRU de résultats de simulation, borné par la mémoire estimée de ses entrées
+
+    Les clés contiennent l'empreinte de la carte : une carte modifiée ou rechargée ne retrouve
+    plus les résultats de l'ancienne (ils sortent du cache au fil des évictions), et une carte
+    revenue à un état déjà vu les retrouve. Un tableau partagé par plusieurs entrées (la carte
+    de base des résultats d'une même carte) n'est compté qu'une fois, tant qu'une entrée le garde.
+    """
+
+    def __init__(self, memoire_max: int = 64 * 2 ** 20):
+        self.memoire_max = memoire_max
+        # clé -> (valeur, taille en octets, tableau partagé ou None), de la plus ancienne à la plus récente
+        self.entrees = OrderedDict()
+        self.partages = {}  # id du tableau partagé -> [tableau, nombre d'entrées qui le gardent]
+        self.memoire = 0
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def lire(self, cle):
+        """Valeur associée à la clé (qui devient la plus récente), ou None"""
+        entree = self.entrees.get(cle)
+        if entree is None:
+            self.echecs += 1
+            return None
+        self.succes += 1
+        self.entrees.move_to_end(cle)
+        return entree[0]
+
+    def ecrire(self, cle, valeur, taille: int, partage: np.ndarray = None):
+        """
+        Ajoute une entrée puis évince les plus anciennes au-delà de memoire_max (entrée trop grande
+        ignorée) ; taille est celle de la valeur sans le tableau partagé, compté à part
+        """
+        if taille + (partage.nbytes if partage is not None else 0) > self.memoire_max:
+            return
+        if cle in self.entrees:
+            self._retirer(cle)
+        self.entrees[cle] = (valeur, taille, partage)
+        self.memoire += taille
+        if partage is not None:
+            garde = self.partages.setdefault(id(partage), [partage, 0])
+            if garde[1] == 0:
+                self.memoire += partage.nbytes
+            garde[1] += 1
+        while self.memoire > self.memoire_max:
+            self._retirer(next(iter(self.entrees)))
+            self.evictions += 1
+
+    def _retirer(self, cle):
+        _, taille, partage = self.entrees.pop(cle)
+        self.memoire -= taille
+        if partage is not None:
+            garde = self.partages[id(partage)]
+            garde[1] -= 1
+            if garde[1] == 0:
+                del self.partages[id(partage)]
+                self.memoire -= partage.nbytes
+
+    def vider(self):
+        self.entrees.clear()
+        self.partages.clear()
+        self.memoire = 0
+
+    def statistiques(self) -> dict:
+        nb_requetes = self.succes + self.echecs
+        return {
+            'entrees': len(self.entrees),
+            'memoire': self.memoire,
+            'memoire_max': self.memoire_max,
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'evictions': self.evictions,
+            'taux_succes': self.succes / nb_requetes if nb_requetes else 0.0
+        }
+
+
+# Taille comptée pour un résultat de recherche de déboisement dans le cache (un petit dictionnaire)
+TAILLE_RESULTAT_DEBOISEMENT = 1024
+
+COMPTEURS_INSTRUMENTATION = ('cases_visitees', 'pic_file', 'copies_carte', 'candidats_evalues')
+
+
+class Instrumentation:
+    """
+    Mesures d'exécution d'un simulateur : durée cumulée et nombre d'appels de chaque phase, et
+    compteurs des chemins critiques (cases visitées par la propagation, plus longue file de
+    parcours, copies de la carte, candidats au déboisement évalués)
+
+    rappel, s'il est défini, reçoit (evenement, donnees) à la fin de chaque phase ('phase',
+    {'phase', 'duree'}) et à chaque résultat ('incendie' ou 'deboisement', le dictionnaire
+    retourné). Chaque fin de phase est aussi journalisée au niveau DEBUG, avec les champs phase
+    et duree en attributs de l'enregistrement.
+    """
+
+    def __init__(self, rappel: Callable[[str, dict], None] = None):
+        self.rappel = rappel
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        """Remet les durées et les compteurs à zéro (le rappel est conservé)"""
+        self.temps = {}
+        self.appels = {}
+        self.compteurs = dict.fromkeys(COMPTEURS_INSTRUMENTATION, 0)
+
+    def compter(self, nom: str, valeur: int = 1):
+        self.compteurs[nom] += valeur
+
+    def maximum(self, nom: str, valeur: int):
+        """Compteur de pic : garde la plus grande valeur observée"""
+        if valeur > self.compteurs[nom]:
+            self.compteurs[nom] = valeur
+
+    def signaler(self, evenement: str, donnees: dict):
+        if self.rappel is not None:
+            self.rappel(evenement, donnees)
+
+    @contextmanager
+    def phase(self, nom: str):
+        """Chronomètre le bloc sous le nom de phase donné ; les phases imbriquées sont comptées chacune"""
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            duree = time.perf_counter() - debut
+            self.temps[nom] = self.temps.get(nom, 0.0) + duree
+            self.appels[nom] = self.appels.get(nom, 0) + 1
+            logger.debug("Phase %s: %.6f s", nom, duree, extra={'phase': nom, 'duree': duree})
+            self.signaler('phase', {'phase': nom, 'duree': duree})
+
+    def resume(self) -> dict:
+        """Copie des mesures courantes : {'temps', 'appels', 'compteurs'}"""
+        return {'temps': dict(self.temps), 'appels': dict(self.appels), 'compteurs': dict(self.compteurs)}
+
+
 class ForestFireSimulator:
     """
     Simulateur de feux de forêts avec génération de carte aléatoire et export HTML
     """
 
-    def __init__(self, largeur: int = 50, hauteur: int = 50):
+    def __init__(self, largeur: int = 50, hauteur: int = 50, graine: int = None):
         self.largeur = largeur
         self.hauteur = hauteur
-        self.carte = np.zeros((hauteur, largeur), dtype=int)
         self.carte_incendie = None
         self.donnees_simulation = {}  # Stockage des données pour l'export HTML
-
-    def generer_carte_aleatoire(self, pourcentage_arbres: float = 60.0, pourcentage_eau: float = 10.0):
-        """Génère une carte aléatoire avec des arbres et des plans d'eau"""
+        self.graine = graine
+        self.rng = np.random.default_rng(graine)  # Générateur propre à l'instance, reproductible avec la graine
+        self._index_voisins = None  # Index de voisinage, reconstruit quand les dimensions changent
+        self._index_composantes = None  # Index des composantes d'arbres, construit à la première requête
+        self._empreinte = None  # Empreinte de la carte, calculée à la demande puis tenue à jour par modifier_case
+        self._comptes = None  # Nombre de cases par valeur, calculé à la demande puis tenu à jour par modifier_case
+        self._derivees = {}  # nom -> (version, valeur) : valeurs calculées une fois par version de la carte
+        self._dernier_numero = 0
+        self.version = 0  # Identifie le contenu de la carte : change à chaque modification
+        self._nb_remplacements = 0  # Remplacements et écritures en bloc de la carte (carte_modifiee)
+        self.carte = np.zeros((hauteur, largeur), dtype=np.uint8)  # Valeurs de TerrainType, un octet par case
+        self.cache = None  # Cache des résultats de simulation (activer_cache)
+        self.nb_processus = None  # Processus du moteur 'parallele' (None : un par cœur)
+        self.affichage_console = True  # False pour ne plus dessiner les cartes en console (traitements par lots)
+        self.instrumentation = Instrumentation()  # Durées des phases, compteurs et rappel optionnel
+
+    def _terrain_genere(self, pourcentage_arbres: float, pourcentage_eau: float) -> Tuple[np.ndarray, int, int]:
+        """Retourne le vecteur plat (non mélangé) des terrains aux pourcentages demandés et les comptes"""
         if pourcentage_arbres + pourcentage_eau > 100:
             raise ValueError("La somme des pourcentages ne peut pas dépasser 100%")
 
@@ -36,18 +1305,19 @@ class ForestFireSimulator:
         nb_arbres = int(total_cases * pourcentage_arbres / 100)
         nb_eau = int(total_cases * pourcentage_eau / 100)
 
-        positions = [(i, j) for i in range(self.hauteur) for j in range(self.largeur)]
-        random.shuffle(positions)
+        terrain = np.full(total_cases, TerrainType.TERRAIN_NU.value, dtype=np.uint8)
+        terrain[:nb_arbres] = TerrainType.ARBRE.value
+        terrain[nb_arbres:nb_arbres + nb_eau] = TerrainType.EAU.value
+        return terrain, nb_arbres, nb_eau
 
-        self.carte.fill(TerrainType.TERRAIN_NU.value)
-
-        for k in range(nb_arbres):
-            i, j = positions[k]
-            self.carte[i, j] = TerrainType.ARBRE.value
+    def generer_carte_aleatoire(self, pourcentage_arbres: float = 60.0, pourcentage_eau: float = 10.0):
+        """Génère une carte aléatoire avec des arbres et des plans d'eau"""
+        with self.instrumentation.phase('generation'):
+            terrain, nb_arbres, nb_eau = self._terrain_genere(pourcentage_arbres, pourcentage_eau)
+            total_cases = terrain.size
 
-        for k in range(nb_arbres, nb_arbres + nb_eau):
-            i, j = positions[k]
-            self.carte[i, j] = TerrainType.EAU.value
+            with self.modification_carte() as carte:
+                carte[...] = self.rng.permutation(terrain).reshape(self.hauteur, self.largeur)
 
         # Stocker les informations de génération
         self.donnees_simulation['generation'] = {
@@ -56,44 +1326,231 @@ class ForestFireSimulator:
             'nb_eau': nb_eau,
             'pourcentage_eau': pourcentage_eau,
             'terrain_nu': total_cases - nb_arbres - nb_eau,
-            'total_cases': total_cases
+            'total_cases': total_cases,
+            'graine': self.graine
         }
 
-        print(f"Carte générée: {nb_arbres} arbres ({pourcentage_arbres}%), "
-              f"{nb_eau} plans d'eau ({pourcentage_eau}%), "
-              f"{total_cases - nb_arbres - nb_eau} terrain nu")
+        logger.info("Carte générée: %d arbres (%s%%), %d plans d'eau (%s%%), %d terrain nu",
+                    nb_arbres, pourcentage_arbres, nb_eau, pourcentage_eau, total_cases - nb_arbres - nb_eau)
+
+    def generer_cartes_aleatoires(self, nb_cartes: int, pourcentage_arbres: float = 60.0,
+                                  pourcentage_eau: float = 10.0) -> np.ndarray:
+        """
+        Génère nb_cartes cartes indépendantes en un seul appel, sous forme d'un tableau
+        (nb_cartes, hauteur, largeur) ; chaque carte a exactement les comptes de generer_carte_aleatoire
+        """
+        terrain, _, _ = self._terrain_genere(pourcentage_arbres, pourcentage_eau)
+        cartes = np.tile(terrain, (nb_cartes, 1))
+        self.rng.permuted(cartes, axis=1, out=cartes)
+        return cartes.reshape(nb_cartes, self.hauteur, self.largeur)
+
+    def _choisir_arbre_aleatoire(self):
+        """Retourne la position d'un arbre tiré uniformément avec le générateur de l'instance, ou None"""
+        indices_arbres = self._indices_arbres()
+        if indices_arbres.size == 0:
+            return None
+        return divmod(int(indices_arbres[self.rng.integers(indices_arbres.size)]), self.largeur)
+
+    def _index_voisinage(self) -> IndexVoisinage:
+        """Retourne l'index de voisinage de la carte, reconstruit seulement si ses dimensions ont changé"""
+        if self._index_voisins is None or self._index_voisins.forme != (self.hauteur, self.largeur):
+            self._index_voisins = IndexVoisinage(self.hauteur, self.largeur)
+        return self._index_voisins
+
+    def index_composantes(self) -> IndexComposantes:
+        """
+        Retourne l'index des composantes d'arbres, construit une seule fois puis tenu à jour par
+        modifier_case ; une nouvelle carte (génération, chargement, modification_carte) le fait
+        reconstruire.
+        """
+        if self._index_composantes is None or self._index_composantes.index.forme != self.carte.shape:
+            self._index_composantes = IndexComposantes(self.carte, self._index_voisinage())
+        return self._index_composantes
+
+    def invalider_index_composantes(self):
+        """Oublie l'index des composantes (carte modifiée sans passer par modifier_case)"""
+        self._index_composantes = None
+
+    def _nouvelle_version(self):
+        self._dernier_numero += 1
+        self.version = self._dernier_numero
+
+    @property
+    def carte(self) -> np.ndarray:
+        """
+        Carte du terrain, en lecture seule : une écriture directe lèverait une erreur au lieu de
+        laisser périmés l'index, l'empreinte, les comptes et le cache. Les écritures passent par
+        modifier_case (une case) ou modification_carte (en bloc) ; affecter un tableau remplace la carte.
+        """
+        return self._carte_lecture
+
+    @carte.setter
+    def carte(self, valeur: np.ndarray):
+        self._carte = valeur
+        self._carte_lecture = valeur.view()
+        self._carte_lecture.flags.writeable = False
+        self.hauteur, self.largeur = valeur.shape
+        self.carte_modifiee()
+
+    @contextmanager
+    def modification_carte(self):
+        """
+        Donne la carte modifiable le temps d'un bloc with, pour des écritures en bloc ; à la sortie
+        du bloc, même sur exception, tout ce qui est dérivé de la carte est oublié (carte_modifiee)
+        """
+        try:
+            yield self._carte
+        finally:
+            self.carte_modifiee()
+
+    def carte_modifiee(self):
+        """
+        Change de version et oublie tout ce qui est dérivé de la carte (index des composantes,
+        empreinte, comptes, valeurs dérivées) ; appelé à chaque remplacement de la carte et à la
+        fin de modification_carte
+        """
+        self._nb_remplacements += 1
+        self._nouvelle_version()
+        self.invalider_index_composantes()
+        self._empreinte = None
+        self._comptes = None
+        self._derivees.clear()
+
+    def _valeur_derivee(self, nom: str, calcul: Callable[[], Any]):
+        """Valeur dérivée de la carte, recalculée seulement quand la version a changé depuis le dernier calcul"""
+        version, valeur = self._derivees.get(nom, (None, None))
+        if version != self.version:
+            valeur = calcul()
+            self._derivees[nom] = (self.version, valeur)
+        return valeur
+
+    def comptes_terrain(self) -> np.ndarray:
+        """Nombre de cases de chaque valeur (tableau indexé par la valeur), tenu à jour en O(1) par modifier_case"""
+        if self._comptes is None:
+            self._comptes = np.bincount(self.carte.ravel(), minlength=256)
+        return self._comptes
+
+    def _indices_arbres(self) -> np.ndarray:
+        """Indices plats (carte sans bordure) des arbres, dans l'ordre des lignes"""
+        return self._valeur_derivee('indices_arbres', lambda: np.flatnonzero(self.carte == TerrainType.ARBRE.value))
+
+    def positions_arbres(self) -> np.ndarray:
+        """Positions (ligne, colonne) des arbres, tableau (nb_arbres, 2) dans l'ordre des lignes"""
+        return self._valeur_derivee('positions_arbres', lambda: np.column_stack(
+            np.divmod(self._indices_arbres(), self.largeur)))
+
+    def _copie_carte(self) -> np.ndarray:
+        """
+        Copie en lecture seule de la carte, faite une fois par version : les cartes brûlées d'une
+        même carte, dans le cache ou non, partagent cette base
+        """
+        def copier():
+            self.instrumentation.compter('copies_carte')
+            copie = self.carte.copy()
+            copie.flags.writeable = False
+            return copie
+        return self._valeur_derivee('copie_carte', copier)
+
+    def empreinte_carte(self) -> int:
+        """Empreinte 64 bits de la carte : calculée en une passe, puis mise à jour case par case par modifier_case"""
+        if self._empreinte is None:
+            self._empreinte = _empreinte_carte(self.carte)
+        return self._empreinte
+
+    def activer_cache(self, memoire_max: int = 64 * 2 ** 20) -> CacheResultats:
+        """
+        Mémorise les résultats de simuler_incendie et de trouver_meilleure_case_a_deboiser par
+        (empreinte de la carte, départ, options), dans un cache LRU de memoire_max octets au plus
+        """
+        self.cache = CacheResultats(memoire_max)
+        return self.cache
+
+    def arbres_brules_depuis(self, ligne: int, colonne: int) -> int:
+        """Nombre d'arbres brûlés par un incendie démarrant sur la case (0 hors arbres), lu dans l'index"""
+        return self.index_composantes().taille_composante(ligne, colonne)
+
+    def modifier_case(self, ligne: int, colonne: int, valeur: int):
+        """
+        Change la valeur d'une case de la carte et de version ; l'index des composantes, l'empreinte
+        et les comptes sont mis à jour sur place, les autres valeurs dérivées seront recalculées
+        """
+        ancienne = int(self.carte[ligne, colonne])
+        valeur = int(valeur)
+        if valeur == ancienne:
+            return
+        self._carte[ligne, colonne] = valeur
+        self._nouvelle_version()
+        if self._comptes is not None:
+            self._comptes[ancienne] -= 1
+            self._comptes[valeur] += 1
+        if self._index_composantes is not None:
+            self._index_composantes.modifier(ligne, colonne, ancienne, int(valeur))
+        if self._empreinte is not None:
+            case = np.array([ligne * self.largeur + colonne])
+            self._empreinte = (self._empreinte - _empreinte_cases(case, np.array([ancienne]))
+                               + _empreinte_cases(case, np.array([valeur]))) & 0xFFFFFFFFFFFFFFFF
+
+    @contextmanager
+    def modification_temporaire(self, modifications: Dict[Tuple[int, int], int]):
+        """
+        Applique les modifications {(ligne, colonne): valeur} le temps d'un bloc with, puis rétablit
+        les valeurs d'origine, même si le bloc lève une exception. Si la carte n'a pas été modifiée
+        par ailleurs pendant le bloc, sa version d'avant et les valeurs dérivées calculées pour
+        elle sont rétablies aussi : rien n'est à recalculer après coup. Si la carte a été remplacée
+        pendant le bloc (affectation, generer_carte_aleatoire, modification_carte), les anciennes
+        valeurs ne sont pas écrites dans la nouvelle carte : ValueError est levée.
+        """
+        version, derivees = self.version, dict(self._derivees)
+        originales = {position: int(self.carte[position]) for position in modifications}
+        for (ligne, colonne), valeur in modifications.items():
+            self.modifier_case(ligne, colonne, valeur)
+        version_modifiee, remplacements = self.version, self._nb_remplacements
+        try:
+            yield
+        finally:
+            if self._nb_remplacements != remplacements:
+                raise ValueError("Carte remplacée pendant modification_temporaire: valeurs d'origine non rétablies")
+            intacte = self.version == version_modifiee
+            for (ligne, colonne), valeur in originales.items():
+                self.modifier_case(ligne, colonne, valeur)
+            if intacte:
+                self.version = version
+                self._derivees = derivees
+
+    def planter(self, ligne: int, colonne: int):
+        self.modifier_case(ligne, colonne, TerrainType.ARBRE.value)
+
+    def deboiser(self, ligne: int, colonne: int):
+        self.modifier_case(ligne, colonne, TerrainType.TERRAIN_NU.value)
+
+    def mettre_eau(self, ligne: int, colonne: int):
+        self.modifier_case(ligne, colonne, TerrainType.EAU.value)
 
     def obtenir_voisins(self, ligne: int, colonne: int) -> list:
         """
         Retourne les coordonnées des 8 voisins (y compris diagonales) d'une case
         """
-        voisins = []
-        for di in [-1, 0, 1]:
-            for dj in [-1, 0, 1]:
-                if di == 0 and dj == 0:
-                    continue
-                ni, nj = ligne + di, colonne + dj
-                if 0 <= ni < self.hauteur and 0 <= nj < self.largeur:
-                    voisins.append((ni, nj))
-        return voisins
+        return self._index_voisinage().voisins(ligne, colonne)
 
-    def simuler_incendie(self, ligne_depart: int = None, colonne_depart: int = None) -> dict:
+    def simuler_incendie(self, ligne_depart: int = None, colonne_depart: int = None, moteur: str = 'bfs') -> dict:
         """
         Simule un incendie en partant d'une position donnée ou d'une position aléatoire avec un arbre
+
+        Le moteur 'bfs' propage le feu case par case, le moteur 'vectorise' étiquette les
+        composantes 8-connexes d'arbres en une passe sur tableaux, le moteur 'parallele' fait cet
+        étiquetage par bandes sur nb_processus processus ; les résultats sont identiques.
         """
+        if moteur not in MOTEURS_PROPAGATION:
+            raise ValueError(f"Moteur de propagation inconnu: {moteur} (attendu: {', '.join(MOTEURS_PROPAGATION)})")
 
         if (ligne_depart is None or colonne_depart is None or
                 not (0 <= ligne_depart < self.hauteur and 0 <= colonne_depart < self.largeur) or
                 self.carte[ligne_depart, colonne_depart] != TerrainType.ARBRE.value):
 
-            positions_arbres = []
-            for i in range(self.hauteur):
-                for j in range(self.largeur):
-                    if self.carte[i, j] == TerrainType.ARBRE.value:
-                        positions_arbres.append((i, j))
+            position_arbre = self._choisir_arbre_aleatoire()
 
-            if not positions_arbres:
-                print("Erreur: Aucun arbre trouvé sur la carte!")
+            if position_arbre is None:
+                logger.error("Erreur: Aucun arbre trouvé sur la carte!")
                 return {
                     'arbres_brules': 0,
                     'arbres_originaux': 0,
@@ -101,32 +1558,46 @@ class ForestFireSimulator:
                     'position_depart': None
                 }
 
-            ligne_depart, colonne_depart = random.choice(positions_arbres)
-            print(f"Position automatique choisie: ({ligne_depart}, {colonne_depart}) - arbre trouvé!")
-
-        self.carte_incendie = self.carte.copy()
-
-        print(f"🔥 Démarrage de l'incendie à la position ({ligne_depart}, {colonne_depart})")
-
-        # Utiliser BFS (Breadth-First Search) pour simuler la propagation
-        queue = deque([(ligne_depart, colonne_depart)])
-        cases_brulees = set()
-        cases_brulees.add((ligne_depart, colonne_depart))
-
-        self.carte_incendie[ligne_depart, colonne_depart] = TerrainType.BRULE.value
+            ligne_depart, colonne_depart = position_arbre
+            logger.info("Position automatique choisie: (%d, %d) - arbre trouvé!", ligne_depart, colonne_depart)
+
+        logger.info("🔥 Démarrage de l'incendie à la position (%d, %d)", ligne_depart, colonne_depart)
+
+        # Les moteurs donnent tous le même résultat : il n'entre pas dans la clé du cache
+        cle = None
+        resultat = None
+        if self.cache is not None:
+            cle = ('incendie', self.empreinte_carte(), self.carte.shape, ligne_depart, colonne_depart)
+            resultat = self.cache.lire(cle)
+        if resultat is None:
+            resultat = self._calculer_incendie(ligne_depart, colonne_depart, moteur)
+            if cle is not None:
+                self.cache.ecrire(cle, resultat, resultat[0].nbytes, partage=resultat[0].base)
+
+        # L'entrée du cache ne garde que le stockage compact : la carte complète reconstruite à la
+        # lecture de carte_incendie reste propre à ce résultat et n'échappe pas à memoire_max
+        self.carte_incendie = resultat[0].partager() if cle is not None else resultat[0]
+        stats = dict(resultat[1])
+
+        logger.info("Incendie simulé: %d/%d arbres brûlés (%.1f%%)",
+                    stats['arbres_brules'], stats['arbres_originaux'], stats['pourcentage_brule'])
+        self.instrumentation.signaler('incendie', stats)
+        return stats
 
-        while queue:
-            ligne_actuelle, colonne_actuelle = queue.popleft()
+    def _calculer_incendie(self, ligne_depart: int, colonne_depart: int, moteur: str) -> Tuple[CarteBrulee, dict]:
+        """Propage l'incendie avec le moteur demandé ; retourne la carte brûlée et les statistiques"""
+        with self.instrumentation.phase('propagation'):
+            if moteur == 'vectorise':
+                cases_brulees = self._propager_vectorise(ligne_depart, colonne_depart)
+            elif moteur == 'parallele':
+                cases_brulees = self._propager_parallele(ligne_depart, colonne_depart)
+            else:
+                cases_brulees = self._propager_bfs(ligne_depart, colonne_depart)
 
-            for ni, nj in self.obtenir_voisins(ligne_actuelle, colonne_actuelle):
-                if (self.carte_incendie[ni, nj] == TerrainType.ARBRE.value and
-                        (ni, nj) not in cases_brulees):
-                    self.carte_incendie[ni, nj] = TerrainType.BRULE.value
-                    cases_brulees.add((ni, nj))
-                    queue.append((ni, nj))
+        carte_brulee = CarteBrulee(self._copie_carte(), cases_brulees)
+        nb_arbres_brules = carte_brulee.nb_brulees
 
-        nb_arbres_brules = len(cases_brulees)
-        nb_arbres_originaux = np.sum(self.carte == TerrainType.ARBRE.value)
+        nb_arbres_originaux = self.comptes_terrain()[TerrainType.ARBRE.value]
         pourcentage_brule = (nb_arbres_brules / nb_arbres_originaux * 100) if nb_arbres_originaux > 0 else 0
 
         stats = {
@@ -135,50 +1606,497 @@ class ForestFireSimulator:
             'pourcentage_brule': pourcentage_brule,
             'position_depart': (ligne_depart, colonne_depart)
         }
+        return carte_brulee, stats
+
+    def _propager_bfs(self, ligne_depart: int, colonne_depart: int) -> np.ndarray:
+        """Propage le feu par parcours en largeur et retourne le masque des cases brûlées"""
+        index = self._index_voisinage()
+        arbres = bytearray(index.masque_pade(self.carte == TerrainType.ARBRE.value))
+        cases_brulees = self._parcourir_instrumente(arbres, index.vers_plat(ligne_depart, colonne_depart),
+                                                    index.liste_decalages)
+
+        masque = np.zeros(self.carte.shape, dtype=bool)
+        masque[index.depuis_plat(np.array(cases_brulees, dtype=np.int64))] = True
+        return masque
+
+    def _parcourir_instrumente(self, dans_composante: bytearray, racine: int, decalages: List[int]) -> List[int]:
+        """_parcourir_composante, en comptant les cases visitées et le pic de la file du parcours"""
+        atteintes, pic_file = _parcourir_composante(dans_composante, racine, decalages)
+        self.instrumentation.compter('cases_visitees', len(atteintes))
+        self.instrumentation.maximum('pic_file', pic_file)
+        return atteintes
+
+    def _propager_parallele(self, ligne_depart: int, colonne_depart: int) -> np.ndarray:
+        """Retourne le masque de la composante du départ, étiquetée par bandes sur nb_processus processus"""
+        etiquettes = _etiqueter_en_parallele(self.carte, self.nb_processus or os.cpu_count() or 1)
+        self.instrumentation.compter('cases_visitees', self.carte.size)
+        return etiquettes == etiquettes[ligne_depart, colonne_depart]
+
+    def _propager_vectorise(self, ligne_depart: int, colonne_depart: int) -> np.ndarray:
+        """Retourne le masque de la composante d'arbres contenant le départ"""
+        index = self._index_voisinage()
+        etiquettes = index.retirer_bordure(_etiqueter_composantes(
+            index.masque_pade(self.carte == TerrainType.ARBRE.value), index.decalages_avant))
+        self.instrumentation.compter('cases_visitees', self.carte.size)
+        return etiquettes == etiquettes[ligne_depart, colonne_depart]
+
+    @property
+    def carte_incendie(self):
+        """Carte après le dernier incendie, reconstruite à la demande depuis son stockage compact"""
+        if isinstance(self._carte_incendie, CarteBrulee):
+            # en_tableau ne copie la carte qu'au premier appel
+            if self._carte_incendie._tableau is None:
+                self.instrumentation.compter('copies_carte')
+            return self._carte_incendie.en_tableau()
+        return self._carte_incendie
+
+    @carte_incendie.setter
+    def carte_incendie(self, valeur):
+        self._carte_incendie = valeur
+
+    def simuler_incendie_par_tuiles(self, ligne_depart: int, colonne_depart: int, sortie=None,
+                                    taille_tuile: int = 1024) -> dict:
+        """
+        Simule l'incendie tuile par tuile, pour une carte projetée en mémoire (ouvrir_carte avec
+        mmap_mode) trop grande pour être copiée en RAM ; les comptes sont ceux de simuler_incendie
+
+        Première passe : chaque tuile est lue et ses composantes d'arbres étiquetées, seules les
+        étiquettes des rangées de bord sont gardées, puis un union-find sur les cases voisines de
+        part et d'autre des coutures recolle les composantes d'une tuile à l'autre. Seconde passe :
+        chaque tuile est recopiée dans sortie, et celles qu'atteint l'incendie sont réétiquetées
+        pour y marquer les arbres brûlés. sortie est le chemin d'un .npy créé en projection mémoire,
+        un tableau (hauteur, largeur) existant, ou None pour un tableau en mémoire.
+        """
+        if taille_tuile <= 0:
+            raise ValueError("La taille de tuile doit être strictement positive")
+        if not (0 <= ligne_depart < self.hauteur and 0 <= colonne_depart < self.largeur) or \
+                self.carte[ligne_depart, colonne_depart] != TerrainType.ARBRE.value:
+            raise ValueError(f"Pas d'arbre à la position de départ ({ligne_depart}, {colonne_depart})")
+
+        logger.info("🔥 Démarrage de l'incendie à la position (%d, %d)", ligne_depart, colonne_depart)
+        with self.instrumentation.phase('propagation'):
+            stats = self._propager_par_tuiles(ligne_depart, colonne_depart, sortie, taille_tuile)
+
+        logger.info("Incendie simulé: %d/%d arbres brûlés (%.1f%%)",
+                    stats['arbres_brules'], stats['arbres_originaux'], stats['pourcentage_brule'])
+        self.instrumentation.signaler('incendie', stats)
+        return stats
 
-        print(f"Incendie simulé: {nb_arbres_brules}/{nb_arbres_originaux} arbres brûlés ({pourcentage_brule:.1f}%)")
+    def _propager_par_tuiles(self, ligne_depart: int, colonne_depart: int, sortie, taille_tuile: int) -> dict:
+        """Les trois passes de simuler_incendie_par_tuiles ; retourne ses statistiques"""
+        # 1. Étiquetage par tuile : les étiquettes globales d'une tuile vont de debut à debut + n
+        tuiles = {}
+        nb_etiquettes = 0
+        nb_arbres_originaux = 0
+        sources, cibles = [], []
+        etiquette_depart = None
+        bas_precedent = None
+        for ligne in range(0, self.hauteur, taille_tuile):
+            haut = np.full(self.largeur, -1, dtype=np.int64)
+            bas = np.full(self.largeur, -1, dtype=np.int64)
+            droite_precedente = None
+            for colonne in range(0, self.largeur, taille_tuile):
+                tuile = np.asarray(self.carte[ligne:ligne + taille_tuile, colonne:colonne + taille_tuile])
+                etiquettes, n = _etiqueter_tuile(tuile)
+                self.instrumentation.compter('cases_visitees', tuile.size)
+                arbres = etiquettes >= 0
+                etiquettes[arbres] += nb_etiquettes
+                nb_arbres_originaux += int(np.count_nonzero(arbres))
+                tuiles[ligne, colonne] = (nb_etiquettes, n)
+                nb_etiquettes += n
+
+                haut[colonne:colonne + tuile.shape[1]] = etiquettes[0]
+                bas[colonne:colonne + tuile.shape[1]] = etiquettes[-1]
+                if droite_precedente is not None:
+                    a, b = _aretes_couture(droite_precedente, etiquettes[:, 0])
+                    sources.append(a)
+                    cibles.append(b)
+                droite_precedente = etiquettes[:, -1]
+                if (ligne <= ligne_depart < ligne + tuile.shape[0] and
+                        colonne <= colonne_depart < colonne + tuile.shape[1]):
+                    etiquette_depart = int(etiquettes[ligne_depart - ligne, colonne_depart - colonne])
+
+            if bas_precedent is not None:
+                a, b = _aretes_couture(bas_precedent, haut)
+                sources.append(a)
+                cibles.append(b)
+            bas_precedent = bas
+
+        # 2. Recollage : union-find sur les seules étiquettes qui touchent une couture
+        a = np.concatenate(sources) if sources else np.empty(0, dtype=np.int64)
+        b = np.concatenate(cibles) if cibles else np.empty(0, dtype=np.int64)
+        bordures, compactes = np.unique(np.concatenate([a, b]), return_inverse=True)
+        parent = _unir_aretes(bordures.size, compactes[:a.size], compactes[a.size:])
+        k = np.searchsorted(bordures, etiquette_depart)
+        if k < bordures.size and bordures[k] == etiquette_depart:
+            etiquettes_brulees = bordures[parent == parent[k]]
+        else:
+            etiquettes_brulees = np.array([etiquette_depart], dtype=np.int64)
+
+        # 3. Écriture de la carte après incendie, tuile par tuile
+        forme = (self.hauteur, self.largeur)
+        if isinstance(sortie, str):
+            sortie = np.lib.format.open_memmap(sortie, mode='w+', dtype=np.uint8, shape=forme)
+        elif sortie is None:
+            sortie = np.empty(forme, dtype=np.uint8)
+        elif sortie.shape != forme:
+            raise ValueError(f"La sortie doit avoir les dimensions de la carte {forme}")
+
+        nb_arbres_brules = 0
+        for (ligne, colonne), (debut, n) in tuiles.items():
+            tuile = np.array(self.carte[ligne:ligne + taille_tuile, colonne:colonne + taille_tuile])
+            premiere, derniere = np.searchsorted(etiquettes_brulees, [debut, debut + n])
+            if premiere < derniere:
+                etiquettes, _ = _etiqueter_tuile(tuile)
+                self.instrumentation.compter('cases_visitees', tuile.size)
+                brulees = np.isin(etiquettes, etiquettes_brulees[premiere:derniere] - debut)
+                tuile[brulees] = TerrainType.BRULE.value
+                nb_arbres_brules += int(np.count_nonzero(brulees))
+            sortie[ligne:ligne + tuile.shape[0], colonne:colonne + tuile.shape[1]] = tuile
+        if isinstance(sortie, np.memmap):
+            sortie.flush()
+
+        self.carte_incendie = sortie
+        pourcentage_brule = (nb_arbres_brules / nb_arbres_originaux * 100) if nb_arbres_originaux > 0 else 0
+        stats = {
+            'arbres_brules': nb_arbres_brules,
+            'arbres_originaux': nb_arbres_originaux,
+            'pourcentage_brule': pourcentage_brule,
+            'position_depart': (ligne_depart, colonne_depart),
+            'nb_tuiles': len(tuiles)
+        }
         return stats
 
-    def afficher_carte(self, utiliser_symboles: bool = True, afficher_incendie: bool = False):
-        """
-        Affiche la carte dans la console
+    def _masque_incendie(self) -> np.ndarray:
+        """Masque des cases brûlées par le dernier incendie, sans reconstruire la carte complète"""
+        if isinstance(self._carte_incendie, CarteBrulee):
+            return self._carte_incendie.masque()
+        return (self._carte_incendie == TerrainType.BRULE.value) & (self.carte == TerrainType.ARBRE.value)
+
+    def propager_par_etapes(self, ligne_depart: int, colonne_depart: int):
         """
-        carte_a_afficher = self.carte_incendie if afficher_incendie and self.carte_incendie is not None else self.carte
+        Générateur de la propagation pas à pas, à consommer paresseusement
 
-        if utiliser_symboles:
-            symboles_affichage = {
-                TerrainType.TERRAIN_NU.value: '.',
-                TerrainType.ARBRE.value: '🌲',
-                TerrainType.EAU.value: '💧',
-                TerrainType.FEU.value: '🔥',
-                TerrainType.BRULE.value: '🔥'
+        Chaque étape produit un dict {'etape', 'front', 'nouvelles_brulees'} : front contient les
+        positions (n, 2) en feu (FEU) à cette étape, nouvelles_brulees celles qui viennent de finir
+        de brûler (BRULE). Seul le front courant est gardé ; carte_incendie suit l'état de l'incendie
+        au fil des étapes. La dernière étape a un front vide.
+        """
+        if self.carte[ligne_depart, colonne_depart] != TerrainType.ARBRE.value:
+            raise ValueError(f"Pas d'arbre à la position de départ ({ligne_depart}, {colonne_depart})")
+
+        index = self._index_voisinage()
+        # Carte de travail bordée de terrain nu : carte_incendie en est une vue sans la bordure
+        etat = np.zeros((self.hauteur + 2, self.largeur + 2), dtype=self.carte.dtype)
+        etat[1:-1, 1:-1] = self.carte
+        etat_plat = etat.ravel()
+        self.carte_incendie = etat[1:-1, 1:-1]
+
+        front = np.array([index.vers_plat(ligne_depart, colonne_depart)], dtype=np.int64)
+        etat_plat[front] = TerrainType.FEU.value
+        nouvelles_brulees = np.empty(0, dtype=np.int64)
+        etape = 0
+
+        while True:
+            yield {
+                'etape': etape,
+                'front': np.column_stack(index.depuis_plat(front)),
+                'nouvelles_brulees': np.column_stack(index.depuis_plat(nouvelles_brulees))
             }
+            if front.size == 0:
+                return
+
+            voisins = np.unique((front[:, None] + index.decalages[None, :]).ravel())
+            voisins = voisins[etat_plat[voisins] == TerrainType.ARBRE.value]
+            etat_plat[front] = TerrainType.BRULE.value
+            etat_plat[voisins] = TerrainType.FEU.value
+            nouvelles_brulees, front = front, voisins
+            etape += 1
+
+    def temps_d_arrivee(self, ligne_depart: int, colonne_depart: int, vent: Tuple[float, float, float] = (0.0, 0.0, 0.0),
+                        combustible: np.ndarray = None) -> dict:
+        """
+        Calcule l'instant d'embrasement de chaque arbre atteignable (expansion de Dijkstra)
+
+        Passer à un voisin coûte 1 (orthogonal) ou √2 (diagonale), multiplié par exp(-force × cos θ)
+        où θ est l'angle entre le déplacement et le vent (dx vers les colonnes croissantes, dy vers
+        les lignes croissantes) : le feu va plus vite sous le vent. Un raster combustible optionnel
+        (> 0 sur les arbres) divise le temps de traversée de chaque case.
+        """
+        if self.carte[ligne_depart, colonne_depart] != TerrainType.ARBRE.value:
+            raise ValueError(f"Pas d'arbre à la position de départ ({ligne_depart}, {colonne_depart})")
+
+        dx, dy, force = vent
+        norme_vent = (dx * dx + dy * dy) ** 0.5
+        couts = []
+        for di, dj in IndexVoisinage.DIRECTIONS:
+            distance = (di * di + dj * dj) ** 0.5
+            alignement = (dj * dx + di * dy) / (distance * norme_vent) if norme_vent > 0 else 0.0
+            couts.append(distance * float(np.exp(-force * alignement)))
+
+        index = self._index_voisinage()
+        arbres = self.carte == TerrainType.ARBRE.value
+        if combustible is not None:
+            if combustible.shape != self.carte.shape:
+                raise ValueError("Le raster de combustible doit avoir les dimensions de la carte")
+            if np.any(combustible[arbres] <= 0):
+                raise ValueError("Le combustible doit être strictement positif sur les arbres")
+            lenteur = np.ones((self.hauteur + 2) * (self.largeur + 2), dtype=np.float64)
+            lenteur[index.masque_pade(arbres)] = 1.0 / combustible[arbres]
+            lenteur = lenteur.tolist()
         else:
-            symboles_affichage = {
-                TerrainType.TERRAIN_NU.value: '.',
-                TerrainType.ARBRE.value: 'T',
-                TerrainType.EAU.value: 'W',
-                TerrainType.FEU.value: 'F',
-                TerrainType.BRULE.value: 'X'
-            }
+            lenteur = None
+
+        restants = bytearray(index.masque_pade(arbres))
+        decalages = index.liste_decalages
+        temps = {}
+        ordre = []
+        racine = index.vers_plat(ligne_depart, colonne_depart)
+        temps[racine] = 0.0
+        file_priorite = [(0.0, racine)]
+
+        while file_priorite:
+            t, v = heapq.heappop(file_priorite)
+            if not restants[v]:
+                continue
+            restants[v] = 0
+            ordre.append(v)
+            for k in range(8):
+                w = v + decalages[k]
+                if restants[w]:
+                    nouveau = t + (couts[k] if lenteur is None else couts[k] * lenteur[w])
+                    if nouveau < temps.get(w, np.inf):
+                        temps[w] = nouveau
+                        heapq.heappush(file_priorite, (nouveau, w))
+
+        ordre = np.array(ordre, dtype=np.int64)
+        raster = np.full((self.hauteur + 2) * (self.largeur + 2), np.inf, dtype=np.float32)
+        raster[ordre] = [temps[v] for v in ordre.tolist()]
 
-        titre = "CARTE APRÈS INCENDIE" if afficher_incendie else "CARTE DE LA FORÊT"
-        print("\n" + "=" * 50)
-        print(titre)
-        print("=" * 50)
+        return {
+            'temps': index.retirer_bordure(raster).copy(),
+            'ordre': np.column_stack(index.depuis_plat(ordre)),
+            'arbres_atteints': int(ordre.size),
+            'temps_max': float(raster[ordre].max()),
+            'position_depart': (ligne_depart, colonne_depart),
+            'vent': vent
+        }
 
-        for i in range(self.hauteur):
-            ligne = ""
-            for j in range(self.largeur):
-                valeur = carte_a_afficher[i, j]
-                symbole = symboles_affichage.get(valeur, '?')
-                ligne += symbole + " "
-            print(ligne)
+    def simuler_incendie_stochastique(self, ligne_depart: int = None, colonne_depart: int = None,
+                                      probabilite: float = 0.5, nb_repliques: int = 100,
+                                      graine: int = None) -> dict:
+        """
+        Simule nb_repliques incendies stochastiques à la fois
 
-        print("=" * 50)
+        À chaque étape, chaque arbre voisin d'une case en feu s'enflamme avec la probabilité donnée,
+        indépendamment pour chaque voisin en feu. Les répliques sont empilées dans un même tableau
+        (nb_repliques, hauteur, largeur) et avancent ensemble, front par front ; chacune a sa propre
+        graine et reste reproductible seule.
+        """
+        if not 0.0 <= probabilite <= 1.0:
+            raise ValueError("La probabilité de propagation doit être comprise entre 0 et 1")
+        if nb_repliques < 1:
+            raise ValueError("Le nombre de répliques doit être au moins 1")
+
+        if (ligne_depart is None or colonne_depart is None or
+                not (0 <= ligne_depart < self.hauteur and 0 <= colonne_depart < self.largeur) or
+                self.carte[ligne_depart, colonne_depart] != TerrainType.ARBRE.value):
+            position_arbre = self._choisir_arbre_aleatoire()
+            if position_arbre is None:
+                raise ValueError("Aucun arbre trouvé sur la carte")
+            ligne_depart, colonne_depart = position_arbre
+
+        # Graines des répliques : dérivées de la graine donnée, ou du générateur de l'instance
+        sequence = np.random.SeedSequence(graine if graine is not None else self.rng.integers(2 ** 63))
+        graines = sequence.generate_state(nb_repliques, dtype=np.uint64)
+
+        index = self._index_voisinage()
+        arbres = index.masque_pade(self.carte == TerrainType.ARBRE.value)
+        nb_cases = arbres.size
+        # Clé d'une case d'une réplique : réplique * nb_cases + indice dans la grille bordée ;
+        # la bordure garantit que les décalages de voisinage ne passent jamais d'une réplique à l'autre
+        brulees = np.zeros(nb_repliques * nb_cases, dtype=bool)
+        front = np.arange(nb_repliques, dtype=np.int64) * nb_cases + index.vers_plat(ligne_depart, colonne_depart)
+        brulees[front] = True
+
+        # Probabilité d'allumage selon le nombre k de voisins en feu : 1 - (1 - p)^k
+        probabilites_allumage = 1.0 - (1.0 - probabilite) ** np.arange(9)
+
+        etape = 0
+        while front.size:
+            etape += 1
+            voisins = (front[:, None] + index.decalages[None, :]).ravel()
+            voisins = voisins[arbres[voisins % nb_cases] & ~brulees[voisins]]
+            candidats, nb_voisins_en_feu = np.unique(voisins, return_counts=True)
+
+            repliques, cases = np.divmod(candidats, nb_cases)
+            tirages = _tirages_uniformes(graines[repliques], etape, cases)
+            front = candidats[tirages < probabilites_allumage[nb_voisins_en_feu]]
+            brulees[front] = True
+
+        brulees = brulees.reshape(nb_repliques, self.hauteur + 2, self.largeur + 2)[:, 1:-1, 1:-1]
+        arbres_brules = brulees.sum(axis=(1, 2))
+        nb_arbres_originaux = int(np.count_nonzero(arbres))
+        pourcentage_brule = arbres_brules / nb_arbres_originaux * 100
+        niveaux = (5, 25, 50, 75, 95)
+
+        stats = {
+            'arbres_brules': arbres_brules,
+            'arbres_originaux': nb_arbres_originaux,
+            'pourcentage_brule': pourcentage_brule,
+            'moyenne': float(arbres_brules.mean()),
+            'ecart_type': float(arbres_brules.std()),
+            'percentiles': dict(zip(niveaux, np.percentile(arbres_brules, niveaux).tolist())),
+            'probabilite_brulage': brulees.mean(axis=0),
+            'position_depart': (ligne_depart, colonne_depart),
+            'probabilite': probabilite,
+            'nb_repliques': nb_repliques,
+            'graines': graines,
+            'nb_etapes': etape
+        }
+
+        logger.info("Incendie stochastique simulé (%d répliques, p=%s): médiane %.0f/%d arbres brûlés",
+                    nb_repliques, probabilite, stats['percentiles'][50], nb_arbres_originaux)
+        return stats
+
+    def simuler_ensemble(self, nb_cartes: int = None, pourcentage_arbres: float = 60.0, pourcentage_eau: float = 10.0,
+                         cartes: np.ndarray = None, taille_lot: int = 1024) -> dict:
+        """
+        Brûle un ensemble de cartes indépendantes (nb_cartes, hauteur, largeur), générées par
+        generer_cartes_aleatoires ou fournies, avec un départ tiré uniformément parmi les arbres
+        de chaque carte, sans objet ni boucle Python par carte
+
+        Les cartes d'un lot sont bordées puis mises bout à bout dans une seule grille plate : les
+        décalages de voisinage d'une carte restent valables et la bordure sépare les cartes, si
+        bien qu'un seul étiquetage couvre tout le lot. Les cartes sans arbre ont le départ (-1, -1).
+        """
+        if cartes is None:
+            if nb_cartes is None:
+                raise ValueError("Indiquer nb_cartes ou fournir les cartes")
+            cartes = self.generer_cartes_aleatoires(nb_cartes, pourcentage_arbres, pourcentage_eau)
+        elif cartes.ndim != 3 or cartes.shape[1:] != (self.hauteur, self.largeur):
+            raise ValueError(f"Les cartes doivent être de forme (nb_cartes, {self.hauteur}, {self.largeur})")
+
+        nb_cartes = len(cartes)
+        index = self._index_voisinage()
+        nb_cases = (self.hauteur + 2) * (self.largeur + 2)
+        arbres_originaux = np.count_nonzero(cartes == TerrainType.ARBRE.value, axis=(1, 2))
+        arbres_brules = np.zeros(nb_cartes, dtype=np.int64)
+        positions_depart = np.full((nb_cartes, 2), -1, dtype=np.int64)
+
+        for debut in range(0, nb_cartes, taille_lot):
+            lot = cartes[debut:debut + taille_lot]
+            masque = np.zeros((len(lot), self.hauteur + 2, self.largeur + 2), dtype=bool)
+            masque[:, 1:-1, 1:-1] = lot == TerrainType.ARBRE.value
+            masque = masque.reshape(-1)
+
+            # Départ : k-ième arbre de chaque carte, les arbres d'une carte se suivant dans cases
+            cases = np.flatnonzero(masque)
+            arbres_lot = arbres_originaux[debut:debut + len(lot)]
+            avec_arbres = arbres_lot > 0
+            premiers = np.cumsum(arbres_lot) - arbres_lot
+            rangs = premiers[avec_arbres] + self.rng.integers(0, arbres_lot[avec_arbres])
+            departs = cases[rangs]
+
+            # Les étiquettes sont des rangs d'arbres : bincount donne la taille de chaque composante
+            etiquettes = _etiqueter_composantes(masque, index.decalages_avant)
+            effectifs = np.bincount(etiquettes[cases], minlength=1)
+            arbres_brules[debut:debut + len(lot)][avec_arbres] = effectifs[etiquettes[departs]]
+            lignes, colonnes = index.depuis_plat(departs % nb_cases)
+            positions_depart[debut:debut + len(lot)][avec_arbres] = np.column_stack([lignes, colonnes])
+
+        pourcentage_brule = np.divide(arbres_brules * 100.0, arbres_originaux,
+                                      out=np.zeros(nb_cartes), where=arbres_originaux > 0)
+        niveaux = (5, 25, 50, 75, 95)
+
+        stats = {
+            'arbres_brules': arbres_brules,
+            'arbres_originaux': arbres_originaux,
+            'pourcentage_brule': pourcentage_brule,
+            'positions_depart': positions_depart,
+            'moyenne': float(arbres_brules.mean()) if nb_cartes else 0.0,
+            'ecart_type': float(arbres_brules.std()) if nb_cartes else 0.0,
+            'percentiles': dict(zip(niveaux, np.percentile(arbres_brules, niveaux).tolist())) if nb_cartes else {},
+            'nb_cartes': nb_cartes
+        }
+
+        logger.info("Ensemble simulé (%d cartes %d×%d): %.1f arbres brûlés en moyenne",
+                    nb_cartes, self.hauteur, self.largeur, stats['moyenne'])
+        return stats
+
+    def afficher_carte(self, utiliser_symboles: bool = True, afficher_incendie: bool = False,
+                       fenetre: Tuple[int, int, int, int] = None, reduction: int = 1,
+                       mode_apercu: str = 'majorite') -> str:
+        """
+        Affiche la carte dans la console et retourne le texte affiché
+
+        fenetre = (ligne_debut, ligne_fin, colonne_debut, colonne_fin) limite l'affichage à une zone.
+        Avec reduction > 1, chaque bloc reduction × reduction devient une seule case : le terrain
+        majoritaire du bloc ('majorite'), ou brûlé dès qu'une case du bloc a brûlé ('brule').
+        Rien n'est dessiné quand affichage_console vaut False.
+        """
+        if not self.affichage_console:
+            return ""
+        texte = self._texte_carte(utiliser_symboles, afficher_incendie, fenetre, reduction, mode_apercu)
+        print(texte, end="")
+        return texte
+
+    def _journaliser_carte(self, afficher_incendie: bool):
+        """Dessine la carte dans le journal (niveau INFO), sans rien calculer si le journal ne l'écrit pas"""
+        if self.affichage_console and logger.isEnabledFor(logging.INFO):
+            logger.info("%s", self._texte_carte(True, afficher_incendie).rstrip("\n"))
+
+    def _texte_carte(self, utiliser_symboles: bool = True, afficher_incendie: bool = False,
+                     fenetre: Tuple[int, int, int, int] = None, reduction: int = 1,
+                     mode_apercu: str = 'majorite') -> str:
+        """Texte dessiné par afficher_carte"""
+        if mode_apercu not in MODES_APERCU:
+            raise ValueError(f"Mode d'aperçu inconnu: {mode_apercu} (attendu: {', '.join(MODES_APERCU)})")
+
+        source = self._carte_incendie if afficher_incendie and self._carte_incendie is not None else self.carte
+        ligne_debut, ligne_fin, colonne_debut, colonne_fin = fenetre or (0, self.hauteur, 0, self.largeur)
+        # Découpe par lignes d'abord : une carte brûlée compacte ne reconstruit que les lignes de la fenêtre
+        carte_a_afficher = np.asarray(source[ligne_debut:ligne_fin])[:, colonne_debut:colonne_fin]
+        if reduction > 1:
+            carte_a_afficher = self._apercu_reduit(carte_a_afficher, reduction, mode_apercu)
+
+        # Chaque case est suivie d'une espace, chaque ligne d'un saut de ligne ; le tout devient une
+        # seule chaîne sans boucle Python sur les cases
+        table = SYMBOLES_CONSOLE if utiliser_symboles else LETTRES_CONSOLE
+        hauteur, largeur = carte_a_afficher.shape
+        grille = np.full((hauteur, 2 * largeur + 1), ' ', dtype='U1')
+        grille[:, 0:2 * largeur:2] = table[carte_a_afficher]
+        grille[:, -1] = '\n'
+        cases = grille.reshape(-1).view(f'U{grille.size}')[0] if grille.size else ""
+
+        titre = "CARTE APRÈS INCENDIE" if afficher_incendie else "CARTE DE LA FORÊT"
+        if fenetre is not None:
+            titre += f" (lignes {ligne_debut}-{ligne_fin}, colonnes {colonne_debut}-{colonne_fin})"
+        if reduction > 1:
+            titre += f" [aperçu 1:{reduction}, {mode_apercu}]"
+        texte = "\n" + "=" * 50 + "\n" + titre + "\n" + "=" * 50 + "\n" + cases + "=" * 50 + "\n"
 
         if afficher_incendie:
-            print("Légende: . = terrain nu, T/🌲 = arbre, W/💧 = eau, F/🔥 = feu/brûlé, X = arbre brûlé")
+            texte += "Légende: . = terrain nu, T/🌲 = arbre, W/💧 = eau, F/🔥 = feu/brûlé, X = arbre brûlé\n"
+        return texte
+
+    @staticmethod
+    def _apercu_reduit(carte: np.ndarray, reduction: int, mode_apercu: str) -> np.ndarray:
+        """Réduit la carte par blocs reduction × reduction (les blocs du bord peuvent être incomplets)"""
+        hauteur, largeur = carte.shape
+        nb_lignes, nb_colonnes = -(-hauteur // reduction), -(-largeur // reduction)
+        # Compléter avec une valeur hors terrain, ignorée par les comptes
+        blocs = np.full((nb_lignes * reduction, nb_colonnes * reduction), 255, dtype=np.uint8)
+        blocs[:hauteur, :largeur] = carte
+        blocs = blocs.reshape(nb_lignes, reduction, nb_colonnes, reduction)
+
+        # comptes[v] : nombre de cases de valeur v dans chaque bloc (les valeurs de TerrainType vont de 0 à 4)
+        comptes = np.stack([np.count_nonzero(blocs == valeur, axis=(1, 3)) for valeur in range(len(TerrainType))])
+        apercu = np.argmax(comptes, axis=0).astype(np.uint8)
+        if mode_apercu == 'brule':
+            apercu[comptes[TerrainType.BRULE.value] > 0] = TerrainType.BRULE.value
+            apercu[comptes[TerrainType.FEU.value] > 0] = TerrainType.FEU.value
+        return apercu
 
     def demarrer_incendie_aleatoire(self) -> dict:
         """
@@ -186,19 +2104,59 @@ class ForestFireSimulator:
         """
         return self.simuler_incendie()
 
-    def trouver_meilleure_case_a_deboiser(self, ligne_incendie: int, colonne_incendie: int) -> dict:
+    def trouver_meilleure_case_a_deboiser(self, ligne_incendie: int, colonne_incendie: int,
+                                          methode: str = 'articulation') -> dict:
+        """
+        Cherche l'arbre dont le déboisement sauve le plus d'arbres de l'incendie
+
+        La méthode 'articulation' calcule le gain de chaque case en un seul parcours de la composante
+        en feu (points d'articulation) ; 'force_brute' relance une propagation par arbre candidat.
+        """
+        if methode not in METHODES_DEBOISEMENT:
+            raise ValueError(f"Méthode de déboisement inconnue: {methode} "
+                             f"(attendu: {', '.join(METHODES_DEBOISEMENT)})")
+
         if self.carte[ligne_incendie, colonne_incendie] != TerrainType.ARBRE.value:
             return {'erreur': 'Pas d\'arbre à la position d\'incendie spécifiée'}
 
+        cle = None
+        resultat = None
+        if self.cache is not None:
+            cle = ('deboisement', self.empreinte_carte(), self.carte.shape, ligne_incendie, colonne_incendie, methode)
+            resultat = self.cache.lire(cle)
+        if resultat is None:
+            with self.instrumentation.phase('recherche_deboisement'):
+                resultat = self._chercher_case_a_deboiser(ligne_incendie, colonne_incendie, methode)
+            if cle is not None:
+                self.cache.ecrire(cle, resultat, TAILLE_RESULTAT_DEBOISEMENT)
+        resultat = dict(resultat)
+        self.instrumentation.signaler('deboisement', resultat)
+        return resultat
+
+    def _chercher_case_a_deboiser(self, ligne_incendie: int, colonne_incendie: int, methode: str) -> dict:
+        """Recherche de trouver_meilleure_case_a_deboiser, une fois les paramètres vérifiés"""
         stats_reference = self.simuler_incendie(ligne_incendie, colonne_incendie)
         arbres_brules_reference = stats_reference['arbres_brules']
 
-        positions_arbres = []
-        for i in range(self.hauteur):
-            for j in range(self.largeur):
-                if (self.carte[i, j] == TerrainType.ARBRE.value and
-                        not (i == ligne_incendie and j == colonne_incendie)):
-                    positions_arbres.append((i, j))
+        if methode == 'articulation':
+            if self.comptes_terrain()[TerrainType.ARBRE.value] < 2:
+                return {'erreur': 'Aucun autre arbre à déboiser sur la carte'}
+
+            composante = self._masque_incendie()
+            arbres_brules_apres = _arbres_brules_apres_retrait(self._index_voisinage(), composante,
+                                                               ligne_incendie, colonne_incendie)
+            # Un seul parcours de la composante évalue tous ses arbres autres que le départ
+            self.instrumentation.compter('cases_visitees', arbres_brules_reference)
+            self.instrumentation.compter('candidats_evalues', arbres_brules_reference - 1)
+            indice = int(np.argmin(arbres_brules_apres))
+            meilleur_resultat = int(arbres_brules_apres.flat[indice])
+            meilleure_reduction = arbres_brules_reference - meilleur_resultat
+            meilleure_position = divmod(indice, self.largeur) if meilleure_reduction > 0 else None
+            return self._resultat_deboisement(ligne_incendie, colonne_incendie, meilleure_position,
+                                              arbres_brules_reference, meilleur_resultat, meilleure_reduction)
+
+        positions_arbres = [(int(i), int(j)) for i, j in self.positions_arbres()
+                            if not (i == ligne_incendie and j == colonne_incendie)]
 
         if not positions_arbres:
             return {'erreur': 'Aucun autre arbre à déboiser sur la carte'}
@@ -207,26 +2165,16 @@ class ForestFireSimulator:
         meilleure_reduction = 0
         meilleur_resultat = arbres_brules_reference
 
+        index = self._index_voisinage()
+        arbres = bytearray(index.masque_pade(self.carte == TerrainType.ARBRE.value))
+        racine = index.vers_plat(ligne_incendie, colonne_incendie)
+
+        self.instrumentation.compter('candidats_evalues', len(positions_arbres))
         for i, j in positions_arbres:
-            valeur_originale = self.carte[i, j]
-            self.carte[i, j] = TerrainType.TERRAIN_NU.value
-
-            queue = deque([(ligne_incendie, colonne_incendie)])
-            cases_brulees = set()
-            cases_brulees.add((ligne_incendie, colonne_incendie))
-            carte_temp = self.carte.copy()
-            carte_temp[ligne_incendie, colonne_incendie] = TerrainType.BRULE.value
-
-            while queue:
-                ligne_actuelle, colonne_actuelle = queue.popleft()
-                for ni, nj in self.obtenir_voisins(ligne_actuelle, colonne_actuelle):
-                    if (carte_temp[ni, nj] == TerrainType.ARBRE.value and
-                            (ni, nj) not in cases_brulees):
-                        carte_temp[ni, nj] = TerrainType.BRULE.value
-                        cases_brulees.add((ni, nj))
-                        queue.append((ni, nj))
-
-            arbres_brules_test = len(cases_brulees)
+            case = index.vers_plat(i, j)
+            arbres[case] = 0
+
+            arbres_brules_test = len(self._parcourir_instrumente(arbres, racine, index.liste_decalages))
             reduction = arbres_brules_reference - arbres_brules_test
 
             if reduction > meilleure_reduction:
@@ -234,8 +2182,14 @@ class ForestFireSimulator:
                 meilleure_position = (i, j)
                 meilleur_resultat = arbres_brules_test
 
-            self.carte[i, j] = valeur_originale
+            arbres[case] = 1
+
+        return self._resultat_deboisement(ligne_incendie, colonne_incendie, meilleure_position,
+                                          arbres_brules_reference, meilleur_resultat, meilleure_reduction)
 
+    def _resultat_deboisement(self, ligne_incendie: int, colonne_incendie: int, meilleure_position,
+                              arbres_brules_reference: int, meilleur_resultat: int, meilleure_reduction: int) -> dict:
+        """Construit le dictionnaire de résultat de trouver_meilleure_case_a_deboiser"""
         pourcentage_reduction = (
                     meilleure_reduction / arbres_brules_reference * 100) if arbres_brules_reference > 0 else 0
 
@@ -248,19 +2202,84 @@ class ForestFireSimulator:
             'position_incendie': (ligne_incendie, colonne_incendie)
         }
 
+    def trouver_meilleurs_deboisements(self, ligne_incendie: int, colonne_incendie: int, budget: int = 1) -> dict:
+        """
+        Choisit jusqu'à `budget` cases à déboiser, une à une, par un glouton
+
+        Chaque étape refait une passe de points d'articulation sur la zone encore en feu : elle donne
+        le gain exact de toutes ses cases en un seul parcours. Les gains ne sont pas sous-modulaires
+        (déboiser une case peut faire d'une voisine un point d'articulation et augmenter son gain),
+        un gain d'une étape précédente ne borne donc pas le gain actuel et ne peut pas être réutilisé.
+        Les cases sorties de la zone en feu ne sont plus parcourues.
+        """
+        if budget < 1:
+            raise ValueError("Le budget de déboisement doit être au moins 1")
+
+        if self.carte[ligne_incendie, colonne_incendie] != TerrainType.ARBRE.value:
+            return {'erreur': 'Pas d\'arbre à la position d\'incendie spécifiée'}
+
+        debut = time.perf_counter()
+        stats_reference = self.simuler_incendie(ligne_incendie, colonne_incendie)
+        arbres_brules_reference = stats_reference['arbres_brules']
+
+        composante = self._masque_incendie()
+        index = self._index_voisinage()
+        en_feu = bytearray(index.masque_pade(composante))
+        racine = index.vers_plat(ligne_incendie, colonne_incendie)
+
+        positions = []
+        arbres_sauves_par_etape = []
+        arbres_brules_actuels = arbres_brules_reference
+        evaluations = 0
+
+        while len(positions) < budget:
+            arbres_brules_apres = _arbres_brules_apres_retrait(index, composante, ligne_incendie, colonne_incendie)
+            evaluations += 1
+            self.instrumentation.compter('cases_visitees', arbres_brules_actuels)
+            # La passe évalue tous les arbres en feu sauf le départ
+            self.instrumentation.compter('candidats_evalues', arbres_brules_actuels - 1)
+            # À gain égal, la première case dans l'ordre des lignes
+            indice = int(np.argmin(arbres_brules_apres))
+            if arbres_brules_apres.flat[indice] >= arbres_brules_actuels:
+                break
+
+            i, j = divmod(indice, self.largeur)
+            en_feu[index.vers_plat(i, j)] = 0
+            atteintes = self._parcourir_instrumente(en_feu, racine, index.liste_decalages)
+            en_feu = bytearray(len(en_feu))
+            for v in atteintes:
+                en_feu[v] = 1
+            composante = index.retirer_bordure(np.frombuffer(en_feu, dtype=bool))
+
+            arbres_brules_actuels = len(atteintes)
+            positions.append((i, j))
+            arbres_sauves_par_etape.append(arbres_brules_reference - arbres_brules_actuels)
+
+        arbres_sauves = arbres_brules_reference - arbres_brules_actuels
+        pourcentage_reduction = (
+                    arbres_sauves / arbres_brules_reference * 100) if arbres_brules_reference > 0 else 0
+
+        resultat = {
+            'positions_deboisement': positions,
+            'arbres_sauves_par_etape': arbres_sauves_par_etape,
+            'arbres_brules_sans_deboisement': arbres_brules_reference,
+            'arbres_brules_avec_deboisement': arbres_brules_actuels,
+            'arbres_sauves': arbres_sauves,
+            'pourcentage_reduction': pourcentage_reduction,
+            'evaluations': evaluations,
+            'temps_calcul': time.perf_counter() - debut,
+            'position_incendie': (ligne_incendie, colonne_incendie)
+        }
+        self.instrumentation.signaler('deboisement', resultat)
+        return resultat
+
     def appliquer_deboisement_et_simuler(self, ligne_incendie: int, colonne_incendie: int,
                                          ligne_deboisement: int, colonne_deboisement: int) -> dict:
         if self.carte[ligne_deboisement, colonne_deboisement] != TerrainType.ARBRE.value:
             return {'erreur': 'Pas d\'arbre à la position de déboisement spécifiée'}
 
-        valeur_originale = self.carte[ligne_deboisement, colonne_deboisement]
-        self.carte[ligne_deboisement, colonne_deboisement] = TerrainType.TERRAIN_NU.value
-
-        stats = self.simuler_incendie(ligne_incendie, colonne_incendie)
-
-        self.carte[ligne_deboisement, colonne_deboisement] = valeur_originale
-
-        return stats
+        with self.modification_temporaire({(ligne_deboisement, colonne_deboisement): TerrainType.TERRAIN_NU.value}):
+            return self.simuler_incendie(ligne_incendie, colonne_incendie)
 
     def simulation_complete_avec_deboisement(self, ligne_incendie: int = None, colonne_incendie: int = None) -> Dict[
         str, Any]:
@@ -271,37 +2290,45 @@ class ForestFireSimulator:
                 not (0 <= ligne_incendie < self.hauteur and 0 <= colonne_incendie < self.largeur) or
                 self.carte[ligne_incendie, colonne_incendie] != TerrainType.ARBRE.value):
 
-            positions_arbres = []
-            for i in range(self.hauteur):
-                for j in range(self.largeur):
-                    if self.carte[i, j] == TerrainType.ARBRE.value:
-                        positions_arbres.append((i, j))
+            position_arbre = self._choisir_arbre_aleatoire()
 
-            if not positions_arbres:
-                print("Erreur: Aucun arbre trouvé sur la carte!")
+            if position_arbre is None:
+                logger.error("Erreur: Aucun arbre trouvé sur la carte!")
                 return {}
 
-            ligne_incendie, colonne_incendie = random.choice(positions_arbres)
+            ligne_incendie, colonne_incendie = position_arbre
 
-        # Capturer les données pour l'export HTML
+        # Capturer les données pour l'export HTML, en gardant les paramètres de génération de la carte
         donnees_export = {}
+        if 'generation' in self.donnees_simulation:
+            donnees_export['generation'] = self.donnees_simulation['generation']
+
+        temps = {}
+        debut_simulation = time.perf_counter()
 
         # 1. Carte originale et statistiques
+        debut_phase = time.perf_counter()
         stats_orig = self.obtenir_statistiques()
-        donnees_export['carte_originale'] = self.carte.copy()
+        temps['statistiques'] = time.perf_counter() - debut_phase
         donnees_export['stats_originales'] = stats_orig
         donnees_export['position_incendie'] = (ligne_incendie, colonne_incendie)
 
-        # 2. Simulation sans déboisement
+        # 2. Simulation sans déboisement (sa carte de base est la carte originale, partagée par les résultats)
+        debut_phase = time.perf_counter()
         stats_sans = self.simuler_incendie(ligne_incendie, colonne_incendie)
-        donnees_export['carte_sans_deboisement'] = self.carte_incendie.copy()
+        temps['simulation_sans_deboisement'] = time.perf_counter() - debut_phase
+        carte_sans = self._carte_incendie
+        donnees_export['carte_originale'] = carte_sans.base
+        donnees_export['carte_sans_deboisement'] = carte_sans
         donnees_export['stats_sans_deboisement'] = stats_sans
 
         # 3. Trouver la meilleure case à déboiser
+        debut_phase = time.perf_counter()
         resultat_deboisement = self.trouver_meilleure_case_a_deboiser(ligne_incendie, colonne_incendie)
+        temps['recherche_deboisement'] = time.perf_counter() - debut_phase
 
         if 'erreur' in resultat_deboisement:
-            print(f"Erreur: {resultat_deboisement['erreur']}")
+            logger.error("Erreur: %s", resultat_deboisement['erreur'])
             return donnees_export
 
         pos_deboisement = resultat_deboisement['position_deboisement']
@@ -309,9 +2336,17 @@ class ForestFireSimulator:
         donnees_export['resultats_deboisement'] = resultat_deboisement
 
         # 4. Simulation avec déboisement
-        stats_avec = self.appliquer_deboisement_et_simuler(ligne_incendie, colonne_incendie, pos_deboisement[0],
-                                                           pos_deboisement[1])
-        donnees_export['carte_avec_deboisement'] = self.carte_incendie.copy()
+        debut_phase = time.perf_counter()
+        if pos_deboisement is None:
+            # L'incendie ne touche que l'arbre de départ : rien à déboiser, le résultat est inchangé
+            stats_avec = stats_sans
+            donnees_export['carte_avec_deboisement'] = carte_sans
+        else:
+            stats_avec = self.appliquer_deboisement_et_simuler(ligne_incendie, colonne_incendie, pos_deboisement[0],
+                                                               pos_deboisement[1])
+            donnees_export['carte_avec_deboisement'] = CarteBrulee(
+                carte_sans.base, self._carte_incendie.masque(), {pos_deboisement: TerrainType.TERRAIN_NU.value})
+        temps['simulation_avec_deboisement'] = time.perf_counter() - debut_phase
         donnees_export['stats_avec_deboisement'] = stats_avec
 
         # 5. Calculs de comparaison
@@ -323,56 +2358,106 @@ class ForestFireSimulator:
             'taux_reduction': taux_reduction
         }
 
+        temps['total'] = time.perf_counter() - debut_simulation
+        donnees_export['temps'] = temps
+
         # Stocker pour utilisation ultérieure
         self.donnees_simulation = donnees_export
 
-        # Affichage console (conservé pour compatibilité)
-        print("=== CARTE ORIGINALE ===")
-        self.afficher_carte(utiliser_symboles=True, afficher_incendie=False)
+        # Les cartes vont au journal comme le reste du compte rendu : rien n'est écrit par défaut
+        logger.info("=== CARTE ORIGINALE ===")
+        self._journaliser_carte(afficher_incendie=False)
 
-        print(f"\nStatistiques de la carte:")
-        print(f"- Terrain nu: {stats_orig['terrain_nu']} cases ({stats_orig['terrain_nu_pct']:.1f}%)")
-        print(f"- Arbres: {stats_orig['arbres']} cases ({stats_orig['arbres_pct']:.1f}%)")
-        print(f"- Eau: {stats_orig['eau']} cases ({stats_orig['eau_pct']:.1f}%)")
-        print(f"- Total: {stats_orig['total']} cases")
+        logger.info("Statistiques de la carte:")
+        logger.info("- Terrain nu: %d cases (%.1f%%)", stats_orig['terrain_nu'], stats_orig['terrain_nu_pct'])
+        logger.info("- Arbres: %d cases (%.1f%%)", stats_orig['arbres'], stats_orig['arbres_pct'])
+        logger.info("- Eau: %d cases (%.1f%%)", stats_orig['eau'], stats_orig['eau_pct'])
+        logger.info("- Total: %d cases", stats_orig['total'])
 
-        print(f"\nPosition de l'incendie: ({ligne_incendie}, {colonne_incendie})")
+        logger.info("Position de l'incendie: (%d, %d)", ligne_incendie, colonne_incendie)
 
-        print("\n=== CARTE BRÛLÉE SANS DÉBOISEMENT ===")
+        logger.info("=== CARTE BRÛLÉE SANS DÉBOISEMENT ===")
         self.carte_incendie = donnees_export['carte_sans_deboisement']
-        self.afficher_carte(utiliser_symboles=True, afficher_incendie=True)
+        self._journaliser_carte(afficher_incendie=True)
 
-        print(f"\nRésultats de l'incendie:")
-        print(f"- Position de départ: {stats_sans['position_depart']}")
-        print(f"- Arbres brûlés: {stats_sans['arbres_brules']}")
-        print(f"- Arbres originaux: {stats_sans['arbres_originaux']}")
-        print(f"- Pourcentage brûlé: {stats_sans['pourcentage_brule']:.1f}%")
+        logger.info("Résultats de l'incendie:")
+        logger.info("- Position de départ: %s", stats_sans['position_depart'])
+        logger.info("- Arbres brûlés: %d", stats_sans['arbres_brules'])
+        logger.info("- Arbres originaux: %d", stats_sans['arbres_originaux'])
+        logger.info("- Pourcentage brûlé: %.1f%%", stats_sans['pourcentage_brule'])
 
-        print(f"\n=== CARTE BRÛLÉE AVEC DÉBOISEMENT (case {pos_deboisement}) ===")
+        logger.info("=== CARTE BRÛLÉE AVEC DÉBOISEMENT (case %s) ===", pos_deboisement)
         self.carte_incendie = donnees_export['carte_avec_deboisement']
-        self.afficher_carte(utiliser_symboles=True, afficher_incendie=True)
+        self._journaliser_carte(afficher_incendie=True)
 
-        print(f"\nRésultats de l'incendie avec déboisement:")
-        print(f"- Position de départ: {stats_avec['position_depart']}")
-        print(f"- Arbres brûlés: {stats_avec['arbres_brules']}")
-        print(f"- Arbres originaux: {stats_avec['arbres_originaux']}")
-        print(f"- Pourcentage brûlé: {stats_avec['pourcentage_brule']:.1f}%")
+        logger.info("Résultats de l'incendie avec déboisement:")
+        logger.info("- Position de départ: %s", stats_avec['position_depart'])
+        logger.info("- Arbres brûlés: %d", stats_avec['arbres_brules'])
+        logger.info("- Arbres originaux: %d", stats_avec['arbres_originaux'])
+        logger.info("- Pourcentage brûlé: %.1f%%", stats_avec['pourcentage_brule'])
 
-        print(f"\nComparaison:")
-        print(f"- Case déboisée: {pos_deboisement}")
-        print(f"- Arbres sauvés: {arbres_sauves}")
-        print(f"- Taux de réduction: {taux_reduction:.1f}%")
+        logger.info("Comparaison:")
+        logger.info("- Case déboisée: %s", pos_deboisement)
+        logger.info("- Arbres sauvés: %d", arbres_sauves)
+        logger.info("- Taux de réduction: %.1f%%", taux_reduction)
 
         return donnees_export
 
+    def carte_de_risque(self, parallele: bool = False) -> dict:
+        """
+        Calcule pour chaque case le nombre d'arbres brûlés si l'incendie y démarre
+
+        Ce nombre est la taille de la composante d'arbres de la case (0 hors arbres) : une seule
+        passe d'étiquetage suffit pour toutes les positions de départ possibles. Avec parallele,
+        l'étiquetage est réparti sur nb_processus processus.
+        """
+        arbres = self.carte == TerrainType.ARBRE.value
+        if parallele:
+            etiquettes = _etiqueter_en_parallele(self.carte, self.nb_processus or os.cpu_count() or 1)
+        else:
+            index = self._index_voisinage()
+            etiquettes = index.retirer_bordure(_etiqueter_composantes(index.masque_pade(arbres), index.decalages_avant))
+
+        # Les étiquettes sont des entiers positifs bornés par le nombre d'arbres : bincount donne
+        # directement la taille de chaque composante
+        etiquettes_arbres = etiquettes[arbres]
+        effectifs = np.bincount(etiquettes_arbres)
+        tailles = effectifs[effectifs > 0]
+        risque = np.zeros(self.carte.shape, dtype=np.int64)
+        risque[arbres] = effectifs[etiquettes_arbres]
+
+        nb_arbres = int(etiquettes_arbres.size)
+        # Départ uniforme sur les arbres : une composante de taille s est touchée avec probabilité s / nb_arbres
+        esperance = float(np.sum(tailles.astype(np.float64) ** 2) / nb_arbres) if nb_arbres > 0 else 0.0
+        valeurs_tailles, nb_composantes = np.unique(tailles, return_counts=True)
+
+        resultat = {
+            'carte_risque': risque,
+            'arbres': nb_arbres,
+            'nb_composantes': int(tailles.size),
+            'taille_max': int(tailles.max()) if tailles.size else 0,
+            'esperance_arbres_brules': esperance,
+            'pourcentage_brule_espere': (esperance / nb_arbres * 100) if nb_arbres > 0 else 0.0,
+            'histogramme_tailles': {
+                'tailles': valeurs_tailles.tolist(),
+                'nb_composantes': nb_composantes.tolist()
+            }
+        }
+        self.donnees_simulation['risque'] = resultat
+        return resultat
+
     def obtenir_statistiques(self) -> dict:
-        """Retourne les statistiques de la carte actuelle"""
+        """Retourne les statistiques de la carte actuelle (calculées une fois par version de la carte)"""
+        return dict(self._valeur_derivee('statistiques', self._calculer_statistiques))
+
+    def _calculer_statistiques(self) -> dict:
         total_cases = self.largeur * self.hauteur
+        comptes = self.comptes_terrain()
 
         compteurs = {
-            'terrain_nu': np.sum(self.carte == TerrainType.TERRAIN_NU.value),
-            'arbres': np.sum(self.carte == TerrainType.ARBRE.value),
-            'eau': np.sum(self.carte == TerrainType.EAU.value)
+            'terrain_nu': comptes[TerrainType.TERRAIN_NU.value],
+            'arbres': comptes[TerrainType.ARBRE.value],
+            'eau': comptes[TerrainType.EAU.value]
         }
 
         pourcentages = {
@@ -382,163 +2467,84 @@ class ForestFireSimulator:
 
         return {**compteurs, **pourcentages, 'total': total_cases}
 
-    def _generer_html_carte(self, carte: np.ndarray, titre: str, description: str = "") -> str:
+    def _generer_html_carte(self, carte: np.ndarray, titre: str, description: str = "",
+                            palette: Dict[int, Tuple[str, str, str]] = None) -> str:
         """Génère le HTML pour une carte donnée"""
-        # Couleurs pour chaque type de terrain
-        couleurs = {
-            TerrainType.TERRAIN_NU.value: '#D2B48C',  # Beige pour terrain nu
-            TerrainType.ARBRE.value: '#228B22',  # Vert pour les arbres
-            TerrainType.EAU.value: '#4169E1',  # Bleu pour l'eau
-            TerrainType.BRULE.value: '#DC143C'  # Rouge pour les zones brûlées
-        }
-
-        symboles = {
-            TerrainType.TERRAIN_NU.value: '.',
-            TerrainType.ARBRE.value: '🌲',
-            TerrainType.EAU.value: '💧',
-            TerrainType.BRULE.value: '🔥'
-        }
-
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="fr">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{titre}</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    margin: 20px;
-                    background-color: #f5f5f5;
-                }}
-                .container {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    background-color: white;
-                    padding: 20px;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                h1 {{
-                    color: #333;
-                    text-align: center;
-                    margin-bottom: 20px;
-                }}
-                .description {{
-                    background-color: #e8f4f8;
-                    padding: 15px;
-                    border-radius: 5px;
-                    margin-bottom: 20px;
-                    border-left: 5px solid #007acc;
-                }}
-                .carte {{
-                    display: grid;
-                    grid-template-columns: repeat({self.largeur}, 1fr);
-                    gap: 1px;
-                    background-color: #ddd;
-                    padding: 10px;
-                    border-radius: 5px;
-                    margin: 20px auto;
-                    width: fit-content;
-                }}
-                .case {{
-                    width: 20px;
-                    height: 20px;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    font-size: 12px;
-                    border: 1px solid #888;
-                }}
-                .legende {{
-                    display: flex;
-                    justify-content: center;
-                    gap: 20px;
-                    margin-top: 20px;
-                    flex-wrap: wrap;
-                }}
-                .legende-item {{
-                    display: flex;
-                    align-items: center;
-                    gap: 5px;
-                    padding: 5px 10px;
-                    background-color: #f0f0f0;
-                    border-radius: 15px;
-                }}
-                .legende-couleur {{
-                    width: 15px;
-                    height: 15px;
-                    border: 1px solid #333;
-                    border-radius: 3px;
-                }}
-                .timestamp {{
-                    text-align: center;
-                    color: #666;
-                    font-size: 12px;
-                    margin-top: 20px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>{titre}</h1>
-                {f'<div class="description">{description}</div>' if description else ''}
-
-                <div class="carte">
-        """
-
-        # Générer la grille
-        for i in range(self.hauteur):
-            for j in range(self.largeur):
-                valeur = carte[i, j]
-                couleur = couleurs.get(valeur, '#FFFFFF')
-                symbole = symboles.get(valeur, '?')
-                html += f'<div class="case" style="background-color: {couleur};" title="Ligne {i}, Colonne {j}: {symbole}">{symbole}</div>\n'
-
-        html += """
-                </div>
-
-                <div class="legende">
-                    <div class="legende-item">
-                        <div class="legende-couleur" style="background-color: #D2B48C;"></div>
-                        <span>Terrain nu (.)</span>
-                    </div>
-                    <div class="legende-item">
-                        <div class="legende-couleur" style="background-color: #228B22;"></div>
-                        <span>Arbres (🌲)</span>
-                    </div>
-                    <div class="legende-item">
-                        <div class="legende-couleur" style="background-color: #4169E1;"></div>
-                        <span>Eau (💧)</span>
-                    </div>
-                    <div class="legende-item">
-                        <div class="legende-couleur" style="background-color: #DC143C;"></div>
-                        <span>Zone brûlée (🔥)</span>
-                    </div>
-                </div>
-
-                <div class="timestamp">
-                    Généré le """ + datetime.now().strftime("%d/%m/%Y à %H:%M:%S") + """
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
-        return html
-
-    def exporter_html(self, dossier_sortie: str = "exports_html"):
+        palette = PALETTE_TERRAIN if palette is None else palette
+
+        morceaux = [self._html_entete(titre)]
+        morceaux.append(f"""
+    <div class="container">
+        <h1>{titre}</h1>
+        {f'<div class="description">{description}</div>' if description else ''}
+""")
+        morceaux.extend(self._morceaux_html_canvas(carte, palette))
+        morceaux.append(self._html_legende(palette))
+        morceaux.append(self._html_pied())
+        return "".join(morceaux)
+
+    def _html_entete(self, titre: str, style_supplementaire: str = "") -> str:
+        """Début de page HTML commun à tous les exports (feuille de style partagée)"""
+        return f"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{titre}</title>
+    <style>{STYLE_HTML}{style_supplementaire}</style>
+</head>
+<body>"""
+
+    def _morceaux_html_canvas(self, carte: np.ndarray, palette: Dict[int, Tuple[str, str, str]],
+                              attributs: str = "", classe: str = "carte"):
         """
-        Exporte les trois états de la simulation en HTML
+        Génère, morceau par morceau, le <canvas> d'une carte : l'image PNG à palette est encodée en
+        base64 dans un attribut et dessinée par le script de la page, qui calcule aussi les infobulles
+        """
+        couleurs = [couleur for couleur, _, _ in palette.values()] + ['#FFFFFF']
+        symboles = {','.join(str(int(couleur[k:k + 2], 16)) for k in (1, 3, 5)): symbole
+                    for couleur, symbole, _ in palette.values()}
+        # Table de correspondance valeur -> indice dans la palette (blanc pour les valeurs inconnues)
+        correspondance = np.full(256, len(couleurs) - 1, dtype=np.uint8)
+        correspondance[list(palette.keys())] = np.arange(len(palette))
+
+        hauteur, largeur = np.shape(carte)
+        taille_case = max(1, min(20, 1100 // max(largeur, 1)))
+        yield (f'        <canvas class="{classe}" width="{largeur * taille_case}" height="{hauteur * taille_case}" '
+               f'data-symboles="{escape(json.dumps(symboles, ensure_ascii=False))}"{attributs} '
+               f'data-image="data:image/png;base64,')
+        yield from _base64_par_morceaux(_morceaux_png_palette(carte, correspondance, couleurs))
+        yield '"></canvas>\n'
+
+    def _html_legende(self, palette: Dict[int, Tuple[str, str, str]]) -> str:
+        """Légende des couleurs d'une palette"""
+        legende = "".join(f"""
+            <div class="legende-item">
+                <div class="legende-couleur" style="background-color: {couleur};"></div>
+                <span>{libelle} ({symbole})</span>
+            </div>""" for couleur, symbole, libelle in palette.values())
+        return f"""
+        <div class="legende">{legende}
+        </div>
+"""
+
+    def _html_pied(self, script_supplementaire: str = "") -> str:
+        """Fin de page HTML : horodatage et script de rendu des cartes"""
+        return f"""
+        <div class="timestamp">
+            Généré le {datetime.now().strftime("%d/%m/%Y à %H:%M:%S")}
+        </div>
+    </div>
+    <script>{SCRIPT_CARTES_HTML}{script_supplementaire}</script>
+</body>
+</html>
+"""
+
+    def _calques_export(self) -> List[Tuple[str, str, str, str, Any]]:
+        """
+        Retourne les trois états de la simulation à exporter :
+        (nom de fichier, identifiant de calque, titre, description HTML, carte)
         """
-        if not self.donnees_simulation:
-            print("Erreur: Aucune simulation n'a été effectuée. Lancez d'abord simulation_complete_avec_deboisement()")
-            return
-
-        # Créer le dossier de sortie
-        os.makedirs(dossier_sortie, exist_ok=True)
-
         donnees = self.donnees_simulation
 
         # 1. Carte originale
@@ -552,12 +2558,6 @@ class ForestFireSimulator:
         • Position de l'incendie : {donnees['position_incendie']}
         """
 
-        html_original = self._generer_html_carte(
-            donnees['carte_originale'],
-            "Carte Originale de la Forêt",
-            description_orig
-        )
-
         # 2. Carte après incendie (sans déboisement)
         stats_sans = donnees['stats_sans_deboisement']
         description_sans = f"""
@@ -567,12 +2567,6 @@ class ForestFireSimulator:
         • Pourcentage brûlé : {stats_sans['pourcentage_brule']:.1f}%
         """
 
-        html_sans_deboisement = self._generer_html_carte(
-            donnees['carte_sans_deboisement'],
-            "Carte Après Incendie (Sans Déboisement)",
-            description_sans
-        )
-
         # 3. Carte après incendie avec déboisement
         stats_avec = donnees['stats_avec_deboisement']
         comp = donnees['comparaison']
@@ -587,40 +2581,271 @@ class ForestFireSimulator:
         • Taux de réduction : {comp['taux_reduction']:.1f}%
         """
 
-        html_avec_deboisement = self._generer_html_carte(
-            donnees['carte_avec_deboisement'],
-            "Carte Après Incendie (Avec Déboisement Optimal)",
-            description_avec
-        )
-
-        # Sauvegarder les fichiers
-        fichiers = [
-            ("carte_originale.html", html_original),
-            ("carte_apres_incendie.html", html_sans_deboisement),
-            ("carte_avec_deboisement.html", html_avec_deboisement)
+        return [
+            ("carte_originale.html", "calque-originale", "Carte Originale de la Forêt",
+             description_orig, donnees['carte_originale']),
+            ("carte_apres_incendie.html", "calque-sans-deboisement", "Carte Après Incendie (Sans Déboisement)",
+             description_sans, donnees['carte_sans_deboisement']),
+            ("carte_avec_deboisement.html", "calque-avec-deboisement",
+             "Carte Après Incendie (Avec Déboisement Optimal)", description_avec, donnees['carte_avec_deboisement'])
         ]
 
-        for nom_fichier, contenu_html in fichiers:
-            chemin_fichier = os.path.join(dossier_sortie, nom_fichier)
-            with open(chemin_fichier, 'w', encoding='utf-8') as f:
-                f.write(contenu_html)
-            print(f"✅ Fichier généré: {chemin_fichier}")
+    def exporter_html(self, dossier_sortie: str = "exports_html", rapport_unique: bool = False):
+        """
+        Exporte les trois états de la simulation en HTML
+
+        Avec rapport_unique, un seul fichier rapport_incendie.html regroupe les trois cartes en calques
+        à afficher tour à tour et la durée de chaque phase ; il est écrit au fil de l'eau.
+        """
+        if not self.donnees_simulation:
+            logger.error("Erreur: Aucune simulation n'a été effectuée. "
+                         "Lancez d'abord simulation_complete_avec_deboisement()")
+            return
+
+        # Créer le dossier de sortie
+        os.makedirs(dossier_sortie, exist_ok=True)
+
+        calques = self._calques_export()
+
+        with self.instrumentation.phase('export_html'):
+            if rapport_unique:
+                chemin_fichier = os.path.join(dossier_sortie, "rapport_incendie.html")
+                with open(chemin_fichier, 'w', encoding='utf-8') as f:
+                    self._ecrire_rapport_html(f, calques)
+                logger.info("✅ Fichier généré: %s", chemin_fichier)
+            else:
+                for nom_fichier, _, titre, description, carte in calques:
+                    chemin_fichier = os.path.join(dossier_sortie, nom_fichier)
+                    with open(chemin_fichier, 'w', encoding='utf-8') as f:
+                        f.write(self._generer_html_carte(carte, titre, description))
+                    logger.info("✅ Fichier généré: %s", chemin_fichier)
+
+        logger.info("🎉 Export HTML terminé! Fichiers sauvegardés dans le dossier '%s'", dossier_sortie)
+        logger.info("Ouvrez les fichiers .html dans votre navigateur pour visualiser les résultats.")
+
+    def _ecrire_rapport_html(self, f, calques: List[Tuple[str, str, str, str, Any]]):
+        """
+        Écrit le rapport unique dans le fichier ouvert f, morceau par morceau : chaque carte est
+        encodée par blocs de lignes, la mémoire utilisée ne dépend pas de la taille de la carte
+        """
+        titre = "Rapport de Simulation d'Incendie"
+        f.write(self._html_entete(titre, STYLE_RAPPORT_HTML))
+        f.write(f"""
+    <div class="container">
+        <h1>{titre}</h1>
+""")
+        f.write(self._html_temps_phases())
+
+        boutons = "".join(f"""
+            <button class="calque{' actif' if k == 0 else ''}" data-calque="{identifiant}">{titre_calque}</button>"""
+                          for k, (_, identifiant, titre_calque, _, _) in enumerate(calques))
+        f.write(f"""
+        <div class="calques">{boutons}
+        </div>
+""")
+
+        for k, (_, identifiant, titre_calque, description, carte) in enumerate(calques):
+            f.write(f"""
+        <section class="couche" id="{identifiant}"{'' if k == 0 else ' hidden'}>
+        <h2>{titre_calque}</h2>
+        <div class="description">{description}</div>
+""")
+            for morceau in self._morceaux_html_canvas(carte, PALETTE_TERRAIN):
+                f.write(morceau)
+            f.write("""        </section>
+""")
+
+        f.write(self._html_legende(PALETTE_TERRAIN))
+        f.write(self._html_pied(SCRIPT_CALQUES_HTML))
+
+    def _html_temps_phases(self) -> str:
+        """Tableau des durées de chaque phase de la dernière simulation complète"""
+        temps = self.donnees_simulation.get('temps', {})
+        if not temps:
+            return ""
+        lignes = "".join(f"""
+                <tr><td>{LIBELLES_PHASES.get(phase, phase)}</td><td>{duree * 1000:.1f} ms</td></tr>"""
+                         for phase, duree in temps.items())
+        return f"""
+        <table class="temps">
+            <thead>
+                <tr><th>Phase</th><th>Durée</th></tr>
+            </thead>
+            <tbody>{lignes}
+            </tbody>
+        </table>
+"""
+
+    def exporter_carte_de_risque(self, dossier_sortie: str = "exports_html"):
+        """
+        Exporte la carte de risque en HTML (classes de risque) et en .npy (valeurs brutes),
+        à côté des autres exports HTML
+        """
+        risque = self.carte_de_risque()
+        carte_risque = risque['carte_risque']
+        os.makedirs(dossier_sortie, exist_ok=True)
+
+        classes = np.zeros(carte_risque.shape, dtype=np.int64)
+        arbres = carte_risque > 0
+        if risque['arbres'] > 0:
+            pourcentages = carte_risque[arbres] / risque['arbres'] * 100
+            classes[arbres] = 1 + np.searchsorted(SEUILS_RISQUE, pourcentages, side='right')
+
+        tailles = risque['histogramme_tailles']['tailles']
+        nb_composantes = risque['histogramme_tailles']['nb_composantes']
+        histogramme = ", ".join(f"{taille} arbre(s) × {nombre}" for taille, nombre in
+                                zip(tailles[:10], nb_composantes[:10]))
+        if len(tailles) > 10:
+            histogramme += ", …"
+        description = f"""
+        <strong>Risque d'incendie selon le point de départ :</strong><br>
+        • Arbres : {risque['arbres']} répartis en {risque['nb_composantes']} massifs (le plus grand : {risque['taille_max']})<br>
+        • Arbres brûlés en moyenne (départ uniforme sur les arbres) : {risque['esperance_arbres_brules']:.1f}
+        ({risque['pourcentage_brule_espere']:.1f}%)<br>
+        • Taille des massifs : {histogramme}
+        """
+
+        html = self._generer_html_carte(classes, "Carte de Risque d'Incendie", description, PALETTE_RISQUE)
 
-        print(f"\n🎉 Export HTML terminé! Fichiers sauvegardés dans le dossier '{dossier_sortie}'")
-        print("Ouvrez les fichiers .html dans votre navigateur pour visualiser les résultats.")
+        chemin_html = os.path.join(dossier_sortie, "carte_de_risque.html")
+        with open(chemin_html, 'w', encoding='utf-8') as f:
+            f.write(html)
+        logger.info("✅ Fichier généré: %s", chemin_html)
+
+        chemin_npy = os.path.join(dossier_sortie, "carte_de_risque.npy")
+        np.save(chemin_npy, carte_risque)
+        logger.info("✅ Fichier généré: %s", chemin_npy)
+
+    def exporter_chronologie_html(self, ligne_depart: int = None, colonne_depart: int = None,
+                                  dossier_sortie: str = "exports_html", intervalle_ms: int = 200):
+        """
+        Exporte l'animation de la propagation dans chronologie_incendie.html, avec lecture, pause
+        et curseur d'étape
+
+        La carte initiale n'est stockée qu'une fois ; chaque étape n'ajoute que les indices (uint32)
+        des cases de son front, si bien que la taille du fichier croît avec le nombre d'arbres brûlés
+        et non avec étapes × surface. Le départ est tiré au hasard parmi les arbres s'il n'est pas donné.
+        """
+        if ligne_depart is None or colonne_depart is None:
+            position = self._choisir_arbre_aleatoire()
+            if position is None:
+                logger.error("Erreur: Aucun arbre sur la carte, pas d'incendie à animer.")
+                return None
+            ligne_depart, colonne_depart = position
+
+        carte_initiale = self.carte.copy()
+        self.instrumentation.compter('copies_carte')
+        fronts = []
+        decalages = [0]
+        for etape in self.propager_par_etapes(ligne_depart, colonne_depart):
+            front = etape['front']
+            fronts.append((front[:, 0] * self.largeur + front[:, 1]).astype('<u4'))
+            decalages.append(decalages[-1] + len(front))
+
+        def rgb(valeur):
+            couleur = PALETTE_CHRONOLOGIE[valeur][0]
+            return ','.join(str(int(couleur[k:k + 2], 16)) for k in (1, 3, 5))
+
+        nb_etapes = len(decalages) - 1
+        titre = "Chronologie de l'Incendie"
+        description = f"""
+        <strong>Propagation pas à pas :</strong><br>
+        • Position de départ : ({ligne_depart}, {colonne_depart})<br>
+        • Étapes de propagation : {nb_etapes - 1}<br>
+        • Arbres brûlés : {decalages[-1]}
+        """
+        attributs = (f' data-fronts="{"".join(_base64_par_morceaux(f.tobytes() for f in fronts))}"'
+                     f' data-decalages="{json.dumps(decalages)}"'
+                     f' data-feu="{rgb(TerrainType.FEU.value)}" data-brule="{rgb(TerrainType.BRULE.value)}"'
+                     f' data-intervalle="{intervalle_ms}"')
+
+        os.makedirs(dossier_sortie, exist_ok=True)
+        chemin_fichier = os.path.join(dossier_sortie, "chronologie_incendie.html")
+        with open(chemin_fichier, 'w', encoding='utf-8') as f:
+            f.write(self._html_entete(titre, STYLE_CHRONOLOGIE_HTML))
+            f.write(f"""
+    <div class="container">
+        <h1>{titre}</h1>
+        <div class="description">{description}</div>
+        <div class="controles">
+            <button id="lecture">▶ Lecture</button>
+            <input type="range" id="curseur-etape" min="0" max="{nb_etapes - 1}" value="0">
+            <span id="libelle-etape"></span>
+        </div>
+""")
+            for morceau in self._morceaux_html_canvas(carte_initiale, PALETTE_CHRONOLOGIE, attributs,
+                                                      classe="chronologie"):
+                f.write(morceau)
+            f.write(self._html_legende(PALETTE_CHRONOLOGIE))
+            f.write(self._html_pied(SCRIPT_CHRONOLOGIE_HTML))
+        logger.info("✅ Fichier généré: %s", chemin_fichier)
+        return chemin_fichier
+
+    def enregistrer_carte(self, chemin: str, compression: bool = True, taille_tuile: int = 256,
+                          inclure_resultats: bool = True):
+        """
+        Enregistre la carte et ses métadonnées (dimensions, graine, paramètres de génération) au
+        format .carte, avec la carte après incendie et les résultats de déboisement si
+        inclure_resultats. Sans compression, la carte peut ensuite être projetée en mémoire.
+        Contrairement à sauvegarder_carte, les erreurs sont levées et non affichées.
+        """
+        tableaux = {'carte': self.carte}
+        metadonnees = {'largeur': self.largeur, 'hauteur': self.hauteur, 'graine': self.graine}
+        if 'generation' in self.donnees_simulation:
+            metadonnees['generation'] = self.donnees_simulation['generation']
+        if inclure_resultats:
+            if self._carte_incendie is not None:
+                tableaux['carte_incendie'] = self._carte_incendie
+            for cle in ('resultats_deboisement', 'comparaison'):
+                if cle in self.donnees_simulation:
+                    metadonnees[cle] = self.donnees_simulation[cle]
+        ecrire_fichier_carte(chemin, tableaux, metadonnees, compression, taille_tuile)
+
+    def ouvrir_carte(self, chemin: str, mmap_mode: str = None) -> FichierCarte:
+        """
+        Charge une carte enregistrée par enregistrer_carte, et sa carte après incendie si présente
+
+        Avec mmap_mode ('r', 'r+' ou 'c'), une carte non compressée est projetée en mémoire et n'est
+        lue qu'à l'accès. Retourne le FichierCarte ouvert, pour lire d'autres fenêtres sans tout
+        charger. Les erreurs (fichier absent, format invalide) sont levées.
+        """
+        fichier = FichierCarte(chemin)
+        carte = fichier.lire('carte', mmap_mode)
+        if carte.ndim != 2 or carte.dtype != np.uint8:
+            raise ValueError(f"La carte de {chemin} doit être un tableau 2D uint8")
+
+        self.carte = carte
+        self._index_voisins = None
+        if 'carte_incendie' in fichier.tableaux:
+            self.carte_incendie = fichier.lire('carte_incendie', mmap_mode)
+        else:
+            self.carte_incendie = None
+
+        metadonnees = fichier.metadonnees
+        self.graine = metadonnees.get('graine')
+        self.rng = np.random.default_rng(self.graine)
+        self.donnees_simulation = {cle: metadonnees[cle] for cle in
+                                   ('generation', 'resultats_deboisement', 'comparaison') if cle in metadonnees}
+        # JSON ne connaît pas les tuples : rétablir les positions
+        resultats = self.donnees_simulation.get('resultats_deboisement', {})
+        for cle in ('position_deboisement', 'position_incendie'):
+            if resultats.get(cle) is not None:
+                resultats[cle] = tuple(resultats[cle])
+        return fichier
 
     def sauvegarder_carte(self, nom_fichier: str):
         """Sauvegarde la carte dans un fichier numpy"""
         np.save(nom_fichier, self.carte)
-        print(f"Carte sauvegardée dans {nom_fichier}.npy")
+        logger.info("Carte sauvegardée dans %s.npy", nom_fichier)
 
     def charger_carte(self, nom_fichier: str):
         """Charge une carte depuis un fichier numpy"""
         try:
-            self.carte = np.load(nom_fichier)
-            self.hauteur, self.largeur = self.carte.shape
-            print(f"Carte chargée depuis {nom_fichier}")
+            # Les anciens fichiers stockent la carte en entiers 64 bits : conversion vers uint8
+            self.carte = np.load(nom_fichier).astype(np.uint8, copy=False)
+            self._index_voisins = None
+            logger.info("Carte chargée depuis %s", nom_fichier)
         except FileNotFoundError:
-            print(f"Erreur: Fichier {nom_fichier} non trouvé")
+            logger.error("Erreur: Fichier %s non trouvé", nom_fichier)
         except Exception as e:
-            print(f"Erreur lors du chargement: {e}")
\ No newline at end of file
+            logger.error("Erreur lors du chargement: %s", e)
\ No newline at end of file
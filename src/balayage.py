@@ -0,0 +1,209 @@
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+from ForestFireSimulator import ForestFireSimulator
+
+# Colonnes des résultats, dans l'ordre du fichier CSV
+COLONNES = ['pourcentage_arbres', 'pourcentage_eau', 'graine', 'largeur', 'hauteur', 'moteur', 'deboisement',
+            'ligne_depart', 'colonne_depart', 'arbres_originaux', 'arbres_brules', 'pourcentage_brule',
+            'arbres_sauves', 'temps_generation', 'temps_simulation', 'temps_deboisement']
+
+
+def valeurs_balayees(entree) -> List[float]:
+    """Valeurs d'un axe du balayage : une liste, ou {"debut", "fin", "pas"} (fin incluse)"""
+    if isinstance(entree, dict):
+        pas = entree['pas']
+        if pas <= 0:
+            raise ValueError("Le pas du balayage doit être strictement positif")
+        nb_valeurs = int(np.floor((entree['fin'] - entree['debut']) / pas + 1e-9)) + 1
+        return [round(entree['debut'] + k * pas, 10) for k in range(nb_valeurs)]
+    return list(entree)
+
+
+def scenarios_du_balayage(specification: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Énumère les scénarios d'une spécification de balayage :
+    {"largeur", "hauteur", "pourcentages_arbres", "pourcentages_eau", "nb_graines",
+     "graine_initiale" (0), "moteur" ("vectorise"), "deboisement" (false)}
+    Les points dont la somme des pourcentages dépasse 100 sont ignorés.
+    """
+    graine_initiale = specification.get('graine_initiale', 0)
+    for pourcentage_arbres in valeurs_balayees(specification['pourcentages_arbres']):
+        for pourcentage_eau in valeurs_balayees(specification['pourcentages_eau']):
+            if pourcentage_arbres + pourcentage_eau > 100:
+                continue
+            for graine in range(graine_initiale, graine_initiale + specification['nb_graines']):
+                yield {
+                    'largeur': specification['largeur'],
+                    'hauteur': specification['hauteur'],
+                    'pourcentage_arbres': pourcentage_arbres,
+                    'pourcentage_eau': pourcentage_eau,
+                    'graine': graine,
+                    'moteur': specification.get('moteur', 'vectorise'),
+                    'deboisement': specification.get('deboisement', False)
+                }
+
+
+def cle_scenario(resultat: Dict[str, Any]) -> tuple:
+    """
+    Identifie un scénario dans le fichier de résultats (pour la reprise) : un résultat obtenu avec
+    d'autres dimensions, un autre moteur ou sans déboisement ne compte pas. Les valeurs relues d'un
+    CSV sont des chaînes, d'où les conversions ; un résultat sans moteur ni déboisement (fichier
+    d'une version précédente) n'est jamais repris.
+    """
+    return (float(resultat['pourcentage_arbres']), float(resultat['pourcentage_eau']), int(resultat['graine']),
+            int(resultat['largeur']), int(resultat['hauteur']), resultat.get('moteur'),
+            str(resultat.get('deboisement')) == 'True')
+
+
+def executer_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Génère la carte d'un scénario, y démarre un incendie sur un arbre tiré au hasard et mesure chaque étape"""
+    simulateur = ForestFireSimulator(largeur=scenario['largeur'], hauteur=scenario['hauteur'],
+                                     graine=scenario['graine'])
+    simulateur.affichage_console = False
+    resultat = {cle: scenario[cle] for cle in ('pourcentage_arbres', 'pourcentage_eau', 'graine', 'largeur', 'hauteur',
+                                               'moteur', 'deboisement')}
+
+    debut = time.perf_counter()
+    simulateur.generer_carte_aleatoire(scenario['pourcentage_arbres'], scenario['pourcentage_eau'])
+    resultat['temps_generation'] = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    stats = simulateur.simuler_incendie(moteur=scenario['moteur'])
+    resultat['temps_simulation'] = time.perf_counter() - debut
+
+    position = stats['position_depart']
+    resultat['ligne_depart'], resultat['colonne_depart'] = position if position is not None else (None, None)
+    resultat['arbres_originaux'] = int(stats['arbres_originaux'])
+    resultat['arbres_brules'] = int(stats['arbres_brules'])
+    resultat['pourcentage_brule'] = float(stats['pourcentage_brule'])
+
+    resultat['arbres_sauves'] = None
+    resultat['temps_deboisement'] = None
+    if scenario['deboisement'] and position is not None:
+        debut = time.perf_counter()
+        deboisement = simulateur.trouver_meilleure_case_a_deboiser(*position)
+        resultat['temps_deboisement'] = time.perf_counter() - debut
+        # Sans autre arbre à déboiser (carte d'un seul arbre...), le scénario garde arbres_sauves à None
+        if 'erreur' not in deboisement:
+            resultat['arbres_sauves'] = int(deboisement['arbres_sauves'])
+    return resultat
+
+
+def executer_lot(scenarios: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Tâche d'un processus : un lot de scénarios, pour amortir le coût de chaque envoi"""
+    return [executer_scenario(scenario) for scenario in scenarios]
+
+
+class FichierResultats:
+    """
+    Fichier de résultats en ajout, CSV ou JSONL selon l'extension, vidé après chaque lot
+
+    À l'ouverture, les résultats déjà présents sont relus pour la reprise ; une dernière ligne
+    incomplète (balayage interrompu pendant une écriture) est retirée du fichier.
+    """
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        self.format_csv = chemin.endswith('.csv')
+        self.termines = set()
+        if os.path.exists(chemin):
+            self._relire()
+        self.fichier = open(chemin, 'a', encoding='utf-8', newline='')
+        if self.format_csv:
+            self.ecrivain = csv.DictWriter(self.fichier, fieldnames=COLONNES)
+            if self.fichier.tell() == 0:
+                self.ecrivain.writeheader()
+
+    def _relire(self):
+        with open(self.chemin, 'r', encoding='utf-8', newline='') as f:
+            contenu = f.read()
+        complet = contenu[:contenu.rfind('\n') + 1]
+        if len(complet) != len(contenu):
+            with open(self.chemin, 'w', encoding='utf-8', newline='') as f:
+                f.write(complet)
+
+        lignes = complet.splitlines()
+        if self.format_csv:
+            lecteur = csv.DictReader(lignes)
+            if lecteur.fieldnames is not None and lecteur.fieldnames != COLONNES:
+                raise ValueError(f"Les colonnes de {self.chemin} ne sont pas celles des résultats: reprise impossible")
+            for resultat in lecteur:
+                self.termines.add(cle_scenario(resultat))
+        else:
+            for ligne in lignes:
+                if ligne.strip():
+                    self.termines.add(cle_scenario(json.loads(ligne)))
+
+    def ecrire(self, resultats: List[Dict[str, Any]]):
+        for resultat in resultats:
+            if self.format_csv:
+                self.ecrivain.writerow(resultat)
+            else:
+                self.fichier.write(json.dumps(resultat) + '\n')
+            self.termines.add(cle_scenario(resultat))
+        self.fichier.flush()
+
+    def fermer(self):
+        self.fichier.close()
+
+
+def executer_balayage(specification: Dict[str, Any], chemin_sortie: str, nb_processus: int = None,
+                      taille_lot: int = 16) -> int:
+    """
+    Exécute les scénarios pas encore présents dans chemin_sortie sur un groupe de processus
+
+    Les scénarios partent par lots de taille_lot, avec au plus deux lots en attente par
+    processus : la mémoire ne dépend pas de la taille du balayage. Chaque lot terminé est écrit
+    aussitôt. Retourne le nombre de scénarios exécutés.
+    """
+    nb_processus = nb_processus or os.cpu_count() or 1
+    sortie = FichierResultats(chemin_sortie)
+    restants = (scenario for scenario in scenarios_du_balayage(specification)
+                if cle_scenario(scenario) not in sortie.termines)
+    nb_executes = 0
+    try:
+        with ProcessPoolExecutor(max_workers=nb_processus) as executeur:
+            en_cours = set()
+            while True:
+                lot = list(islice(restants, taille_lot))
+                if lot:
+                    en_cours.add(executeur.submit(executer_lot, lot))
+                if en_cours and (not lot or len(en_cours) >= 2 * nb_processus):
+                    termines, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+                    for tache in termines:
+                        resultats = tache.result()
+                        sortie.ecrire(resultats)
+                        nb_executes += len(resultats)
+                if not lot and not en_cours:
+                    break
+    finally:
+        sortie.fermer()
+    return nb_executes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Balayage des pourcentages d'arbres et d'eau sur plusieurs graines")
+    parser.add_argument("specification", help="fichier JSON de la spécification du balayage")
+    parser.add_argument("--sortie", default="balayage.jsonl", help="fichier de résultats (.jsonl ou .csv)")
+    parser.add_argument("--processus", type=int, default=None, help="nombre de processus (défaut : un par cœur)")
+    parser.add_argument("--taille-lot", type=int, default=16, help="scénarios envoyés ensemble à un processus")
+    arguments = parser.parse_args()
+
+    with open(arguments.specification, 'r', encoding='utf-8') as f:
+        specification = json.load(f)
+
+    print("🌲 BALAYAGE DES DENSITÉS 🔥")
+    print("=" * 50)
+    debut = time.perf_counter()
+    nb_executes = executer_balayage(specification, arguments.sortie, arguments.processus, arguments.taille_lot)
+    print(f"{nb_executes} scénario(s) exécuté(s) en {time.perf_counter() - debut:.1f} s")
+    print(f"Résultats dans {arguments.sortie}")
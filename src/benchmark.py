@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from ForestFireSimulator import ForestFireSimulator, TerrainType
+
+# Seuil de percolation des sites pour le voisinage à 8 cases : environ 40,7 % d'arbres
+TAILLES_DEFAUT = (50, 250, 1000, 4000)
+DENSITES_DEFAUT = (35.0, 40.7, 45.0, 60.0)
+
+
+def position_centrale(simulateur: ForestFireSimulator) -> Tuple[int, int]:
+    """Arbre le plus proche du centre de la carte (départ identique d'une exécution à l'autre)"""
+    arbres = np.argwhere(simulateur.carte == TerrainType.ARBRE.value)
+    if len(arbres) == 0:
+        return simulateur.hauteur // 2, simulateur.largeur // 2
+    centre = np.array([simulateur.hauteur / 2, simulateur.largeur / 2])
+    return tuple(int(v) for v in arbres[np.argmin(np.sum((arbres - centre) ** 2, axis=1))])
+
+
+def _preparer_simulation_complete(simulateur: ForestFireSimulator, densite: float, position, dossier: str):
+    simulateur.simulation_complete_avec_deboisement(*position)
+
+
+def _preparer_chargement(simulateur: ForestFireSimulator, densite: float, position, dossier: str):
+    simulateur.sauvegarder_carte(os.path.join(dossier, "carte"))
+
+
+# Nom -> (préparation non mesurée, opération mesurée) ; les deux reçoivent un simulateur dont la
+# carte est déjà générée, la densité, la position de départ et un dossier temporaire
+OPERATIONS: Dict[str, Tuple[Callable, Callable]] = {
+    'generer_carte_aleatoire': (None, lambda s, densite, p, d: s.generer_carte_aleatoire(densite, 0)),
+    'simuler_incendie_bfs': (None, lambda s, densite, p, d: s.simuler_incendie(*p, moteur='bfs')),
+    'simuler_incendie_vectorise': (None, lambda s, densite, p, d: s.simuler_incendie(*p, moteur='vectorise')),
+    'trouver_meilleure_case_a_deboiser': (None, lambda s, densite, p, d: s.trouver_meilleure_case_a_deboiser(*p)),
+    'simulation_complete_avec_deboisement': (None, lambda s, densite, p, d:
+                                             s.simulation_complete_avec_deboisement(*p)),
+    'generer_html_carte': (None, lambda s, densite, p, d: s._generer_html_carte(s.carte, "Benchmark")),
+    'exporter_html': (_preparer_simulation_complete, lambda s, densite, p, d: s.exporter_html(d)),
+    'sauvegarder_carte': (None, lambda s, densite, p, d: s.sauvegarder_carte(os.path.join(d, "carte"))),
+    'charger_carte': (_preparer_chargement, lambda s, densite, p, d: s.charger_carte(os.path.join(d, "carte.npy")))
+}
+
+
+def mesurer_cas(operation: str, taille: int, densite: float, repetitions: int) -> Dict[str, float]:
+    """
+    Meilleur temps sur plusieurs répétitions, puis pic de mémoire (tracemalloc) sur une exécution
+    à part, tracemalloc ralentissant les allocations
+    """
+    preparation, mesuree = OPERATIONS[operation]
+    simulateur = ForestFireSimulator(largeur=taille, hauteur=taille, graine=0)
+    simulateur.affichage_console = False
+
+    with tempfile.TemporaryDirectory() as dossier:
+        simulateur.generer_carte_aleatoire(densite, 0)
+        carte = simulateur.carte.copy()
+        position = position_centrale(simulateur)
+        if preparation is not None:
+            preparation(simulateur, densite, position, dossier)
+
+        meilleur = float('inf')
+        for _ in range(repetitions):
+            # Certaines opérations remplacent la carte : chaque mesure repart de la même
+            with simulateur.modification_carte() as tableau:
+                tableau[...] = carte
+            debut = time.perf_counter()
+            mesuree(simulateur, densite, position, dossier)
+            meilleur = min(meilleur, time.perf_counter() - debut)
+
+        with simulateur.modification_carte() as tableau:
+            tableau[...] = carte
+        tracemalloc.start()
+        try:
+            depart = tracemalloc.get_traced_memory()[0]
+            mesuree(simulateur, densite, position, dossier)
+            pic = tracemalloc.get_traced_memory()[1] - depart
+        finally:
+            tracemalloc.stop()
+
+    return {'temps': meilleur, 'memoire_pic': pic}
+
+
+def comparer(resultats: Dict[str, dict], reference: Dict[str, dict], tolerance_temps: float,
+             tolerance_memoire: float, ecart_temps_minimal: float = 1e-3) -> list:
+    """
+    Retourne les régressions (cas, mesure, valeur de référence, valeur actuelle) ; un écart de
+    temps inférieur à ecart_temps_minimal n'en est jamais une (bruit de mesure des cas très courts)
+    """
+    regressions = []
+    for cas, mesures in resultats.items():
+        if cas not in reference:
+            continue
+        for mesure, tolerance, ecart_minimal in (('temps', tolerance_temps, ecart_temps_minimal),
+                                                 ('memoire_pic', tolerance_memoire, 0)):
+            avant, apres = reference[cas][mesure], mesures[mesure]
+            if apres > avant * (1 + tolerance) and apres - avant > ecart_minimal:
+                regressions.append((cas, mesure, avant, apres))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesure le temps et le pic de mémoire des points d'entrée publics")
+    parser.add_argument("--tailles", type=int, nargs='+', default=list(TAILLES_DEFAUT), help="côtés des cartes")
+    parser.add_argument("--densites", type=float, nargs='+', default=list(DENSITES_DEFAUT),
+                        help="pourcentages d'arbres (sans eau)")
+    parser.add_argument("--operations", nargs='+', default=list(OPERATIONS), choices=list(OPERATIONS))
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--reference", default="benchmark_reference.json", help="fichier JSON de référence")
+    parser.add_argument("--enregistrer", action="store_true", help="écrit les mesures comme nouvelle référence")
+    parser.add_argument("--tolerance-temps", type=float, default=0.25, help="régression tolérée (0.25 = +25 %%)")
+    parser.add_argument("--tolerance-memoire", type=float, default=0.10)
+    parser.add_argument("--ecart-temps-minimal", type=float, default=1e-3,
+                        help="écart de temps (s) en dessous duquel aucune régression n'est signalée")
+    arguments = parser.parse_args()
+
+    print("🌲 BENCHMARK DU SIMULATEUR 🔥")
+    print("=" * 50)
+    print(f"{'Cas':<55} {'Temps (s)':>10} {'Mémoire (Mo)':>13}")
+
+    resultats = {}
+    for taille in arguments.tailles:
+        for densite in arguments.densites:
+            for operation in arguments.operations:
+                cas = f"{operation}/{taille}/{densite:g}"
+                resultats[cas] = mesurer_cas(operation, taille, densite, arguments.repetitions)
+                print(f"{cas:<55} {resultats[cas]['temps']:>10.4f} {resultats[cas]['memoire_pic'] / 2 ** 20:>13.2f}")
+
+    if arguments.enregistrer:
+        with open(arguments.reference, 'w', encoding='utf-8') as f:
+            json.dump({
+                'date': datetime.now().isoformat(timespec='seconds'),
+                'environnement': {'python': platform.python_version(), 'numpy': np.__version__,
+                                  'machine': platform.machine(), 'processeur': platform.processor()},
+                'cas': resultats
+            }, f, indent=2)
+        print(f"\nRéférence enregistrée dans {arguments.reference}")
+        sys.exit(0)
+
+    if not os.path.exists(arguments.reference):
+        print(f"\nPas de référence ({arguments.reference}) : relancer avec --enregistrer pour en créer une")
+        sys.exit(0)
+
+    with open(arguments.reference, 'r', encoding='utf-8') as f:
+        reference = json.load(f)['cas']
+    regressions = comparer(resultats, reference, arguments.tolerance_temps, arguments.tolerance_memoire,
+                           arguments.ecart_temps_minimal)
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) au-delà de la tolérance :")
+        for cas, mesure, avant, apres in regressions:
+            print(f"- {cas} [{mesure}] : {avant:.4g} -> {apres:.4g} ({(apres / avant - 1) * 100:+.0f}%)")
+        sys.exit(1)
+    print(f"\n✅ Aucune régression par rapport à {arguments.reference}")
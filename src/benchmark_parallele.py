@@ -0,0 +1,48 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from ForestFireSimulator import ForestFireSimulator, TerrainType
+
+
+def mesurer(simulateur: ForestFireSimulator, ligne: int, colonne: int, moteur: str, repetitions: int) -> float:
+    """Meilleur temps (en secondes) de simuler_incendie sur plusieurs répétitions"""
+    meilleur = float('inf')
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        simulateur.simuler_incendie(ligne, colonne, moteur=moteur)
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesure le passage à l'échelle du moteur 'parallele' de 1 à N processus")
+    parser.add_argument("--taille", type=int, default=3000, help="côté de la carte carrée")
+    parser.add_argument("--pourcentage-arbres", type=float, default=59.0)
+    parser.add_argument("--max-processus", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--graine", type=int, default=0)
+    arguments = parser.parse_args()
+
+    print("🌲 PASSAGE À L'ÉCHELLE DU MOTEUR PARALLÈLE 🔥")
+    print("=" * 50)
+
+    simulateur = ForestFireSimulator(largeur=arguments.taille, hauteur=arguments.taille, graine=arguments.graine)
+    simulateur.generer_carte_aleatoire(pourcentage_arbres=arguments.pourcentage_arbres, pourcentage_eau=0)
+    ligne, colonne = (int(v) for v in np.argwhere(simulateur.carte == TerrainType.ARBRE.value)[0])
+    print(f"Carte {arguments.taille} × {arguments.taille}, {arguments.pourcentage_arbres}% d'arbres, "
+          f"départ ({ligne}, {colonne})")
+
+    reference = mesurer(simulateur, ligne, colonne, 'vectorise', arguments.repetitions)
+    print(f"\nMoteur 'vectorise' (un cœur): {reference:.3f} s")
+
+    print(f"\n{'Processus':>10} {'Temps (s)':>10} {'Accélération':>13} {'Efficacité':>11}")
+    temps_un = None
+    for nb_processus in range(1, arguments.max_processus + 1):
+        simulateur.nb_processus = nb_processus
+        temps = mesurer(simulateur, ligne, colonne, 'parallele', arguments.repetitions)
+        temps_un = temps_un or temps
+        acceleration = temps_un / temps
+        print(f"{nb_processus:>10} {temps:>10.3f} {acceleration:>12.2f}x {acceleration / nb_processus:>10.0%}")
@@ -1,6 +1,12 @@
+import logging
+import sys
+
 from ForestFireSimulator import ForestFireSimulator
 
 if __name__ == "__main__":
+    # Le simulateur écrit dans son journal, silencieux par défaut : l'afficher dans la console
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     print("🌲 SIMULATEUR DE FEUX DE FORÊT 🔥")
     print("=" * 50)
 
@@ -0,0 +1,332 @@
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ForestFireSimulator import ForestFireSimulator, TerrainType
+from balayage import executer_scenario
+
+TYPES_REQUETES = ('incendie', 'deboisement', 'balayage', 'etat')
+
+
+def _en_json(valeur):
+    """Conversion des types NumPy des résultats pour json.dumps"""
+    if isinstance(valeur, np.generic):
+        return valeur.item()
+    if isinstance(valeur, np.ndarray):
+        return valeur.tolist()
+    raise TypeError(f"Type non sérialisable en JSON: {type(valeur).__name__}")
+
+
+class SortieJSONL:
+    """Flux texte où écrire les réponses, une ligne JSON chacune, vidé après chaque réponse"""
+
+    def __init__(self, flux, fermer_a_la_fin: bool = False):
+        self.flux = flux
+        self.fermer_a_la_fin = fermer_a_la_fin
+        self.verrou = threading.Lock()
+
+    def ecrire(self, reponse: Dict[str, Any]):
+        ligne = json.dumps(reponse, default=_en_json, ensure_ascii=False) + '\n'
+        with self.verrou:
+            try:
+                self.flux.write(ligne)
+                self.flux.flush()
+            except (OSError, ValueError):
+                pass  # Client parti : ses réponses sont perdues, le travailleur continue
+
+    def fermer(self):
+        if self.fermer_a_la_fin:
+            with self.verrou:
+                try:
+                    self.flux.close()
+                except OSError:
+                    pass
+
+
+class Travailleur:
+    """
+    Traite des lots de requêtes en gardant chaudes les cartes déjà chargées : chaque carte garde
+    son simulateur, avec son index des composantes et son cache de résultats, tant qu'elle est
+    parmi les nb_cartes_max dernières utilisées et que son fichier n'a pas changé.
+
+    Requêtes (objets JSON, "id" libre renvoyé tel quel) :
+    - {"type": "incendie", "carte", "ligne", "colonne"} : arbres brûlés depuis la case
+    - {"type": "deboisement", "carte", "ligne", "colonne", "methode" ("articulation"), "budget" (1)}
+    - {"type": "balayage", ...} : un point de balayage, champs du scénario de balayage.py
+      ("moteur" : "vectorise" et "deboisement" : false par défaut)
+    - {"type": "etat"} : compteurs du travailleur et des caches
+    "carte" est le chemin d'un fichier .carte (enregistrer_carte) ou .npy (sauvegarder_carte).
+    """
+
+    def __init__(self, nb_cartes_max: int = 8, memoire_cache: int = 64 * 2 ** 20):
+        self.nb_cartes_max = nb_cartes_max
+        self.memoire_cache = memoire_cache
+        self.cartes = OrderedDict()  # chemin -> (date de modification du fichier, simulateur)
+        self.nb_requetes = 0
+        self.nb_lots = 0
+        self.nb_chargements = 0
+
+    def simulateur(self, chemin: str) -> ForestFireSimulator:
+        """Simulateur de la carte, chargé au premier usage ou quand le fichier a changé"""
+        date = os.stat(chemin).st_mtime_ns
+        chaude = self.cartes.get(chemin)
+        if chaude is not None and chaude[0] == date:
+            self.cartes.move_to_end(chemin)
+            return chaude[1]
+
+        if chemin.endswith('.npy'):
+            # charger_carte journalise ses erreurs sans les lever : lecture directe pour les renvoyer
+            carte = np.load(chemin)
+            if carte.ndim != 2:
+                raise ValueError(f"La carte de {chemin} doit être un tableau 2D")
+            simulateur = ForestFireSimulator()
+            simulateur.carte = carte.astype(np.uint8, copy=False)
+        else:
+            simulateur = ForestFireSimulator()
+            simulateur.ouvrir_carte(chemin)
+        simulateur.affichage_console = False
+        simulateur.activer_cache(self.memoire_cache)
+        simulateur.index_composantes()
+
+        self.cartes[chemin] = (date, simulateur)
+        self.cartes.move_to_end(chemin)
+        while len(self.cartes) > self.nb_cartes_max:
+            self.cartes.popitem(last=False)
+        self.nb_chargements += 1
+        return simulateur
+
+    @staticmethod
+    def _depart(simulateur: ForestFireSimulator, requete: Dict[str, Any]) -> Tuple[int, int]:
+        ligne, colonne = int(requete['ligne']), int(requete['colonne'])
+        if not (0 <= ligne < simulateur.hauteur and 0 <= colonne < simulateur.largeur):
+            raise ValueError(f"Position ({ligne}, {colonne}) hors de la carte")
+        if simulateur.carte[ligne, colonne] != TerrainType.ARBRE.value:
+            raise ValueError(f"Pas d'arbre à la position de départ ({ligne}, {colonne})")
+        return ligne, colonne
+
+    def traiter(self, requete: Dict[str, Any], simulateur: ForestFireSimulator = None) -> Dict[str, Any]:
+        """Résultat d'une requête ; simulateur est celui de sa carte, déjà obtenu pour le lot"""
+        type_requete = requete.get('type')
+        if type_requete not in TYPES_REQUETES:
+            raise ValueError(f"Type de requête inconnu: {type_requete} (attendu: {', '.join(TYPES_REQUETES)})")
+
+        if type_requete == 'balayage':
+            scenario = {'moteur': 'vectorise', 'deboisement': False}
+            scenario.update({cle: valeur for cle, valeur in requete.items() if cle not in ('id', 'type')})
+            return executer_scenario(scenario)
+
+        if type_requete == 'etat':
+            return {
+                'requetes': self.nb_requetes,
+                'lots': self.nb_lots,
+                'chargements': self.nb_chargements,
+                'cartes': {chemin: simulateur.cache.statistiques() for chemin, (_, simulateur) in self.cartes.items()}
+            }
+
+        if simulateur is None:
+            simulateur = self.simulateur(requete['carte'])
+        ligne, colonne = self._depart(simulateur, requete)
+
+        if type_requete == 'incendie':
+            # Taille de la composante du départ, lue dans l'index gardé à jour
+            arbres_brules = simulateur.arbres_brules_depuis(ligne, colonne)
+            arbres_originaux = int(simulateur.comptes_terrain()[TerrainType.ARBRE.value])
+            return {
+                'arbres_brules': arbres_brules,
+                'arbres_originaux': arbres_originaux,
+                'pourcentage_brule': arbres_brules / arbres_originaux * 100,
+                'position_depart': (ligne, colonne)
+            }
+
+        budget = int(requete.get('budget', 1))
+        if budget == 1:
+            resultat = simulateur.trouver_meilleure_case_a_deboiser(ligne, colonne,
+                                                                   methode=requete.get('methode', 'articulation'))
+        else:
+            resultat = simulateur.trouver_meilleurs_deboisements(ligne, colonne, budget)
+        if 'erreur' in resultat:
+            raise ValueError(resultat['erreur'])
+        return resultat
+
+    def traiter_lot(self, lot: List[Tuple[str, float, SortieJSONL]]):
+        """
+        Traite un lot de (ligne reçue, instant de réception, sortie) : les requêtes sont regroupées
+        par carte, dans l'ordre de leur première apparition, et chaque carte n'est cherchée qu'une
+        fois. Chaque réponse part dès qu'elle est prête, avec son temps de calcul et sa latence
+        depuis la réception, en millisecondes. Une ligne None annonce la fin d'une sortie.
+        """
+        self.nb_lots += 1
+        groupes = OrderedDict()
+        fermetures = []
+        for ligne, recue, sortie in lot:
+            if ligne is None:
+                fermetures.append(sortie)
+                continue
+            try:
+                requete = json.loads(ligne)
+                if not isinstance(requete, dict):
+                    raise ValueError("La requête doit être un objet JSON")
+            except ValueError as erreur:
+                self._repondre(sortie, {'id': None, 'ok': False, 'erreur': f"Requête invalide: {erreur}"},
+                               recue, recue)
+                continue
+            carte = requete.get('carte') if requete.get('type') in ('incendie', 'deboisement') else None
+            groupes.setdefault(carte, []).append((requete, recue, sortie))
+
+        for carte, requetes in groupes.items():
+            simulateur, erreur_carte = None, None
+            if carte is not None:
+                try:
+                    simulateur = self.simulateur(carte)
+                except Exception as erreur:
+                    erreur_carte = f"{type(erreur).__name__}: {erreur}"
+            for requete, recue, sortie in requetes:
+                debut = time.perf_counter()
+                self.nb_requetes += 1
+                reponse = {'id': requete.get('id')}
+                if erreur_carte is not None:
+                    reponse.update(ok=False, erreur=erreur_carte)
+                else:
+                    try:
+                        reponse.update(ok=True, resultat=self.traiter(requete, simulateur))
+                    except Exception as erreur:
+                        reponse.update(ok=False, erreur=f"{type(erreur).__name__}: {erreur}")
+                self._repondre(sortie, reponse, recue, debut)
+
+        for sortie in fermetures:
+            sortie.fermer()
+
+    @staticmethod
+    def _repondre(sortie: SortieJSONL, reponse: Dict[str, Any], recue: float, debut: float):
+        fin = time.perf_counter()
+        reponse['calcul_ms'] = (fin - debut) * 1000
+        reponse['latence_ms'] = (fin - recue) * 1000
+        sortie.ecrire(reponse)
+
+
+def lire_flux(flux, sortie: SortieJSONL, entrees: queue.Queue, fin_des_entrees: bool):
+    """
+    Met chaque ligne non vide du flux dans la file avec son instant de réception ; à la fin du
+    flux, annonce la fin de la sortie, et celle de toutes les entrées si fin_des_entrees
+    """
+    for ligne in flux:
+        if ligne.strip():
+            entrees.put((ligne, time.perf_counter(), sortie))
+    entrees.put((None, time.perf_counter(), sortie))
+    if fin_des_entrees:
+        entrees.put(None)
+
+
+def servir(entrees: queue.Queue, travailleur: Travailleur, taille_lot: int = 64, attente: float = 0.002):
+    """
+    Boucle du travailleur : attend une requête, puis complète le lot avec celles déjà arrivées ou
+    qui arrivent dans les attente secondes, jusqu'à taille_lot. S'arrête sur l'élément None.
+    """
+    while True:
+        element = entrees.get()
+        if element is None:
+            return
+        lot = [element]
+        limite = time.perf_counter() + attente
+        while len(lot) < taille_lot:
+            try:
+                element = entrees.get(timeout=max(0.0, limite - time.perf_counter()))
+            except queue.Empty:
+                break
+            if element is None:
+                travailleur.traiter_lot(lot)
+                return
+            lot.append(element)
+        travailleur.traiter_lot(lot)
+
+
+def servir_flux(flux_entree, flux_sortie, travailleur: Travailleur = None, taille_lot: int = 64,
+                attente: float = 0.002) -> Travailleur:
+    """Sert les requêtes d'un flux texte (l'entrée standard) jusqu'à sa fin, réponses dans flux_sortie"""
+    travailleur = travailleur or Travailleur()
+    entrees = queue.Queue()
+    lecteur = threading.Thread(target=lire_flux, args=(flux_entree, SortieJSONL(flux_sortie), entrees, True),
+                               daemon=True)
+    lecteur.start()
+    servir(entrees, travailleur, taille_lot, attente)
+    return travailleur
+
+
+class ServeurSocket:
+    """
+    Sert les requêtes reçues sur une socket Unix : un fil de lecture par connexion, un seul fil
+    de calcul pour toutes (les cartes chaudes sont partagées), réponses sur la connexion d'origine
+    """
+
+    def __init__(self, chemin: str, travailleur: Travailleur = None, taille_lot: int = 64, attente: float = 0.002):
+        self.chemin = chemin
+        self.travailleur = travailleur or Travailleur()
+        self.taille_lot = taille_lot
+        self.attente = attente
+        self.entrees = queue.Queue()
+        if os.path.exists(chemin):
+            os.remove(chemin)
+        self.ecoute = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.ecoute.bind(chemin)
+        self.ecoute.listen()
+
+    def _accepter(self):
+        while True:
+            try:
+                connexion, _ = self.ecoute.accept()
+            except OSError:
+                return  # Socket d'écoute fermée par arreter
+            sortie = SortieJSONL(connexion.makefile('w', encoding='utf-8'), fermer_a_la_fin=True)
+            lecture = connexion.makefile('r', encoding='utf-8')
+            threading.Thread(target=lire_flux, args=(lecture, sortie, self.entrees, False), daemon=True).start()
+
+    def servir(self):
+        """Sert jusqu'à l'appel d'arreter (depuis un autre fil)"""
+        threading.Thread(target=self._accepter, daemon=True).start()
+        servir(self.entrees, self.travailleur, self.taille_lot, self.attente)
+
+    def arreter(self):
+        self.ecoute.close()
+        self.entrees.put(None)
+        if os.path.exists(self.chemin):
+            os.remove(self.chemin)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Travailleur persistant : requêtes JSON par ligne, réponses JSON "
+                                                 "par ligne, sur l'entrée et la sortie standard ou une socket Unix")
+    parser.add_argument("--socket", default=None, help="chemin d'une socket Unix à écouter (défaut : entrée standard)")
+    parser.add_argument("--taille-lot", type=int, default=64, help="requêtes traitées ensemble au plus")
+    parser.add_argument("--attente-ms", type=float, default=2.0, help="attente maximale pour compléter un lot")
+    parser.add_argument("--max-cartes", type=int, default=8, help="cartes gardées chargées")
+    parser.add_argument("--memoire-cache", type=float, default=64, help="cache de résultats par carte (Mo)")
+    parser.add_argument("--journal", default=None, choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="niveau du journal du simulateur, écrit sur la sortie d'erreur")
+    arguments = parser.parse_args()
+
+    # La sortie standard porte les réponses : le journal ne peut aller que sur la sortie d'erreur
+    if arguments.journal:
+        logging.basicConfig(level=arguments.journal, stream=sys.stderr,
+                            format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    travailleur = Travailleur(arguments.max_cartes, int(arguments.memoire_cache * 2 ** 20))
+    if arguments.socket is None:
+        servir_flux(sys.stdin, sys.stdout, travailleur, arguments.taille_lot, arguments.attente_ms / 1000)
+    else:
+        serveur = ServeurSocket(arguments.socket, travailleur, arguments.taille_lot, arguments.attente_ms / 1000)
+        try:
+            serveur.servir()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            serveur.arreter()
@@ -0,0 +1,90 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from src.balayage import executer_balayage, scenarios_du_balayage, valeurs_balayees
+
+
+class TestBalayage(unittest.TestCase):
+    def setUp(self):
+        self.specification = {
+            'largeur': 12,
+            'hauteur': 10,
+            'pourcentages_arbres': {'debut': 50, 'fin': 60, 'pas': 5},
+            'pourcentages_eau': [0, 45],
+            'nb_graines': 4
+        }
+
+    def test_scenarios_du_balayage(self):
+        self.assertEqual(valeurs_balayees({'debut': 50, 'fin': 60, 'pas': 5}), [50, 55, 60])
+        scenarios = list(scenarios_du_balayage(self.specification))
+        # 60 + 45 > 100 : ce point est ignoré
+        self.assertEqual(len(scenarios), 5 * 4)
+        self.assertEqual({s['graine'] for s in scenarios}, {0, 1, 2, 3})
+
+    def test_executer_balayage_jsonl_et_reprise(self):
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, "resultats.jsonl")
+            self.assertEqual(executer_balayage(self.specification, chemin, nb_processus=2, taille_lot=3), 20)
+            with open(chemin, encoding='utf-8') as f:
+                lignes = f.readlines()
+            self.assertEqual(len(lignes), 20)
+            resultat = json.loads(lignes[0])
+            self.assertLessEqual(resultat['arbres_brules'], resultat['arbres_originaux'])
+            self.assertIn('temps_simulation', resultat)
+
+            # Interruption pendant l'écriture de la 8e ligne : seule la ligne incomplète est refaite
+            with open(chemin, 'w', encoding='utf-8') as f:
+                f.writelines(lignes[:7])
+                f.write(lignes[7][:10])
+            self.assertEqual(executer_balayage(self.specification, chemin, nb_processus=1), 13)
+            with open(chemin, encoding='utf-8') as f:
+                reprises = [json.loads(ligne) for ligne in f]
+            cles = sorted((r['pourcentage_arbres'], r['pourcentage_eau'], r['graine']) for r in reprises)
+            self.assertEqual(len(set(cles)), 20)
+            self.assertEqual(len(cles), 20)
+            # Mêmes graines, mêmes résultats
+            identiques = {(r['pourcentage_arbres'], r['pourcentage_eau'], r['graine']): r['arbres_brules']
+                          for r in map(json.loads, lignes)}
+            for r in reprises:
+                self.assertEqual(identiques[r['pourcentage_arbres'], r['pourcentage_eau'], r['graine']],
+                                 r['arbres_brules'])
+
+            # D'autres dimensions sont d'autres scénarios : rien n'est repris
+            self.specification['largeur'] = 8
+            self.assertEqual(executer_balayage(self.specification, chemin, nb_processus=1), 20)
+
+    def test_executer_balayage_csv(self):
+        self.specification['deboisement'] = True
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, "resultats.csv")
+            executer_balayage(self.specification, chemin, nb_processus=1)
+            self.assertEqual(executer_balayage(self.specification, chemin, nb_processus=1), 0)
+            self.specification['moteur'] = 'bfs'
+            self.assertEqual(executer_balayage(self.specification, chemin, nb_processus=1), 20)
+            with open(chemin, encoding='utf-8', newline='') as f:
+                resultats = list(csv.DictReader(f))
+        self.assertEqual(len(resultats), 40)
+        self.assertTrue(all(r['arbres_sauves'] != '' for r in resultats if int(r['arbres_originaux']) > 0))
+        self.assertEqual({r['moteur'] for r in resultats}, {'vectorise', 'bfs'})
+
+    def test_executer_balayage_un_seul_arbre(self):
+        # 1 % de 10 x 10 : un seul arbre, rien à déboiser, sans interrompre le balayage
+        specification = {'largeur': 10, 'hauteur': 10, 'pourcentages_arbres': [1, 50], 'pourcentages_eau': [0],
+                         'nb_graines': 2, 'deboisement': True}
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin = os.path.join(dossier, "resultats.jsonl")
+            self.assertEqual(executer_balayage(specification, chemin, nb_processus=1, taille_lot=4), 4)
+            with open(chemin, encoding='utf-8') as f:
+                resultats = [json.loads(ligne) for ligne in f]
+        for resultat in resultats:
+            if resultat['pourcentage_arbres'] == 1:
+                self.assertEqual(resultat['arbres_originaux'], 1)
+                self.assertIsNone(resultat['arbres_sauves'])
+            else:
+                self.assertIsNotNone(resultat['arbres_sauves'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+from src.benchmark import OPERATIONS, comparer, mesurer_cas
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_mesurer_cas_toutes_operations(self):
+        for operation in OPERATIONS:
+            mesures = mesurer_cas(operation, taille=20, densite=40.7, repetitions=1)
+            self.assertGreater(mesures['temps'], 0)
+            self.assertGreaterEqual(mesures['memoire_pic'], 0)
+
+    def test_comparer_tolerances(self):
+        reference = {'a': {'temps': 1.0, 'memoire_pic': 1000}, 'b': {'temps': 1e-4, 'memoire_pic': 10}}
+        resultats = {'a': {'temps': 1.2, 'memoire_pic': 1050}, 'b': {'temps': 5e-4, 'memoire_pic': 10},
+                     'nouveau': {'temps': 9.0, 'memoire_pic': 9}}
+        self.assertEqual(comparer(resultats, reference, 0.25, 0.10), [])
+        resultats['a'] = {'temps': 1.3, 'memoire_pic': 1200}
+        self.assertEqual(comparer(resultats, reference, 0.25, 0.10),
+                         [('a', 'temps', 1.0, 1.3), ('a', 'memoire_pic', 1000, 1200)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,16 @@
+import base64
+import re
+import struct
 import unittest
+import zlib
 import numpy as np
 import os
+import tempfile
 import io
+import itertools
+import json
 from unittest.mock import patch
-from src.ForestFireSimulator import ForestFireSimulator, TerrainType
+from src.ForestFireSimulator import ForestFireSimulator, TerrainType, CarteBrulee, IndexComposantes, CacheResultats
 
 class TestForestFireSimulator(unittest.TestCase):
     def setUp(self):
@@ -31,6 +38,47 @@ class TestForestFireSimulator(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.sim.generer_carte_aleatoire(90, 20)
 
+    def test_generer_carte_aleatoire_graine_reproductible(self):
+        sim_a = ForestFireSimulator(largeur=12, hauteur=8, graine=42)
+        sim_b = ForestFireSimulator(largeur=12, hauteur=8, graine=42)
+        sim_a.generer_carte_aleatoire(55, 15)
+        sim_b.generer_carte_aleatoire(55, 15)
+        self.assertTrue(np.array_equal(sim_a.carte, sim_b.carte))
+        self.assertEqual(sim_a.donnees_simulation['generation']['graine'], 42)
+        self.assertEqual(sim_a.simuler_incendie()['position_depart'], sim_b.simuler_incendie()['position_depart'])
+
+    def test_generer_cartes_aleatoires_lot(self):
+        sim = ForestFireSimulator(largeur=7, hauteur=5, graine=0)
+        cartes = sim.generer_cartes_aleatoires(300, pourcentage_arbres=60, pourcentage_eau=10)
+        self.assertEqual(cartes.shape, (300, 5, 7))
+        total_cases = 35
+        self.assertTrue(np.all(np.sum(cartes == TerrainType.ARBRE.value, axis=(1, 2)) == int(total_cases * 0.6)))
+        self.assertTrue(np.all(np.sum(cartes == TerrainType.EAU.value, axis=(1, 2)) == int(total_cases * 0.1)))
+        self.assertGreater(len({carte.tobytes() for carte in cartes}), 1)
+        with self.assertRaises(ValueError):
+            sim.generer_cartes_aleatoires(2, 80, 30)
+
+    def test_simuler_ensemble_coherent_avec_simulation(self):
+        sim = ForestFireSimulator(largeur=13, hauteur=9, graine=2)
+        cartes = sim.generer_cartes_aleatoires(200, pourcentage_arbres=55, pourcentage_eau=10)
+        cartes[5] = TerrainType.EAU.value
+        stats = sim.simuler_ensemble(cartes=cartes, taille_lot=64)
+        self.assertEqual(stats['nb_cartes'], 200)
+        self.assertEqual(stats['arbres_originaux'][5], 0)
+        self.assertEqual(stats['positions_depart'][5].tolist(), [-1, -1])
+        for b in range(0, 200, 7):
+            ligne, colonne = stats['positions_depart'][b]
+            self.assertEqual(cartes[b, ligne, colonne], TerrainType.ARBRE.value)
+            with sim.modification_carte() as carte:
+                carte[...] = cartes[b]
+            self.assertEqual(sim.simuler_incendie(ligne, colonne)['arbres_brules'], stats['arbres_brules'][b])
+        self.assertTrue(np.all(stats['pourcentage_brule'] <= 100))
+
+        generees = ForestFireSimulator(largeur=8, hauteur=8, graine=3).simuler_ensemble(50, 100, 0)
+        self.assertTrue(np.all(generees['arbres_brules'] == 64))
+        with self.assertRaises(ValueError):
+            sim.simuler_ensemble(cartes=np.zeros((3, 4, 4), dtype=np.uint8))
+
     def test_obtenir_statistiques(self):
         self.sim.generer_carte_aleatoire(50, 20)
         stats = self.sim.obtenir_statistiques()
@@ -49,7 +97,8 @@ class TestForestFireSimulator(unittest.TestCase):
         self.sim.sauvegarder_carte(test_filename)
         self.assertTrue(os.path.exists(test_filename + ".npy"))
         # Changement de carte pour vérifier le chargement
-        self.sim.carte.fill(TerrainType.TERRAIN_NU.value)
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.TERRAIN_NU.value)
         self.sim.charger_carte(test_filename + ".npy")
         unique_values = np.unique(self.sim.carte)
         self.assertTrue(any(unique_values == TerrainType.ARBRE.value))
@@ -57,25 +106,130 @@ class TestForestFireSimulator(unittest.TestCase):
             any(unique_values == TerrainType.EAU.value) or any(unique_values == TerrainType.TERRAIN_NU.value))
         os.remove(test_filename + ".npy")  # Nettoyage
 
+    def test_charger_carte_ancien_format_int64(self):
+        ancienne = np.full((4, 6), TerrainType.ARBRE.value, dtype=int)
+        ancienne[0, 0] = TerrainType.EAU.value
+        np.save("test_ancienne_carte", ancienne)
+        self.sim.charger_carte("test_ancienne_carte.npy")
+        os.remove("test_ancienne_carte.npy")
+        self.assertEqual(self.sim.carte.dtype, np.uint8)
+        self.assertTrue(np.array_equal(self.sim.carte, ancienne))
+        self.assertEqual(self.sim.simuler_incendie(3, 5)['arbres_brules'], 23)
+
+    def test_enregistrer_et_ouvrir_carte(self):
+        sim = ForestFireSimulator(largeur=23, hauteur=17, graine=5)
+        sim.generer_carte_aleatoire(60, 10)
+        sim.simulation_complete_avec_deboisement(*np.argwhere(sim.carte == TerrainType.ARBRE.value)[0])
+        carte_incendie = sim.carte_incendie.copy()
+
+        with tempfile.TemporaryDirectory() as dossier:
+            for compression in (True, False):
+                chemin = os.path.join(dossier, "foret.carte")
+                sim.enregistrer_carte(chemin, compression=compression, taille_tuile=8)
+                autre = ForestFireSimulator()
+                fichier = autre.ouvrir_carte(chemin, mmap_mode=None if compression else 'r')
+                self.assertEqual((autre.hauteur, autre.largeur), (17, 23))
+                self.assertTrue(np.array_equal(autre.carte, sim.carte))
+                self.assertTrue(np.array_equal(autre.carte_incendie, carte_incendie))
+                self.assertEqual(autre.graine, 5)
+                self.assertEqual(autre.donnees_simulation['generation'], sim.donnees_simulation['generation'])
+                self.assertEqual(autre.donnees_simulation['resultats_deboisement'],
+                                 sim.donnees_simulation['resultats_deboisement'])
+                # Fenêtre à cheval sur plusieurs tuiles
+                self.assertTrue(np.array_equal(fichier.lire_fenetre('carte', 3, 12, 5, 20), sim.carte[3:12, 5:20]))
+                if not compression:
+                    self.assertIsInstance(autre.carte, np.memmap)
+                del autre, fichier
+
+            with self.assertRaises(ValueError):
+                sim.enregistrer_carte(chemin)
+                ForestFireSimulator().ouvrir_carte(chemin, mmap_mode='r')
+            invalide = os.path.join(dossier, "invalide.carte")
+            with open(invalide, 'wb') as f:
+                f.write(b"pas une carte")
+            with self.assertRaises(ValueError):
+                ForestFireSimulator().ouvrir_carte(invalide)
+            with self.assertRaises(FileNotFoundError):
+                ForestFireSimulator().ouvrir_carte(os.path.join(dossier, "absente.carte"))
+
+    def test_simuler_incendie_par_tuiles(self):
+        sim = ForestFireSimulator(largeur=37, hauteur=29, graine=11)
+        sim.generer_carte_aleatoire(62, 5)
+        # Composante qui serpente d'une tuile à l'autre, y compris par un coin de tuile
+        with sim.modification_carte() as carte:
+            carte[9, :] = TerrainType.ARBRE.value
+            carte[9, 7] = TerrainType.EAU.value
+            carte[10, 8] = TerrainType.ARBRE.value
+        reference = sim.simuler_incendie(9, 0)
+        carte_reference = sim.carte_incendie.copy()
+
+        with tempfile.TemporaryDirectory() as dossier:
+            chemin_carte = os.path.join(dossier, "foret.carte")
+            sim.enregistrer_carte(chemin_carte, compression=False)
+            projetee = ForestFireSimulator()
+            projetee.ouvrir_carte(chemin_carte, mmap_mode='r')
+            for taille_tuile in (1, 4, 8, 100):
+                chemin_sortie = os.path.join(dossier, "incendie.npy")
+                stats = projetee.simuler_incendie_par_tuiles(9, 0, sortie=chemin_sortie, taille_tuile=taille_tuile)
+                self.assertEqual(stats['arbres_brules'], reference['arbres_brules'])
+                self.assertEqual(stats['arbres_originaux'], reference['arbres_originaux'])
+                self.assertTrue(np.array_equal(np.load(chemin_sortie, mmap_mode='r'), carte_reference))
+            del projetee
+
+        with self.assertRaises(ValueError):
+            sim.simuler_incendie_par_tuiles(9, 7)
+
+    def test_carte_brulee_stockage_compact(self):
+        base = np.full((64, 64), TerrainType.ARBRE.value, dtype=np.uint8)
+        rares = np.zeros(base.shape, dtype=bool)
+        rares[3, 4] = True
+        compacte = CarteBrulee(base, rares, {(0, 0): TerrainType.TERRAIN_NU.value})
+        self.assertIsNotNone(compacte.indices)
+        self.assertEqual(compacte.nbytes, 4)
+        tableau = np.asarray(compacte)
+        self.assertEqual(tableau[3, 4], TerrainType.BRULE.value)
+        self.assertEqual(tableau[0, 0], TerrainType.TERRAIN_NU.value)
+        self.assertEqual(base[0, 0], TerrainType.ARBRE.value)
+
+        nombreuses = CarteBrulee(base, base == TerrainType.ARBRE.value)
+        self.assertIsNotNone(nombreuses.bits)
+        self.assertEqual(nombreuses.nbytes, base.size // 8)
+        self.assertTrue(np.array_equal(nombreuses.masque(), base == TerrainType.ARBRE.value))
+
+        # np.array donne une copie : la modifier ne touche pas la carte reconstruite
+        copie = np.array(compacte)
+        copie[:] = TerrainType.EAU.value
+        self.assertEqual(compacte.en_tableau()[3, 4], TerrainType.BRULE.value)
+        self.assertTrue(np.array_equal(np.array(compacte, dtype=np.int64), compacte.en_tableau()))
+
+        for carte in (compacte, nombreuses):
+            complete = carte.en_tableau()
+            carte._tableau = None
+            self.assertTrue(np.array_equal(carte[5:13], complete[5:13]))
+            self.assertTrue(np.array_equal(carte[0:1], complete[0:1]))
+
     def test_simuler_incendie_centre(self):
-        self.sim.carte.fill(TerrainType.ARBRE.value)
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
         stats = self.sim.simuler_incendie(self.hauteur // 2, self.largeur // 2)
         self.assertEqual(stats['arbres_brules'], self.largeur * self.hauteur)
         self.assertAlmostEqual(stats['pourcentage_brule'], 100.0)
         self.assertEqual(stats['arbres_originaux'], self.largeur * self.hauteur)
 
     def test_simuler_incendie_coin(self):
-        self.sim.carte.fill(TerrainType.TERRAIN_NU.value)
-        self.sim.carte[0, 0] = TerrainType.ARBRE.value
-        self.sim.carte[0, 1] = TerrainType.ARBRE.value
-        self.sim.carte[1, 0] = TerrainType.EAU.value
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.TERRAIN_NU.value)
+            carte[0, 0] = TerrainType.ARBRE.value
+            carte[0, 1] = TerrainType.ARBRE.value
+            carte[1, 0] = TerrainType.EAU.value
         stats = self.sim.simuler_incendie(0, 0)
         self.assertEqual(stats['arbres_brules'], 2)
         self.assertEqual(stats['arbres_originaux'], 2)
         self.assertAlmostEqual(stats['pourcentage_brule'], 100.0)
 
     def test_simuler_incendie_aucun_arbre(self):
-        self.sim.carte.fill(TerrainType.TERRAIN_NU.value)
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.TERRAIN_NU.value)
         stats = self.sim.simuler_incendie(0, 0)
         self.assertEqual(stats['arbres_brules'], 0)
         self.assertEqual(stats['arbres_originaux'], 0)
@@ -83,23 +237,147 @@ class TestForestFireSimulator(unittest.TestCase):
         self.assertIsNone(stats['position_depart'])
 
     def test_simuler_incendie_case_non_arbre(self):
-        self.sim.carte.fill(TerrainType.TERRAIN_NU.value)
-        self.sim.carte[3, 3] = TerrainType.EAU.value
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.TERRAIN_NU.value)
+            carte[3, 3] = TerrainType.EAU.value
         stats = self.sim.simuler_incendie(3, 3)
         self.assertEqual(stats['arbres_brules'], 0)
         self.assertEqual(stats['arbres_originaux'], 0)
         self.assertEqual(stats['pourcentage_brule'], 0.0)
 
     def test_simuler_incendie_fragmentation(self):
-        self.sim.carte.fill(TerrainType.EAU.value)
-        self.sim.carte[0, 0] = TerrainType.ARBRE.value
-        self.sim.carte[0, 1] = TerrainType.ARBRE.value
-        self.sim.carte[9, 9] = TerrainType.ARBRE.value
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.EAU.value)
+            carte[0, 0] = TerrainType.ARBRE.value
+            carte[0, 1] = TerrainType.ARBRE.value
+            carte[9, 9] = TerrainType.ARBRE.value
         stats = self.sim.simuler_incendie(0, 0)
         self.assertEqual(stats['arbres_brules'], 2)
         self.assertEqual(stats['arbres_originaux'], 3)
         self.assertAlmostEqual(stats['pourcentage_brule'], 2 / 3 * 100, delta=1)
 
+    def test_simuler_incendie_moteur_vectorise_parite_bfs(self):
+        rng = np.random.default_rng(1)
+        for _ in range(20):
+            sim = ForestFireSimulator(largeur=int(rng.integers(5, 40)), hauteur=int(rng.integers(5, 40)))
+            with sim.modification_carte() as carte:
+                carte[:] = rng.choice([TerrainType.TERRAIN_NU.value, TerrainType.ARBRE.value, TerrainType.EAU.value],
+                                      size=sim.carte.shape, p=[0.35, 0.55, 0.1])
+            arbres = np.argwhere(sim.carte == TerrainType.ARBRE.value)
+            if len(arbres) == 0:
+                continue
+            ligne, colonne = arbres[rng.integers(len(arbres))]
+            stats_bfs = sim.simuler_incendie(ligne, colonne, moteur='bfs')
+            carte_bfs = sim.carte_incendie.copy()
+            stats_vect = sim.simuler_incendie(ligne, colonne, moteur='vectorise')
+            self.assertEqual(stats_bfs, stats_vect)
+            self.assertTrue(np.array_equal(carte_bfs, sim.carte_incendie))
+
+    def test_moteur_parallele_parite(self):
+        sim = ForestFireSimulator(largeur=31, hauteur=25, graine=4)
+        sim.generer_carte_aleatoire(60, 5)
+        ligne, colonne = np.argwhere(sim.carte == TerrainType.ARBRE.value)[0]
+        stats_vect = sim.simuler_incendie(ligne, colonne, moteur='vectorise')
+        carte_vect = sim.carte_incendie.copy()
+        risque = sim.carte_de_risque()
+        for nb_processus in (1, 3):
+            sim.nb_processus = nb_processus
+            self.assertEqual(sim.simuler_incendie(ligne, colonne, moteur='parallele'), stats_vect)
+            self.assertTrue(np.array_equal(sim.carte_incendie, carte_vect))
+            risque_parallele = sim.carte_de_risque(parallele=True)
+            self.assertTrue(np.array_equal(risque_parallele['carte_risque'], risque['carte_risque']))
+            self.assertEqual(risque_parallele['histogramme_tailles'], risque['histogramme_tailles'])
+
+    def test_simuler_incendie_moteur_inconnu(self):
+        with self.assertRaises(ValueError):
+            self.sim.simuler_incendie(0, 0, moteur='inconnu')
+
+    def test_propager_par_etapes_coherent_avec_simulation(self):
+        self.sim.generer_carte_aleatoire(65, 5)
+        ligne, colonne = np.argwhere(self.sim.carte == TerrainType.ARBRE.value)[0]
+        stats = self.sim.simuler_incendie(ligne, colonne)
+        carte_finale = self.sim.carte_incendie.copy()
+
+        etapes = list(self.sim.propager_par_etapes(ligne, colonne))
+        self.assertEqual(etapes[0]['front'].tolist(), [[ligne, colonne]])
+        self.assertEqual(len(etapes[-1]['front']), 0)
+        self.assertEqual([etape['etape'] for etape in etapes], list(range(len(etapes))))
+        self.assertEqual(sum(len(etape['nouvelles_brulees']) for etape in etapes), stats['arbres_brules'])
+        self.assertTrue(np.array_equal(self.sim.carte_incendie, carte_finale))
+
+    def test_propager_par_etapes_arret_anticipe(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+        etapes = self.sim.propager_par_etapes(0, 0)
+        for etape in itertools.islice(etapes, 3):
+            pass
+        # Après 3 étapes (0, 1, 2), le front est à distance 2 du départ
+        self.assertEqual(len(etape['front']), 5)
+        self.assertTrue(np.all(self.sim.carte_incendie[etape['front'][:, 0], etape['front'][:, 1]]
+                               == TerrainType.FEU.value))
+        self.assertEqual(np.sum(self.sim.carte_incendie == TerrainType.BRULE.value), 4)
+
+        with self.assertRaises(ValueError):
+            self.sim.modifier_case(0, 0, TerrainType.EAU.value)
+            next(self.sim.propager_par_etapes(0, 0))
+
+    def test_temps_d_arrivee_sans_vent(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+            carte[:, 6] = TerrainType.EAU.value
+        resultat = self.sim.temps_d_arrivee(0, 0)
+        temps = resultat['temps']
+        self.assertEqual(temps.dtype, np.float32)
+        self.assertAlmostEqual(float(temps[0, 3]), 3.0, places=5)
+        self.assertAlmostEqual(float(temps[2, 2]), 2 * np.sqrt(2), places=5)
+        self.assertTrue(np.isinf(temps[0, 7]))
+        self.assertEqual(resultat['ordre'][0].tolist(), [0, 0])
+        self.assertEqual(resultat['arbres_atteints'], self.sim.simuler_incendie(0, 0)['arbres_brules'])
+        temps_ordonnes = temps[resultat['ordre'][:, 0], resultat['ordre'][:, 1]]
+        self.assertTrue(np.all(np.diff(temps_ordonnes) >= 0))
+
+    def test_temps_d_arrivee_vent_et_combustible(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+        temps = self.sim.temps_d_arrivee(5, 5, vent=(1.0, 0.0, 1.0))['temps']
+        self.assertLess(temps[5, 8], temps[5, 2])
+        self.assertAlmostEqual(float(temps[5, 6]), float(np.exp(-1.0)), places=5)
+
+        combustible = np.full(self.sim.carte.shape, 2.0)
+        temps_rapide = self.sim.temps_d_arrivee(5, 5, combustible=combustible)['temps']
+        temps_normal = self.sim.temps_d_arrivee(5, 5)['temps']
+        self.assertTrue(np.allclose(temps_rapide, temps_normal / 2))
+
+        with self.assertRaises(ValueError):
+            self.sim.temps_d_arrivee(5, 5, combustible=np.zeros(self.sim.carte.shape))
+
+    def test_simuler_incendie_stochastique_probabilite_un(self):
+        self.sim.generer_carte_aleatoire(60, 10)
+        ligne, colonne = np.argwhere(self.sim.carte == TerrainType.ARBRE.value)[0]
+        stats = self.sim.simuler_incendie(ligne, colonne)
+        resultat = self.sim.simuler_incendie_stochastique(ligne, colonne, probabilite=1.0, nb_repliques=5)
+        self.assertTrue(np.all(resultat['arbres_brules'] == stats['arbres_brules']))
+        carte_brulee = self.sim.carte_incendie == TerrainType.BRULE.value
+        self.assertTrue(np.array_equal(resultat['probabilite_brulage'] == 1.0, carte_brulee))
+
+        resultat = self.sim.simuler_incendie_stochastique(ligne, colonne, probabilite=0.0, nb_repliques=5)
+        self.assertTrue(np.all(resultat['arbres_brules'] == 1))
+
+    def test_simuler_incendie_stochastique_repliques_reproductibles(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+        resultat = self.sim.simuler_incendie_stochastique(5, 5, probabilite=0.3, nb_repliques=50, graine=7)
+        self.assertEqual(resultat['arbres_brules'].shape, (50,))
+        self.assertEqual(resultat['probabilite_brulage'].shape, (self.hauteur, self.largeur))
+        self.assertLessEqual(resultat['percentiles'][5], resultat['percentiles'][95])
+        self.assertEqual(resultat['probabilite_brulage'][5, 5], 1.0)
+
+        premieres = self.sim.simuler_incendie_stochastique(5, 5, probabilite=0.3, nb_repliques=10, graine=7)
+        self.assertTrue(np.array_equal(premieres['arbres_brules'], resultat['arbres_brules'][:10]))
+
+        with self.assertRaises(ValueError):
+            self.sim.simuler_incendie_stochastique(5, 5, probabilite=1.5)
+
     def test_obtenir_voisins_centre(self):
         voisins = self.sim.obtenir_voisins(5, 5)
         self.assertEqual(len(voisins), 8)
@@ -117,6 +395,22 @@ class TestForestFireSimulator(unittest.TestCase):
         voisins = self.sim.obtenir_voisins(0, 5)
         self.assertEqual(len(voisins), 5)
 
+    def test_index_voisinage_reconstruit_apres_chargement(self):
+        self.assertEqual(self.sim.obtenir_voisins(9, 9), [(8, 8), (8, 9), (9, 8)])
+        index = self.sim._index_voisinage()
+        self.assertIs(self.sim._index_voisinage(), index)
+
+        autre = ForestFireSimulator(largeur=4, hauteur=3)
+        with autre.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+        autre.sauvegarder_carte("test_index_voisinage")
+        self.sim.charger_carte("test_index_voisinage.npy")
+        os.remove("test_index_voisinage.npy")
+
+        self.assertEqual(self.sim._index_voisinage().forme, (3, 4))
+        self.assertEqual(len(self.sim.obtenir_voisins(2, 3)), 3)
+        self.assertEqual(self.sim.simuler_incendie(2, 3)['arbres_brules'], 12)
+
     def test_generer_carte_aleatoire_extreme(self):
         self.sim.generer_carte_aleatoire(100, 0)
         self.assertTrue(np.all(self.sim.carte == TerrainType.ARBRE.value))
@@ -126,21 +420,60 @@ class TestForestFireSimulator(unittest.TestCase):
         self.assertTrue(np.all(self.sim.carte == TerrainType.TERRAIN_NU.value))
 
     def test_console_output(self):
-        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+        with self.assertLogs("ForestFireSimulator", level="INFO") as journal:
             self.sim.generer_carte_aleatoire(50, 20)
-            output = fake_out.getvalue()
+        output = "\n".join(journal.output)
         self.assertIn("Carte générée", output)
 
     def test_console_output_simuler_incendie(self):
-        self.sim.carte.fill(TerrainType.ARBRE.value)
-        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+        with self.assertLogs("ForestFireSimulator", level="INFO") as journal:
             self.sim.simuler_incendie(0, 0)
-            output = fake_out.getvalue()
+        output = "\n".join(journal.output)
         self.assertIn("🔥 Démarrage de l'incendie", output)
         self.assertIn("Incendie simulé", output)
 
+    def test_journal_silencieux_par_defaut(self):
+        with patch('sys.stdout', new=io.StringIO()) as fake_out, patch('sys.stderr', new=io.StringIO()) as fake_err:
+            self.sim.generer_carte_aleatoire(50, 20)
+            self.sim.simuler_incendie()
+            self.sim.simulation_complete_avec_deboisement()
+        self.assertEqual(fake_out.getvalue(), "")
+        self.assertEqual(fake_err.getvalue(), "")
+
+    def test_instrumentation(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.TERRAIN_NU.value)
+            carte[0, 0:5] = TerrainType.ARBRE.value
+        evenements = []
+        self.sim.instrumentation.rappel = lambda evenement, donnees: evenements.append((evenement, donnees))
+
+        self.sim.simuler_incendie(0, 0)
+        mesures = self.sim.instrumentation.resume()
+        self.assertEqual(mesures['compteurs']['cases_visitees'], 5)
+        self.assertEqual(mesures['compteurs']['pic_file'], 1)
+        self.assertEqual(mesures['compteurs']['copies_carte'], 1)
+        self.assertEqual(mesures['appels'], {'propagation': 1})
+        self.assertEqual([evenement for evenement, _ in evenements], ['phase', 'incendie'])
+        self.assertEqual(evenements[1][1]['arbres_brules'], 5)
+        # La carte après incendie n'est reconstruite qu'à la première lecture
+        for _ in range(5):
+            self.sim.carte_incendie
+        self.assertEqual(self.sim.instrumentation.compteurs['copies_carte'], 2)
+
+        self.sim.instrumentation.reinitialiser()
+        self.sim.trouver_meilleure_case_a_deboiser(0, 0, methode='force_brute')
+        compteurs = self.sim.instrumentation.compteurs
+        self.assertEqual(compteurs['candidats_evalues'], 4)
+        # Propagation de référence (5 cases) puis une par candidat : 1, 2, 3 et 4 cases atteintes
+        self.assertEqual(compteurs['cases_visitees'], 5 + 1 + 2 + 3 + 4)
+        self.assertEqual(self.sim.instrumentation.appels['recherche_deboisement'], 1)
+        self.assertEqual(evenements[-1][0], 'deboisement')
+
     def test_trouver_meilleure_case_a_deboiser(self):
-        self.sim.carte.fill(TerrainType.ARBRE.value)
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
         result = self.sim.trouver_meilleure_case_a_deboiser(5, 5)
         self.assertIn("position_deboisement", result)
         self.assertIn("arbres_sauves", result)
@@ -149,33 +482,431 @@ class TestForestFireSimulator(unittest.TestCase):
         self.assertTrue(result["pourcentage_reduction"] >= 0)
 
     def test_trouver_meilleure_case_a_deboiser_statistiques_coherentes(self):
-        self.sim.carte.fill(TerrainType.ARBRE.value)
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
         result = self.sim.trouver_meilleure_case_a_deboiser(2, 2)
         self.assertLessEqual(result["arbres_brules_avec_deboisement"], result["arbres_brules_sans_deboisement"])
         self.assertGreaterEqual(result["pourcentage_reduction"], 0)
 
+    def test_trouver_meilleure_case_a_deboiser_parite_force_brute(self):
+        rng = np.random.default_rng(2)
+        for _ in range(25):
+            sim = ForestFireSimulator(largeur=int(rng.integers(3, 15)), hauteur=int(rng.integers(3, 15)))
+            with sim.modification_carte() as carte:
+                carte[:] = rng.choice([TerrainType.TERRAIN_NU.value, TerrainType.ARBRE.value, TerrainType.EAU.value],
+                                      size=sim.carte.shape, p=[0.3, 0.6, 0.1])
+            arbres = np.argwhere(sim.carte == TerrainType.ARBRE.value)
+            if len(arbres) == 0:
+                continue
+            ligne, colonne = arbres[rng.integers(len(arbres))]
+            resultat_brute = sim.trouver_meilleure_case_a_deboiser(ligne, colonne, methode='force_brute')
+            resultat_articulation = sim.trouver_meilleure_case_a_deboiser(ligne, colonne, methode='articulation')
+            self.assertEqual(resultat_brute, resultat_articulation)
+
+    def test_trouver_meilleure_case_a_deboiser_point_articulation(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.EAU.value)
+            carte[0, 0:4] = TerrainType.ARBRE.value
+            carte[1:4, 3] = TerrainType.ARBRE.value
+        result = self.sim.trouver_meilleure_case_a_deboiser(0, 0)
+        self.assertEqual(result['position_deboisement'], (0, 1))
+        self.assertEqual(result['arbres_brules_avec_deboisement'], 1)
+        self.assertEqual(result['arbres_sauves'], 6)
+
+    def test_trouver_meilleurs_deboisements_budget_un(self):
+        self.sim.generer_carte_aleatoire(pourcentage_arbres=55, pourcentage_eau=5)
+        ligne, colonne = np.argwhere(self.sim.carte == TerrainType.ARBRE.value)[0]
+        unique = self.sim.trouver_meilleure_case_a_deboiser(ligne, colonne)
+        resultat = self.sim.trouver_meilleurs_deboisements(ligne, colonne, budget=1)
+        if unique['position_deboisement'] is None:
+            self.assertEqual(resultat['positions_deboisement'], [])
+        else:
+            self.assertEqual(resultat['positions_deboisement'], [unique['position_deboisement']])
+        self.assertEqual(resultat['arbres_sauves'], unique['arbres_sauves'])
+
+    def test_trouver_meilleurs_deboisements_coherent_avec_simulation(self):
+        rng = np.random.default_rng(3)
+        sim = ForestFireSimulator(largeur=20, hauteur=20)
+        with sim.modification_carte() as carte:
+            carte[:] = rng.choice([TerrainType.TERRAIN_NU.value, TerrainType.ARBRE.value],
+                                  size=sim.carte.shape, p=[0.4, 0.6])
+        ligne, colonne = np.argwhere(sim.carte == TerrainType.ARBRE.value)[0]
+        resultat = sim.trouver_meilleurs_deboisements(ligne, colonne, budget=4)
+        self.assertLessEqual(len(resultat['positions_deboisement']), 4)
+        self.assertEqual(len(resultat['arbres_sauves_par_etape']), len(resultat['positions_deboisement']))
+        self.assertEqual(resultat['arbres_sauves_par_etape'], sorted(resultat['arbres_sauves_par_etape']))
+        self.assertGreaterEqual(resultat['temps_calcul'], 0)
+
+        for i, j in resultat['positions_deboisement']:
+            sim.modifier_case(i, j, TerrainType.TERRAIN_NU.value)
+        stats = sim.simuler_incendie(ligne, colonne)
+        self.assertEqual(stats['arbres_brules'], resultat['arbres_brules_avec_deboisement'])
+
+        with self.assertRaises(ValueError):
+            sim.trouver_meilleurs_deboisements(ligne, colonne, budget=0)
+
+    def test_trouver_meilleurs_deboisements_glouton_exhaustif(self):
+        def glouton_exhaustif(sim, ligne, colonne, budget):
+            # Chaque étape essaie chaque arbre par une nouvelle simulation
+            positions = []
+            arbres_brules = sim.simuler_incendie(ligne, colonne)['arbres_brules']
+            for _ in range(budget):
+                meilleur = None
+                for i, j in map(tuple, sim.positions_arbres().tolist()):
+                    if (i, j) == (ligne, colonne):
+                        continue
+                    with sim.modification_temporaire({(i, j): TerrainType.TERRAIN_NU.value}):
+                        apres = sim.simuler_incendie(ligne, colonne)['arbres_brules']
+                    if apres < (arbres_brules if meilleur is None else meilleur[0]):
+                        meilleur = (apres, (i, j))
+                if meilleur is None:
+                    break
+                arbres_brules = meilleur[0]
+                positions.append(meilleur[1])
+                sim.deboiser(*meilleur[1])
+            return positions, arbres_brules
+
+        # Carte où déboiser (0, 1) fait de (1, 1) un point d'articulation : son gain augmente
+        sim = ForestFireSimulator(largeur=7, hauteur=7, graine=1)
+        sim.generer_carte_aleatoire(pourcentage_arbres=70, pourcentage_eau=0)
+        resultat = sim.trouver_meilleurs_deboisements(0, 0, budget=3)
+        self.assertEqual(resultat['positions_deboisement'], [(2, 6), (0, 1), (1, 1)])
+        self.assertEqual(resultat['arbres_sauves'], 33)
+
+        for graine in range(30):
+            sim = ForestFireSimulator(largeur=7, hauteur=7, graine=graine)
+            sim.generer_carte_aleatoire(pourcentage_arbres=70, pourcentage_eau=0)
+            ligne, colonne = map(int, sim.positions_arbres()[0])
+            resultat = sim.trouver_meilleurs_deboisements(ligne, colonne, budget=3)
+            positions, arbres_brules = glouton_exhaustif(sim, ligne, colonne, 3)
+            self.assertEqual(resultat['positions_deboisement'], positions)
+            self.assertEqual(resultat['arbres_brules_avec_deboisement'], arbres_brules)
+
     def test_simulation_complete_avec_deboisement_integration(self):
         self.sim.generer_carte_aleatoire(pourcentage_arbres=70, pourcentage_eau=10)
-        with patch("sys.stdout", new=io.StringIO()) as fake_out:
+        with self.assertLogs("ForestFireSimulator", level="INFO") as journal:
             self.sim.simulation_complete_avec_deboisement()
-            output = fake_out.getvalue()
+        output = "\n".join(journal.output)
         self.assertIn("CARTE ORIGINALE", output)
+        self.assertIn("CARTE APRÈS INCENDIE", output)
         self.assertIn("Résultats de l'incendie avec déboisement", output)
         self.assertIn("Arbres brûlés", output)
 
+    def test_index_composantes(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.TERRAIN_NU.value)
+            carte[2, 0:5] = TerrainType.ARBRE.value
+            carte[7, 7] = TerrainType.ARBRE.value
+        index = self.sim.index_composantes()
+        self.assertEqual(self.sim.arbres_brules_depuis(2, 3), 5)
+        self.assertEqual(self.sim.arbres_brules_depuis(0, 0), 0)
+        self.assertEqual((index.nb_arbres, index.nb_composantes), (6, 2))
+
+        # Retirer le milieu de la rangée la coupe en deux ; replanter la recolle
+        self.sim.deboiser(2, 2)
+        self.assertEqual(self.sim.arbres_brules_depuis(2, 0), 2)
+        self.assertEqual(self.sim.arbres_brules_depuis(2, 4), 2)
+        self.assertNotEqual(index.composante(2, 0), index.composante(2, 4))
+        self.assertEqual(index.nb_composantes, 3)
+        self.sim.planter(2, 2)
+        self.assertEqual(self.sim.arbres_brules_depuis(2, 0), 5)
+        for ligne, colonne in [(3, 5), (4, 5), (5, 6), (6, 6)]:
+            self.sim.planter(ligne, colonne)
+        self.assertEqual(self.sim.arbres_brules_depuis(7, 7), 10)
+        self.assertEqual(index.nb_composantes, 1)
+        self.sim.mettre_eau(6, 6)
+        self.assertEqual(self.sim.carte[6, 6], TerrainType.EAU.value)
+        self.assertEqual(self.sim.arbres_brules_depuis(7, 7), 1)
+        self.assertEqual(self.sim.simuler_incendie(2, 0)['arbres_originaux'], 9)
+
+    def test_index_composantes_modifications_aleatoires(self):
+        rng = np.random.default_rng(3)
+        sim = ForestFireSimulator(largeur=12, hauteur=9, graine=3)
+        sim.generer_carte_aleatoire(55, 10)
+        index = sim.index_composantes()
+        for _ in range(300):
+            ligne, colonne = int(rng.integers(9)), int(rng.integers(12))
+            sim.modifier_case(ligne, colonne, int(rng.choice([0, 1, 1, 2])))
+            reference = IndexComposantes(sim.carte, sim._index_voisinage())
+            self.assertEqual((index.nb_arbres, index.nb_composantes), (reference.nb_arbres, reference.nb_composantes))
+            tailles = [[index.taille_composante(i, j) for j in range(12)] for i in range(9)]
+            attendues = [[reference.taille_composante(i, j) for j in range(12)] for i in range(9)]
+            self.assertEqual(tailles, attendues)
+
+        # Une nouvelle carte fait reconstruire l'index
+        sim.generer_carte_aleatoire(40, 0)
+        self.assertIsNot(sim.index_composantes(), index)
+        ligne, colonne = (int(v) for v in np.argwhere(sim.carte == TerrainType.ARBRE.value)[0])
+        stats = sim.simuler_incendie(ligne, colonne)
+        self.assertEqual(sim.arbres_brules_depuis(ligne, colonne), stats['arbres_brules'])
+
+    def test_cache_resultats(self):
+        self.sim.generer_carte_aleatoire(60, 0)
+        cache = self.sim.activer_cache()
+        ligne, colonne = (int(v) for v in np.argwhere(self.sim.carte == TerrainType.ARBRE.value)[0])
+        premier = self.sim.simuler_incendie(ligne, colonne)
+        carte_premiere = self.sim.carte_incendie.copy()
+        second = self.sim.simuler_incendie(ligne, colonne, moteur='vectorise')
+        self.assertEqual(premier, second)
+        np.testing.assert_array_equal(self.sim.carte_incendie, carte_premiere)
+        self.assertEqual((cache.succes, cache.echecs), (1, 1))
+
+        # Une modification change l'empreinte ; revenir à la carte d'origine retrouve le résultat
+        empreinte = self.sim.empreinte_carte()
+        autre = next((int(i), int(j)) for i, j in np.argwhere(self.sim.carte == TerrainType.ARBRE.value)
+                     if (i, j) != (ligne, colonne))
+        self.sim.deboiser(*autre)
+        self.assertNotEqual(self.sim.empreinte_carte(), empreinte)
+        self.sim.simuler_incendie(ligne, colonne)
+        self.assertEqual(cache.echecs, 2)
+        self.sim.planter(*autre)
+        self.assertEqual(self.sim.empreinte_carte(), empreinte)
+        self.sim.simuler_incendie(ligne, colonne)
+        self.assertEqual(cache.succes, 2)
+
+        # Une écriture directe lève une erreur au lieu de laisser le cache répondre pour l'ancienne carte ;
+        # une écriture en bloc fait recalculer l'empreinte
+        with self.assertRaises(ValueError):
+            self.sim.carte[autre] = TerrainType.EAU.value
+        with self.sim.modification_carte() as carte:
+            carte[autre] = TerrainType.EAU.value
+        self.assertNotEqual(self.sim.empreinte_carte(), empreinte)
+
+        resultat = self.sim.trouver_meilleure_case_a_deboiser(ligne, colonne)
+        self.assertEqual(self.sim.trouver_meilleure_case_a_deboiser(ligne, colonne), resultat)
+        self.assertEqual(cache.statistiques()['succes'], 3)
+
+    def test_cache_resultats_carte_partagee(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+        cache = self.sim.activer_cache()
+        self.assertEqual(self.sim.simuler_incendie(0, 0)['arbres_brules'], 100)
+        with self.assertRaises(ValueError):
+            self.sim.carte[:, 5] = TerrainType.EAU.value
+        with self.sim.modification_carte() as carte:
+            carte[:, 5] = TerrainType.EAU.value
+        self.assertEqual(self.sim.simuler_incendie(0, 0)['arbres_brules'], 50)
+
+        # Les résultats d'une même carte partagent une seule copie de base, comptée une fois
+        premiere = self.sim._carte_incendie
+        self.sim.simuler_incendie(0, 9)
+        seconde = self.sim._carte_incendie
+        self.assertIs(premiere.base, seconde.base)
+        self.assertFalse(premiere.base.flags.writeable)
+        self.assertEqual(len(cache.entrees), 3)
+        tailles = sum(taille for _, taille, _ in cache.entrees.values())
+        self.assertEqual(cache.memoire, tailles + 2 * premiere.base.nbytes)
+        cache.vider()
+        self.assertEqual(cache.memoire, 0)
+
+    def test_cache_resultats_carte_incendie_protegee(self):
+        self.sim.generer_carte_aleatoire(60, 10)
+        ligne, colonne = (int(v) for v in np.argwhere(self.sim.carte == TerrainType.ARBRE.value)[0])
+        self.sim.simuler_incendie(ligne, colonne)
+        attendue = self.sim.carte_incendie.copy()
+
+        cache = self.sim.activer_cache()
+        self.sim.simuler_incendie(ligne, colonne)
+        # Une écriture dans la carte après incendie lève une erreur au lieu d'altérer le résultat mis en cache
+        with self.assertRaises(ValueError):
+            self.sim.carte_incendie[:] = 0
+        self.assertFalse(self.sim.carte_incendie.flags.writeable)
+        self.sim.simuler_incendie(ligne, colonne)
+        self.assertEqual(cache.succes, 1)
+        np.testing.assert_array_equal(self.sim.carte_incendie, attendue)
+
+        # L'entrée du cache ne garde pas la carte complète, qui échapperait à memoire_max
+        ((carte_brulee, _), _, _), = cache.entrees.values()
+        self.assertIsNone(carte_brulee._tableau)
+        self.assertIsNot(self.sim._carte_incendie, carte_brulee)
+
+    def test_cache_resultats_eviction(self):
+        cache = CacheResultats(memoire_max=100)
+        cache.ecrire('a', 1, 40)
+        cache.ecrire('b', 2, 40)
+        self.assertEqual(cache.lire('a'), 1)  # 'a' devient la plus récente
+        cache.ecrire('c', 3, 40)
+        self.assertIsNone(cache.lire('b'))
+        self.assertEqual(cache.lire('c'), 3)
+        cache.ecrire('d', 4, 500)
+        self.assertIsNone(cache.lire('d'))
+        self.assertEqual(cache.statistiques()['evictions'], 1)
+        self.assertEqual(cache.memoire, 80)
+
+    def test_modifications_suivies(self):
+        self.sim.generer_carte_aleatoire(50, 20)
+        stats = self.sim.obtenir_statistiques()
+        version = self.sim.version
+        self.assertIs(self.sim.positions_arbres(), self.sim.positions_arbres())
+
+        ligne, colonne = (int(v) for v in self.sim.positions_arbres()[0])
+        self.sim.mettre_eau(ligne, colonne)
+        self.assertNotEqual(self.sim.version, version)
+        nouvelles = self.sim.obtenir_statistiques()
+        self.assertEqual((nouvelles['arbres'], nouvelles['eau']), (stats['arbres'] - 1, stats['eau'] + 1))
+        self.assertEqual(len(self.sim.positions_arbres()), stats['arbres'] - 1)
+        np.testing.assert_array_equal(self.sim.comptes_terrain(), np.bincount(self.sim.carte.ravel(), minlength=256))
+
+        # Même valeur : pas de nouvelle version
+        version = self.sim.version
+        self.sim.mettre_eau(ligne, colonne)
+        self.assertEqual(self.sim.version, version)
+
+        # Comptes et positions des arbres suivent aussi les écritures en bloc
+        sim = ForestFireSimulator(largeur=10, hauteur=10, graine=1)
+        sim.generer_carte_aleatoire()
+        sim.simuler_incendie()
+        with self.assertRaises(ValueError):
+            sim.carte.fill(TerrainType.ARBRE.value)
+        with sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+        stats = sim.simuler_incendie(0, 0)
+        self.assertEqual((stats['arbres_originaux'], stats['pourcentage_brule']), (100, 100.0))
+        with sim.modification_carte() as carte:
+            carte.fill(TerrainType.EAU.value)
+            carte[0, 0] = TerrainType.ARBRE.value
+        self.assertEqual(sim.simuler_incendie()['position_depart'], (0, 0))
+        self.assertEqual(sim.obtenir_statistiques()['arbres'], 1)
+
+    def test_modification_temporaire(self):
+        self.sim.generer_carte_aleatoire(50, 20)
+        carte = self.sim.carte.copy()
+        stats = self.sim.obtenir_statistiques()
+        positions = self.sim.positions_arbres()
+        version = self.sim.version
+        ligne, colonne = (int(v) for v in positions[0])
+
+        eau = tuple(int(v) for v in np.argwhere(carte == TerrainType.EAU.value)[0])
+
+        with self.sim.modification_temporaire({(ligne, colonne): TerrainType.TERRAIN_NU.value, eau: 0}):
+            self.assertEqual(self.sim.carte[ligne, colonne], TerrainType.TERRAIN_NU.value)
+            self.assertNotEqual(self.sim.version, version)
+            self.assertEqual(len(self.sim.positions_arbres()), stats['arbres'] - 1)
+            self.assertEqual(self.sim.obtenir_statistiques()['terrain_nu'], stats['terrain_nu'] + 2)
+        np.testing.assert_array_equal(self.sim.carte, carte)
+        self.assertEqual(self.sim.version, version)
+        self.assertIs(self.sim.positions_arbres(), positions)
+        self.assertEqual(self.sim.obtenir_statistiques(), stats)
+
+        # Exception dans le bloc, et carte modifiée par ailleurs : valeurs rétablies, nouvelle version
+        with self.assertRaises(RuntimeError):
+            with self.sim.modification_temporaire({(ligne, colonne): TerrainType.EAU.value}):
+                self.sim.planter(*eau)
+                raise RuntimeError
+        self.assertEqual(self.sim.carte[ligne, colonne], TerrainType.ARBRE.value)
+        self.assertNotEqual(self.sim.version, version)
+        self.assertEqual(self.sim.obtenir_statistiques()['arbres'], np.sum(self.sim.carte == TerrainType.ARBRE.value))
+
+        # Carte remplacée dans le bloc : les anciennes valeurs ne sont pas écrites dans la nouvelle
+        nouvelle = np.full((4, 4), TerrainType.ARBRE.value, dtype=np.uint8)
+        with self.assertRaises(ValueError):
+            with self.sim.modification_temporaire({(0, 0): TerrainType.EAU.value}):
+                self.sim.carte = nouvelle
+        self.assertTrue(np.all(self.sim.carte == TerrainType.ARBRE.value))
+        with self.assertRaises(ValueError):
+            with self.sim.modification_temporaire({(0, 0): TerrainType.EAU.value}):
+                self.sim.generer_carte_aleatoire(0, 0)
+        self.assertTrue(np.all(self.sim.carte == TerrainType.TERRAIN_NU.value))
+
+    def test_carte_de_risque(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.TERRAIN_NU.value)
+            carte[0, 0:3] = TerrainType.ARBRE.value
+            carte[5, 5] = TerrainType.ARBRE.value
+            carte[9, 9] = TerrainType.EAU.value
+        risque = self.sim.carte_de_risque()
+        self.assertEqual(risque['carte_risque'][0, 1], 3)
+        self.assertEqual(risque['carte_risque'][5, 5], 1)
+        self.assertEqual(risque['carte_risque'][9, 9], 0)
+        self.assertEqual(risque['nb_composantes'], 2)
+        self.assertEqual(risque['taille_max'], 3)
+        self.assertAlmostEqual(risque['esperance_arbres_brules'], (3 * 3 + 1 * 1) / 4)
+        self.assertEqual(risque['histogramme_tailles'], {'tailles': [1, 3], 'nb_composantes': [1, 1]})
+
+    def test_carte_de_risque_coherente_avec_simulation(self):
+        self.sim.generer_carte_aleatoire(55, 10)
+        risque = self.sim.carte_de_risque()['carte_risque']
+        for ligne, colonne in np.argwhere(self.sim.carte == TerrainType.ARBRE.value)[:15]:
+            stats = self.sim.simuler_incendie(ligne, colonne)
+            self.assertEqual(risque[ligne, colonne], stats['arbres_brules'])
+
+    def test_exporter_carte_de_risque(self):
+        self.sim.generer_carte_aleatoire(60, 10)
+        dossier_sortie = "test_exports_risque"
+        self.sim.exporter_carte_de_risque(dossier_sortie=dossier_sortie)
+        for nom in ["carte_de_risque.html", "carte_de_risque.npy"]:
+            chemin = os.path.join(dossier_sortie, nom)
+            self.assertTrue(os.path.exists(chemin))
+            os.remove(chemin)
+        os.rmdir(dossier_sortie)
+
     def test_afficher_carte_variantes(self):
-        self.sim.carte.fill(TerrainType.ARBRE.value)
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
         for use_symbols in [True, False]:
             with patch("sys.stdout", new=io.StringIO()) as fake_out:
                 self.sim.afficher_carte(utiliser_symboles=use_symbols, afficher_incendie=False)
                 output = fake_out.getvalue()
             self.assertTrue(output.strip() != "")
-        self.sim.carte[1, 1] = TerrainType.BRULE.value
+        self.sim.modifier_case(1, 1, TerrainType.BRULE.value)
         with patch("sys.stdout", new=io.StringIO()) as fake_out:
             self.sim.afficher_carte(utiliser_symboles=True, afficher_incendie=True)
             output = fake_out.getvalue()
         self.assertTrue("🔥" in output or "*" in output)
 
+    def test_afficher_carte_fenetre_et_apercu(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+            carte[:3, :3] = TerrainType.EAU.value
+            carte[9, 9] = TerrainType.BRULE.value
+        with patch("sys.stdout", new=io.StringIO()) as fake_out:
+            texte = self.sim.afficher_carte(utiliser_symboles=False, fenetre=(1, 3, 2, 5))
+        self.assertEqual(fake_out.getvalue(), texte)
+        self.assertIn("W T T \nW T T \n", texte)
+
+        with patch("sys.stdout", new=io.StringIO()):
+            majorite = self.sim.afficher_carte(utiliser_symboles=False, reduction=4)
+            brule = self.sim.afficher_carte(utiliser_symboles=False, reduction=4, mode_apercu='brule')
+        # Blocs de 4 × 4 : le bloc (0, 0) compte 9 cases d'eau, le bloc du coin (2 × 2 cases) une case brûlée
+        self.assertIn("W T T \nT T T \nT T T \n", majorite)
+        self.assertIn("W T T \nT T T \nT T X \n", brule)
+        with self.assertRaises(ValueError):
+            self.sim.afficher_carte(mode_apercu='moyenne')
+
+        self.sim.affichage_console = False
+        with patch("sys.stdout", new=io.StringIO()) as fake_out, \
+                self.assertLogs("ForestFireSimulator", level="INFO") as journal:
+            self.sim.afficher_carte()
+            self.sim.simulation_complete_avec_deboisement(5, 5)
+        self.assertEqual(fake_out.getvalue(), "")
+        self.assertIn("INFO:ForestFireSimulator:Statistiques de la carte:", journal.output)
+
+    def test_generer_html_carte_image_palette(self):
+        self.sim.generer_carte_aleatoire(60, 10)
+        self.sim.modifier_case(0, 0, TerrainType.BRULE.value)
+        html = self.sim._generer_html_carte(self.sim.carte, "Titre", "Description")
+        self.assertIn('<canvas class="carte"', html)
+        self.assertNotIn('class="case"', html)
+
+        png = base64.b64decode(re.search(r'data-image="data:image/png;base64,([^"]*)"', html).group(1))
+        self.assertEqual(png[:8], b'\x89PNG\r\n\x1a\n')
+        position, idat = 8, b''
+        while position < len(png):
+            longueur, = struct.unpack('>I', png[position:position + 4])
+            if png[position + 4:position + 8] == b'IDAT':
+                idat += png[position + 8:position + 8 + longueur]
+            position += 12 + longueur
+        lignes = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(self.hauteur, self.largeur + 1)
+        # Indices de palette : terrain nu 0, arbre 1, eau 2, brûlé 3
+        attendu = np.array([0, 1, 2, 4, 3])[self.sim.carte]
+        self.assertTrue(np.array_equal(lignes[:, 1:], attendu))
+
+    def test_generer_html_carte_taille_lineaire(self):
+        sim = ForestFireSimulator(largeur=300, hauteur=300, graine=0)
+        sim.generer_carte_aleatoire(60, 10)
+        html = sim._generer_html_carte(sim.carte, "Grande carte")
+        self.assertLess(len(html), 2 * 300 * 300)
+
     def test_exporter_html(self):
         self.sim.generer_carte_aleatoire(60, 10)
         self.sim.simulation_complete_avec_deboisement()
@@ -192,7 +923,61 @@ class TestForestFireSimulator(unittest.TestCase):
             os.remove(chemin)
         os.rmdir(dossier_sortie)
 
+    def test_exporter_html_rapport_unique(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+            carte[:, 4] = TerrainType.EAU.value
+            carte[5, 4] = TerrainType.ARBRE.value
+        self.sim.simulation_complete_avec_deboisement(2, 2)
+        temps = self.sim.donnees_simulation['temps']
+        self.assertIn('total', temps)
+        self.assertGreaterEqual(temps['total'], temps['recherche_deboisement'])
+
+        with tempfile.TemporaryDirectory() as dossier_sortie:
+            self.sim.exporter_html(dossier_sortie=dossier_sortie, rapport_unique=True)
+            self.assertEqual(os.listdir(dossier_sortie), ["rapport_incendie.html"])
+            with open(os.path.join(dossier_sortie, "rapport_incendie.html"), encoding='utf-8') as f:
+                html = f.read()
+        self.assertEqual(html.count('<canvas class="carte"'), 3)
+        self.assertEqual(html.count('<section class="couche"'), 3)
+        self.assertEqual(html.count(' hidden>'), 2)
+        self.assertIn('table class="temps"', html)
+        self.assertIn("Recherche de la case à déboiser", html)
+
+    def test_exporter_chronologie_html(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.ARBRE.value)
+            carte[:, 6] = TerrainType.EAU.value
+        with tempfile.TemporaryDirectory() as dossier_sortie:
+            chemin = self.sim.exporter_chronologie_html(0, 0, dossier_sortie=dossier_sortie)
+            with open(chemin, encoding='utf-8') as f:
+                html = f.read()
+
+        fronts = np.frombuffer(base64.b64decode(re.search(r'data-fronts="([^"]*)"', html).group(1)), dtype='<u4')
+        decalages = json.loads(re.search(r'data-decalages="([^"]*)"', html).group(1))
+        # Chaque arbre brûlé n'apparaît qu'une fois, dans le front de son étape
+        self.assertEqual(len(fronts), 60)
+        self.assertEqual(len(np.unique(fronts)), 60)
+        self.assertEqual(decalages[-1], 60)
+        self.assertEqual(fronts[decalages[0]:decalages[1]].tolist(), [0])
+        self.assertEqual(sorted(fronts[decalages[1]:decalages[2]].tolist()), [1, 10, 11])
+        # Une étape par distance de Tchebychev au départ (0 à 9), puis le front vide final
+        self.assertEqual(len(decalages) - 1, 11)
+        self.assertIn('max="10"', html)
+
+    def test_simulation_complete_arbre_isole(self):
+        with self.sim.modification_carte() as carte:
+            carte.fill(TerrainType.TERRAIN_NU.value)
+            carte[4, 4] = TerrainType.ARBRE.value
+            carte[0, 0] = TerrainType.ARBRE.value
+        donnees = self.sim.simulation_complete_avec_deboisement(4, 4)
+        self.assertIsNone(donnees['position_deboisement'])
+        self.assertEqual(donnees['stats_avec_deboisement']['arbres_brules'], 1)
+        self.assertEqual(donnees['comparaison']['arbres_sauves'], 0)
+
     def test_integration_complete(self):
+        # Carte et départ tirés avec une graine : un départ sur un arbre isolé n'aurait aucune case à déboiser
+        self.sim = ForestFireSimulator(largeur=self.largeur, hauteur=self.hauteur, graine=0)
         self.sim.generer_carte_aleatoire(pourcentage_arbres=50, pourcentage_eau=10)
         stats_avant = self.sim.obtenir_statistiques()
         total_cases = self.sim.largeur * self.sim.hauteur
@@ -208,6 +993,13 @@ class TestForestFireSimulator(unittest.TestCase):
         self.assertIn('stats_avec_deboisement', donnees)
         self.assertIn('comparaison', donnees)
 
+        self.assertEqual(self.sim.carte.dtype, np.uint8)
+        self.assertIs(donnees['carte_sans_deboisement'].base, donnees['carte_originale'])
+        self.assertIs(donnees['carte_avec_deboisement'].base, donnees['carte_originale'])
+        carte_avec = np.asarray(donnees['carte_avec_deboisement'])
+        ligne_deboisee, colonne_deboisee = donnees['position_deboisement']
+        self.assertEqual(carte_avec[ligne_deboisee, colonne_deboisee], TerrainType.TERRAIN_NU.value)
+
         stats_sans = donnees['stats_sans_deboisement']
         stats_avec = donnees['stats_avec_deboisement']
         comp = donnees['comparaison']
@@ -0,0 +1,119 @@
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+import numpy as np
+from src.ForestFireSimulator import ForestFireSimulator, TerrainType
+from src.travailleur import ServeurSocket, Travailleur, servir_flux
+
+
+class TestTravailleur(unittest.TestCase):
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.simulateur = ForestFireSimulator(largeur=30, hauteur=20, graine=3)
+        self.simulateur.affichage_console = False
+        self.simulateur.generer_carte_aleatoire(pourcentage_arbres=55, pourcentage_eau=10)
+        self.chemin_carte = os.path.join(self.dossier.name, "foret.carte")
+        self.simulateur.enregistrer_carte(self.chemin_carte)
+        self.simulateur.sauvegarder_carte(os.path.join(self.dossier.name, "foret"))
+        self.chemin_npy = os.path.join(self.dossier.name, "foret.npy")
+        self.arbres = [tuple(int(v) for v in p) for p in np.argwhere(self.simulateur.carte == TerrainType.ARBRE.value)]
+
+    def tearDown(self):
+        self.dossier.cleanup()
+
+    def servir(self, requetes, **options):
+        entree = io.StringIO(''.join(json.dumps(r) + '\n' for r in requetes))
+        sortie = io.StringIO()
+        travailleur = servir_flux(entree, sortie, **options)
+        return travailleur, [json.loads(ligne) for ligne in sortie.getvalue().splitlines()]
+
+    def test_incendie_et_cartes_chaudes(self):
+        departs = self.arbres[:5]
+        requetes = [{'id': k, 'type': 'incendie', 'carte': chemin, 'ligne': l, 'colonne': c}
+                    for k, (chemin, (l, c)) in enumerate((chemin, p) for p in departs
+                                                         for chemin in (self.chemin_carte, self.chemin_npy))]
+        travailleur, reponses = self.servir(requetes, taille_lot=4)
+
+        self.assertEqual(sorted(r['id'] for r in reponses), list(range(10)))
+        self.assertEqual(travailleur.nb_chargements, 2)
+        for reponse in reponses:
+            self.assertTrue(reponse['ok'], reponse)
+            self.assertGreaterEqual(reponse['latence_ms'], reponse['calcul_ms'])
+            ligne, colonne = reponse['resultat']['position_depart']
+            attendu = self.simulateur.simuler_incendie(ligne, colonne)
+            self.assertEqual(reponse['resultat']['arbres_brules'], attendu['arbres_brules'])
+            self.assertEqual(reponse['resultat']['arbres_originaux'], attendu['arbres_originaux'])
+
+    def test_deboisement_balayage_et_erreurs(self):
+        ligne, colonne = self.arbres[0]
+        eau = tuple(int(v) for v in np.argwhere(self.simulateur.carte == TerrainType.EAU.value)[0])
+        requetes = [
+            {'id': 'd', 'type': 'deboisement', 'carte': self.chemin_carte, 'ligne': ligne, 'colonne': colonne},
+            {'id': 'b', 'type': 'balayage', 'largeur': 12, 'hauteur': 10, 'pourcentage_arbres': 60,
+             'pourcentage_eau': 0, 'graine': 1},
+            {'id': 'eau', 'type': 'incendie', 'carte': self.chemin_carte, 'ligne': eau[0], 'colonne': eau[1]},
+            {'id': 'absente', 'type': 'incendie', 'carte': 'absente.carte', 'ligne': 0, 'colonne': 0},
+            {'id': 'inconnu', 'type': 'foudre'},
+            {'id': 'e', 'type': 'etat'}
+        ]
+        entree = io.StringIO(''.join(json.dumps(r) + '\n' for r in requetes) + 'pas du json\n')
+        sortie = io.StringIO()
+        servir_flux(entree, sortie)
+        reponses = {r['id']: r for r in map(json.loads, sortie.getvalue().splitlines())}
+
+        attendu = self.simulateur.trouver_meilleure_case_a_deboiser(ligne, colonne)
+        self.assertEqual(reponses['d']['resultat']['arbres_sauves'], attendu['arbres_sauves'])
+        self.assertEqual(reponses['b']['resultat']['graine'], 1)
+        self.assertIn('arbres_brules', reponses['b']['resultat'])
+        for cle in ('eau', 'absente', 'inconnu', None):
+            self.assertFalse(reponses[cle]['ok'])
+            self.assertIn('erreur', reponses[cle])
+        self.assertIn(self.chemin_carte, reponses['e']['resultat']['cartes'])
+
+    def test_carte_rechargee_apres_modification(self):
+        travailleur = Travailleur(nb_cartes_max=1)
+        ligne, colonne = self.arbres[0]
+        requete = {'type': 'incendie', 'carte': self.chemin_npy, 'ligne': ligne, 'colonne': colonne}
+        self.assertTrue(travailleur.traiter(requete)['arbres_brules'] > 0)
+
+        self.simulateur.deboiser(ligne, colonne)
+        self.simulateur.sauvegarder_carte(os.path.join(self.dossier.name, "foret"))
+        os.utime(self.chemin_npy, ns=(0, 0))
+        with self.assertRaises(ValueError):
+            travailleur.traiter(requete)
+        self.assertEqual(travailleur.nb_chargements, 2)
+
+        # Une seule carte gardée : la seconde remplace la première
+        travailleur.simulateur(self.chemin_carte)
+        self.assertEqual(list(travailleur.cartes), [self.chemin_carte])
+
+    def test_socket_unix(self):
+        chemin = os.path.join(self.dossier.name, "travailleur.sock")
+        serveur = ServeurSocket(chemin)
+        fil = threading.Thread(target=serveur.servir)
+        fil.start()
+        try:
+            ligne, colonne = self.arbres[0]
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(chemin)
+                flux = client.makefile('rw', encoding='utf-8')
+                for k in range(3):
+                    flux.write(json.dumps({'id': k, 'type': 'incendie', 'carte': self.chemin_carte,
+                                           'ligne': ligne, 'colonne': colonne}) + '\n')
+                flux.flush()
+                reponses = [json.loads(flux.readline()) for _ in range(3)]
+        finally:
+            serveur.arreter()
+            fil.join(timeout=5)
+        self.assertFalse(fil.is_alive())
+        self.assertEqual([r['id'] for r in reponses], [0, 1, 2])
+        self.assertTrue(all(r['ok'] for r in reponses))
+        self.assertEqual(serveur.travailleur.nb_chargements, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()